@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Serverless Entry Point
+ASGI app for Vercel; vercel.json routes every request here
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import os
+import sys
+
+# Cold-start optimized mode: platform environment only, no prefetch loop or process pool
+os.environ.setdefault("KCONVERT_SERVERLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main_optimized import app  # noqa: E402
+
+__all__ = ["app"]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Bulk Conversion Throughput Benchmark
+Rows/second for per-row /api/convert calls vs POST /api/bulk-convert (JSON and binary)
+Usage: python benchmarks/bench_bulk_convert.py [rows]
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-benchmark-secret")
+os.environ.setdefault("EXCHANGE_API_KEY", "benchmark")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import bulk_convert  # noqa: E402
+import main_optimized  # noqa: E402
+from rate_engine import RateTable  # noqa: E402
+
+PER_ROW_SAMPLE = 500  # per-row calls are slow, so time a sample and extrapolate
+
+
+def seed_pivot_table() -> None:
+    """Put a synthetic pivot table in the cache so no upstream call is made"""
+    codes = list(main_optimized.CURRENCIES)
+    if main_optimized.PIVOT_CURRENCY not in codes:
+        codes.append(main_optimized.PIVOT_CURRENCY)
+    values = [1.0 if code == main_optimized.PIVOT_CURRENCY else random.uniform(0.1, 20000) for code in codes]
+    table = RateTable(main_optimized.PIVOT_CURRENCY, codes, values, int(time.time()), time.time())
+    main_optimized.set_cached_rates(main_optimized.get_cache_key(main_optimized.PIVOT_CURRENCY), table)
+
+
+def report(label: str, rows: int, seconds: float) -> None:
+    print(f"{label:<28}: {rows / seconds:12,.0f} rows/s  ({seconds * 1000:9.1f} ms for {rows:,} rows)")
+
+
+def main():
+    """Time the same random rows through each path"""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    codes = list(main_optimized.CURRENCIES)
+    amounts = [round(random.uniform(1, 100000), 2) for _ in range(rows)]
+    from_codes = [random.choice(codes) for _ in range(rows)]
+    to_codes = [random.choice(codes) for _ in range(rows)]
+
+    seed_pivot_table()
+    main_optimized.limiter.enabled = False
+
+    with TestClient(main_optimized.app) as client:
+        token = main_optimized.create_jwt()
+
+        start = time.perf_counter()
+        for i in range(PER_ROW_SAMPLE):
+            client.get("/api/convert", params={
+                "token": token, "amount": amounts[i], "from": from_codes[i], "to": to_codes[i]
+            })
+        report("GET /api/convert per row", PER_ROW_SAMPLE, time.perf_counter() - start)
+
+        body = {"amount": amounts, "from": from_codes, "to": to_codes}
+        start = time.perf_counter()
+        response = client.post(f"/api/bulk-convert?token={token}", json=body)
+        report("POST bulk (JSON)", rows, time.perf_counter() - start)
+        assert response.status_code == 200 and response.json()["failed_rows"] == 0
+
+        raw = bulk_convert.pack_binary_request(amounts, from_codes, to_codes)
+        start = time.perf_counter()
+        response = client.post(
+            f"/api/bulk-convert?token={token}",
+            content=raw,
+            headers={"content-type": bulk_convert.BINARY_CONTENT_TYPE}
+        )
+        report("POST bulk (binary)", rows, time.perf_counter() - start)
+        assert response.status_code == 200
+        print(f"{'server-side binary':<28}: {int(response.headers['x-rows-per-second']):12,} rows/s")
+
+    # Core conversion pass alone, vectorized vs the pure Python fallback
+    table, _ = main_optimized.lookup_cached_rates(main_optimized.get_cache_key(main_optimized.PIVOT_CURRENCY))
+    columns = bulk_convert.parse_binary(raw, rows)
+    start = time.perf_counter()
+    bulk_convert.convert_columns(table, columns, main_optimized.CURRENCIES)
+    report("convert_columns (NumPy)" if bulk_convert.HAS_NUMPY else "convert_columns", rows, time.perf_counter() - start)
+
+    if bulk_convert.HAS_NUMPY:
+        bulk_convert.HAS_NUMPY = False
+        columns = bulk_convert.parse_binary(raw, rows)
+        start = time.perf_counter()
+        bulk_convert.convert_columns(table, columns, main_optimized.CURRENCIES)
+        report("convert_columns (Python)", rows, time.perf_counter() - start)
+        bulk_convert.HAS_NUMPY = True
+
+
+if __name__ == "__main__":
+    main()
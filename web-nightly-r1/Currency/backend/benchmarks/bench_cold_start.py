@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Cold Start Profile
+Import time and time to first byte of main_optimized in fresh interpreters
+Usage: python benchmarks/bench_cold_start.py [--runs N] [--mode serverless|server]
+       [--output FILE] [--max-import-ms MS] [--forbid MODULE,...]
+
+Each run starts a new Python process that imports the app and sends its first
+request (GET /api/auth, what every client calls first) straight to the ASGI
+app. One extra run with -X importtime lists the slowest imports. Exits non-zero
+when the median import exceeds --max-import-ms or a --forbid module is loaded
+at import time, so CI can track both.
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Deferred until first use - none of these should load with the app
+DEFAULT_FORBID = "httpx,jose.jwt,numpy,redis,multiprocessing.pool,bulk_convert,stream_convert"
+
+PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from main_optimized import app
+imported = time.perf_counter()
+loaded = sorted(sys.modules)
+
+async def first_request():
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/auth", "raw_path": b"/api/auth", "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"cold")], "client": ("127.0.0.1", 1), "server": ("cold", 80),
+    }
+    first_byte = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            first_byte["status"] = message["status"]
+            first_byte["at"] = time.perf_counter()
+
+    await app(scope, receive, send)
+    return first_byte
+
+first_byte = asyncio.run(first_request())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_byte_ms": (first_byte["at"] - start) * 1000,
+    "status": first_byte["status"],
+    "modules": loaded,
+}))
+"""
+
+
+def probe_env(mode: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET_KEY", "cold-start-profile")
+    env.setdefault("EXCHANGE_API_KEY", "cold-start-profile")
+    env["RATE_SNAPSHOT_PATH"] = ""
+    env["KCONVERT_SERVERLESS"] = "1" if mode == "serverless" else "0"
+    env.pop("KCONVERT_DOTENV_LOADED", None)
+    return env
+
+
+def run_probe(env: dict) -> dict:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND, env=env, capture_output=True, text=True, check=True
+    )
+    total_ms = (time.perf_counter() - started) * 1000
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample["process_ms"] = total_ms  # interpreter start + import + first request + exit
+    return sample
+
+
+def slowest_imports(env: dict, top: int) -> list:
+    """(module, cumulative ms) of the slowest imports from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main_optimized"],
+        cwd=BACKEND, env=env, capture_output=True, text=True, check=True
+    )
+    # Entries are printed after their children, indented two spaces per level
+    rows, children = [], []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        row = (name.strip(), int(cumulative_us) / 1000, int(self_us) / 1000)
+        if depth == 1:
+            children.append(row)
+        elif depth == 0:
+            if row[0] == "main_optimized":
+                rows = [row] + children  # the app and what it imports directly
+            children = []
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return [{"module": name, "cumulative_ms": round(cum, 1), "self_ms": round(own, 1)} for name, cum, own in rows[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--mode", choices=["serverless", "server"], default="serverless")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to report")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--max-import-ms", type=float, help="fail when the median import is slower")
+    parser.add_argument("--forbid", default=DEFAULT_FORBID, help="modules that must not load at import time")
+    args = parser.parse_args()
+
+    env = probe_env(args.mode)
+    run_probe(env)  # populate __pycache__ and the OS file cache
+    samples = [run_probe(env) for _ in range(args.runs)]
+    imports = [sample["import_ms"] for sample in samples]
+    first_bytes = [sample["first_byte_ms"] for sample in samples]
+    processes = [sample["process_ms"] for sample in samples]
+    forbid = [name for name in args.forbid.split(",") if name]
+    loaded = [name for name in forbid if name in samples[-1]["modules"]]
+
+    report = {
+        "mode": args.mode,
+        "runs": args.runs,
+        "python": sys.version.split()[0],
+        "import_ms": {"median": round(statistics.median(imports), 1), "min": round(min(imports), 1)},
+        "first_byte_ms": {"median": round(statistics.median(first_bytes), 1), "min": round(min(first_bytes), 1)},
+        "process_ms": {"median": round(statistics.median(processes), 1), "min": round(min(processes), 1)},
+        "first_status": samples[-1]["status"],
+        "modules_loaded": len(samples[-1]["modules"]),
+        "forbidden_loaded": loaded,
+        "slowest_imports": slowest_imports(env, args.top),
+    }
+
+    print(f"mode {args.mode}, {args.runs} runs (median / min)")
+    print(f"  import main_optimized : {report['import_ms']['median']:7.1f} / {report['import_ms']['min']:7.1f} ms")
+    print(f"  first byte /api/auth  : {report['first_byte_ms']['median']:7.1f} / {report['first_byte_ms']['min']:7.1f} ms "
+          f"(HTTP {report['first_status']})")
+    print(f"  whole process         : {report['process_ms']['median']:7.1f} / {report['process_ms']['min']:7.1f} ms")
+    print(f"  modules loaded        : {report['modules_loaded']}")
+    print("  slowest imports (cumulative ms):")
+    for row in report["slowest_imports"]:
+        print(f"    {row['cumulative_ms']:8.1f}  {row['module']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if loaded:
+        print(f"FAIL: loaded at import time: {', '.join(loaded)}")
+        failed = True
+    if args.max_import_ms is not None and report["import_ms"]["median"] > args.max_import_ms:
+        print(f"FAIL: median import {report['import_ms']['median']} ms > budget {args.max_import_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Kconvert - JWT Verification Micro-Benchmark
+Compares a full python-jose verify with the verified-token cache fast path
+Usage: python benchmarks/bench_jwt.py [iterations]
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-benchmark-secret")
+os.environ.setdefault("EXCHANGE_API_KEY", "benchmark")
+
+import main_optimized  # noqa: E402
+
+
+def main():
+    """Time verify_jwt with a cold and a warm token cache"""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    token = main_optimized.create_jwt()
+
+    def cold():
+        main_optimized.token_cache.clear()
+        main_optimized.verify_jwt(token)
+
+    def warm():
+        main_optimized.verify_jwt(token)
+
+    main_optimized.verify_jwt(token)
+    cold_us = min(timeit.repeat(cold, number=iterations, repeat=3)) / iterations * 1e6
+    warm_us = min(timeit.repeat(warm, number=iterations, repeat=3)) / iterations * 1e6
+
+    print(f"verify_jwt full decode : {cold_us:8.2f} us/request")
+    print(f"verify_jwt cached      : {warm_us:8.2f} us/request")
+    print(f"saving                 : {cold_us - warm_us:8.2f} us/request ({cold_us / warm_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Rate Push Fan-Out Benchmark
+Time to push one rate update to N subscribers through the hub vs serializing per subscriber
+Usage: python benchmarks/bench_rate_hub.py [subscribers]
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from http_cache import dump_json  # noqa: E402
+from rate_engine import RateTable  # noqa: E402
+from rate_hub import RateHub  # noqa: E402
+
+CODES = [f"C{i:02d}" for i in range(160)]
+
+
+def make_table(version: int) -> RateTable:
+    values = [1.0] + [random.uniform(0.1, 20000) for _ in CODES[1:]]
+    return RateTable(CODES[0], CODES, values, version)
+
+
+async def run(subscribers: int) -> None:
+    hub = RateHub()
+    views = [tuple(CODES[1:11]), tuple(CODES[1:]), tuple(CODES[20:25])]
+    first = make_table(1)
+    subs = [hub.subscribe("C05", views[i % len(views)], first) for i in range(subscribers)]
+    update = make_table(2)
+
+    start = time.perf_counter()
+    hub.publish(update)
+    hub_ms = (time.perf_counter() - start) * 1000
+
+    # Baseline: every connection diffs and serializes its own payload
+    start = time.perf_counter()
+    for sub in subs:
+        rates = update.rates_for("C05", sub.topic.targets)
+        dump_json({"base": "C05", "rates": rates, "rates_updated_unix": 2, "full": False})
+    naive_ms = (time.perf_counter() - start) * 1000
+
+    delivered = sum(len(sub.frames) for sub in subs)
+    print(f"subscribers            : {subscribers:,} ({hub.stats()['topics']} distinct views)")
+    print(f"hub publish            : {hub_ms:8.2f} ms ({hub.stats()['frames_serialized']} serializations, {delivered:,} frames queued)")
+    print(f"serialize per client   : {naive_ms:8.2f} ms ({naive_ms / hub_ms:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
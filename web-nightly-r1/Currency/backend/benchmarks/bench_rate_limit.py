@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Rate Limiter Overhead Benchmark
+Per-request cost of the GCRA limiter vs slowapi (if installed) vs no limiter, in process
+Usage: python benchmarks/bench_rate_limit.py [requests] [clients]
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from rate_limit import RateLimiter  # noqa: E402
+
+LIMIT = 10 ** 9  # never reject - measure bookkeeping only
+
+
+def plain_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping(request: Request):
+        return {"ok": True}
+
+    return app
+
+
+def gcra_app() -> FastAPI:
+    app = FastAPI()
+    limiter = RateLimiter()
+
+    @app.get("/ping")
+    @limiter.limit(LIMIT)
+    async def ping(request: Request):
+        return {"ok": True}
+
+    return app
+
+
+def slowapi_app():
+    try:
+        from slowapi import Limiter, _rate_limit_exceeded_handler
+        from slowapi.errors import RateLimitExceeded
+    except ImportError:
+        return None
+
+    app = FastAPI()
+    limiter = Limiter(key_func=lambda request: request.headers["x-client"])
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @app.get("/ping")
+    @limiter.limit(f"{LIMIT}/minute")
+    async def ping(request: Request):
+        return {"ok": True}
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int, clients: int) -> float:
+    """Microseconds per request through the ASGI stack"""
+    transport = httpx.ASGITransport(app=app, client=("10.0.0.1", 1234))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(200):  # warm up
+            await client.get("/ping", headers={"x-client": "warmup"})
+        start = time.perf_counter()
+        for i in range(requests):
+            response = await client.get("/ping", headers={"x-client": f"c{i % clients}"})
+            assert response.status_code == 200
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def run(requests: int, clients: int) -> None:
+    baseline = await measure(plain_app(), requests, clients)
+    print(f"no limiter     : {baseline:7.1f} us/request")
+    gcra = await measure(gcra_app(), requests, clients)
+    print(f"GCRA limiter   : {gcra:7.1f} us/request (+{gcra - baseline:.1f})")
+    app = slowapi_app()
+    if app is None:
+        print("slowapi        : not installed")
+        return
+    slow = await measure(app, requests, clients)
+    print(f"slowapi        : {slow:7.1f} us/request (+{slow - baseline:.1f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+    ))
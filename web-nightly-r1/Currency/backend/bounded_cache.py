@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Bounded LRU/TTL Cache
+Entry- and byte-capped cache with O(1) LRU eviction and proactive expiry
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, Tuple
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate resident bytes of a cached value"""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(estimate_size(v) for v in value)
+    return size
+
+
+class BoundedTTLCache:
+    """Dict-like cache of key -> (value, stored_at) capped by entry count and bytes
+
+    Entries older than ttl are dropped on read and by purge_expired(); when
+    either cap is exceeded the least recently used entries are evicted.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self.resident_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0  # single values larger than max_bytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        if entry is None:
+            return False
+        if time.time() - entry[1] >= self.ttl:
+            self._drop(key)
+            self.expirations += 1
+            return False
+        return True
+
+    def __getitem__(self, key: Hashable) -> Tuple[Any, float]:
+        if key not in self:
+            raise KeyError(key)
+        self._data.move_to_end(key)
+        value, stored_at, _ = self._data[key]
+        return value, stored_at
+
+    def __setitem__(self, key: Hashable, item: Tuple[Any, float]) -> None:
+        value, stored_at = item
+        size = estimate_size(value)
+        if key in self._data:
+            self._drop(key)
+        if size > self.max_bytes:
+            self.rejections += 1
+            return
+
+        self._data[key] = (value, stored_at, size)
+        self.resident_bytes += size
+        while len(self._data) > self.max_entries or self.resident_bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def __delitem__(self, key: Hashable) -> None:
+        if key not in self._data:
+            raise KeyError(key)
+        self._drop(key)
+
+    def _drop(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self.resident_bytes -= size
+
+    def items(self) -> Iterator[Tuple[Hashable, Tuple[Any, float]]]:
+        """Iterate (key, (value, stored_at)) without touching LRU order"""
+        for key, (value, stored_at, _) in list(self._data.items()):
+            yield key, (value, stored_at)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.resident_bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop every entry older than ttl, returning how many were removed"""
+        cutoff = time.time() - self.ttl
+        expired = [key for key, (_, stored_at, _) in self._data.items() if stored_at <= cutoff]
+        for key in expired:
+            self._drop(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the stats endpoint"""
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "resident_bytes": self.resident_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejections": self.rejections,
+        }
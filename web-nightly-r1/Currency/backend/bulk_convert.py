@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Vectorized Bulk Conversion
+Converts columns of (amount, from, to) rows against one rate table in a single pass
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import json
+import math
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from rate_engine import RateTable
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # NumPy is optional - pure Python path is used instead
+    np = None
+    HAS_NUMPY = False
+
+# Per-row error codes (0 = converted)
+OK = 0
+INVALID_AMOUNT = 1
+UNKNOWN_FROM = 2
+UNKNOWN_TO = 3
+INVALID_ROW = 4  # streamed record without amount/from/to (see stream_convert)
+
+ERROR_CODES = {
+    OK: "ok",
+    INVALID_AMOUNT: "invalid_amount",
+    UNKNOWN_FROM: "unknown_from_currency",
+    UNKNOWN_TO: "unknown_to_currency",
+    INVALID_ROW: "invalid_row",
+}
+
+MAX_AMOUNT = 1000000000
+DECIMALS = 6
+
+# Binary request:  magic, row count | float64 amounts | 3-byte from codes | 3-byte to codes
+# Binary response: magic, row count, failed rows, rates updated unix | float64 converted (NaN on
+#                  error) | float64 rates (NaN on error) | uint8 error codes
+BINARY_CONTENT_TYPE = "application/vnd.kconvert.bulk"
+REQUEST_MAGIC = b"KCB1"
+RESPONSE_MAGIC = b"KCR1"
+REQUEST_HEADER = struct.Struct("<4sI")
+RESPONSE_HEADER = struct.Struct("<4sIIq")
+
+
+class BulkColumns:
+    """Parsed request columns; codes are upper-cased str or 3-byte bytes values"""
+
+    __slots__ = ("amounts", "from_codes", "to_codes")
+
+    def __init__(self, amounts, from_codes, to_codes):
+        self.amounts = amounts
+        self.from_codes = from_codes
+        self.to_codes = to_codes
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+
+def parse_json(body: bytes, max_rows: int) -> BulkColumns:
+    """Columnar JSON: {"amount": [...], "from": [...], "to": [...]}
+
+    "from"/"to" may also be a single code applied to every row.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError("Body is not valid JSON")
+    if not isinstance(payload, dict) or not isinstance(payload.get("amount"), list):
+        raise ValueError("Body must be an object with an 'amount' array")
+
+    amounts = payload["amount"]
+    rows = len(amounts)
+    if rows > max_rows:
+        raise ValueError(f"Too many rows: {rows} (max {max_rows})")
+
+    columns = []
+    for name in ("from", "to"):
+        column = payload.get(name)
+        if isinstance(column, str):
+            column = [column] * rows
+        if not isinstance(column, list) or len(column) != rows:
+            raise ValueError(f"'{name}' must be a code or an array the same length as 'amount'")
+        columns.append([code.upper() if isinstance(code, str) else "" for code in column])
+
+    # Non-numeric amounts become NaN and are reported per row
+    clean = [
+        float(a) if isinstance(a, (int, float)) and not isinstance(a, bool) else math.nan
+        for a in amounts
+    ]
+    if HAS_NUMPY:
+        return BulkColumns(np.array(clean, dtype=np.float64), *columns)
+    return BulkColumns(array("d", clean), *columns)
+
+
+def parse_binary(body: bytes, max_rows: int) -> BulkColumns:
+    """Packed binary request (see BINARY_CONTENT_TYPE layout)"""
+    if len(body) < REQUEST_HEADER.size:
+        raise ValueError("Binary body too short")
+    magic, rows = REQUEST_HEADER.unpack_from(body, 0)
+    if magic != REQUEST_MAGIC:
+        raise ValueError("Bad binary magic")
+    if rows > max_rows:
+        raise ValueError(f"Too many rows: {rows} (max {max_rows})")
+    if len(body) != REQUEST_HEADER.size + rows * 14:
+        raise ValueError("Binary body length does not match row count")
+
+    offset = REQUEST_HEADER.size
+    codes_offset = offset + rows * 8
+    if HAS_NUMPY:
+        return BulkColumns(
+            np.frombuffer(body, dtype="<f8", count=rows, offset=offset),
+            np.char.upper(np.frombuffer(body, dtype="S3", count=rows, offset=codes_offset)),
+            np.char.upper(np.frombuffer(body, dtype="S3", count=rows, offset=codes_offset + rows * 3)),
+        )
+
+    amounts = array("d")
+    amounts.frombytes(body[offset:codes_offset])
+    if sys.byteorder == "big":
+        amounts.byteswap()
+    codes = body[codes_offset:].upper()
+    from_codes = [codes[i:i + 3] for i in range(0, rows * 3, 3)]
+    to_codes = [codes[i:i + 3] for i in range(rows * 3, rows * 6, 3)]
+    return BulkColumns(amounts, from_codes, to_codes)
+
+
+def pack_binary_request(amounts: Sequence[float], from_codes: Sequence[str], to_codes: Sequence[str]) -> bytes:
+    """Build a binary request body (used by clients and the benchmark)"""
+    rows = len(amounts)
+    return b"".join((
+        REQUEST_HEADER.pack(REQUEST_MAGIC, rows),
+        struct.pack(f"<{rows}d", *amounts),
+        "".join(from_codes).encode("ascii"),
+        "".join(to_codes).encode("ascii"),
+    ))
+
+
+def _vector_positions(table: RateTable, codes, allowed) -> "np.ndarray":
+    """Index of each code in table.values, -1 for unsupported codes
+
+    Only the distinct codes are looked up in Python; the per-row mapping is a gather.
+    """
+    unique, inverse = np.unique(np.asarray(codes), return_inverse=True)
+    lookup = np.empty(len(unique), dtype=np.intp)
+    for i, code in enumerate(unique.tolist()):
+        if isinstance(code, bytes):
+            code = code.decode("ascii", "replace")
+        lookup[i] = table.index.get(code, -1) if code in allowed else -1
+    return lookup[inverse.reshape(-1)]
+
+
+def convert_columns(table: RateTable, columns: BulkColumns, allowed) -> Tuple[object, object, object]:
+    """(converted, rates, error codes) for every row; failed rows hold NaN
+
+    allowed is the set of currency codes the API supports.
+    """
+    rows = len(columns)
+    if HAS_NUMPY:
+        amounts = np.asarray(columns.amounts, dtype=np.float64)
+        values = np.frombuffer(table.values, dtype=np.float64)
+        from_pos = _vector_positions(table, columns.from_codes, allowed)
+        to_pos = _vector_positions(table, columns.to_codes, allowed)
+
+        errors = np.zeros(rows, dtype=np.uint8)
+        errors[to_pos < 0] = UNKNOWN_TO
+        errors[from_pos < 0] = UNKNOWN_FROM
+        errors[~((amounts > 0) & (amounts <= MAX_AMOUNT))] = INVALID_AMOUNT
+
+        rates = values[to_pos] / values[from_pos]
+        failed = errors != OK
+        rates[failed] = np.nan
+        converted = np.round(amounts * rates, DECIMALS)
+        return converted, rates, errors
+
+    # Pure Python fallback: same semantics, one row at a time
+    index = table.index
+    values = table.values
+    converted = array("d", bytes(8 * rows))
+    rates = array("d", bytes(8 * rows))
+    errors = array("B", bytes(rows))
+    for i in range(rows):
+        amount = columns.amounts[i]
+        from_code, to_code = columns.from_codes[i], columns.to_codes[i]
+        if isinstance(from_code, bytes):
+            from_code, to_code = from_code.decode("ascii", "replace"), to_code.decode("ascii", "replace")
+        if not 0 < amount <= MAX_AMOUNT:
+            errors[i] = INVALID_AMOUNT
+        elif from_code not in allowed or from_code not in index:
+            errors[i] = UNKNOWN_FROM
+        elif to_code not in allowed or to_code not in index:
+            errors[i] = UNKNOWN_TO
+        if errors[i]:
+            converted[i] = rates[i] = math.nan
+            continue
+        rate = values[index[to_code]] / values[index[from_code]]
+        rates[i] = rate
+        converted[i] = round(amount * rate, DECIMALS)
+    return converted, rates, errors
+
+
+def failed_count(errors) -> int:
+    if HAS_NUMPY and isinstance(errors, np.ndarray):
+        return int(np.count_nonzero(errors))
+    return sum(1 for code in errors if code)
+
+
+def _json_column(column, errors) -> List[Optional[float]]:
+    """Column as a JSON-safe list (None for failed rows)"""
+    values = column.tolist()
+    if HAS_NUMPY and isinstance(errors, np.ndarray):
+        for i in np.flatnonzero(errors).tolist():
+            values[i] = None
+    else:
+        for i, code in enumerate(errors):
+            if code:
+                values[i] = None
+    return values
+
+
+def json_result(converted, rates, errors) -> Dict:
+    """Columnar result body fields"""
+    return {
+        "converted_amount": _json_column(converted, errors),
+        "exchange_rate": _json_column(rates, errors),
+        "error": list(errors.tolist()),
+        "error_codes": ERROR_CODES,
+    }
+
+
+def pack_binary_result(converted, rates, errors, rates_updated_unix: int) -> bytes:
+    """Binary result body (see BINARY_CONTENT_TYPE layout)"""
+    if HAS_NUMPY:
+        converted_bytes = np.asarray(converted, dtype="<f8").tobytes()
+        rates_bytes = np.asarray(rates, dtype="<f8").tobytes()
+        error_bytes = np.asarray(errors, dtype=np.uint8).tobytes()
+    else:
+        converted_bytes = struct.pack(f"<{len(converted)}d", *converted)
+        rates_bytes = struct.pack(f"<{len(rates)}d", *rates)
+        error_bytes = bytes(errors)
+    header = RESPONSE_HEADER.pack(RESPONSE_MAGIC, len(errors), failed_count(errors), rates_updated_unix)
+    return b"".join((header, converted_bytes, rates_bytes, error_bytes))
+
+
+def unpack_binary_result(body: bytes) -> Dict:
+    """Decode a binary result body (used by clients and the benchmark)"""
+    magic, rows, failed, updated_unix = RESPONSE_HEADER.unpack_from(body, 0)
+    if magic != RESPONSE_MAGIC:
+        raise ValueError("Bad binary magic")
+    offset = RESPONSE_HEADER.size
+    converted = struct.unpack_from(f"<{rows}d", body, offset)
+    rates = struct.unpack_from(f"<{rows}d", body, offset + rows * 8)
+    errors = body[offset + rows * 16:offset + rows * 17]
+    return {
+        "rows": rows,
+        "failed_rows": failed,
+        "rates_updated_unix": updated_unix,
+        "converted_amount": list(converted),
+        "exchange_rate": list(rates),
+        "error": list(errors),
+    }
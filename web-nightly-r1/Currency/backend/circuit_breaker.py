@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Upstream Circuit Breaker
+Fails fast while a provider is down instead of waiting on every timeout
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import time
+from collections import deque
+from typing import Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed -> open after failure_threshold consecutive failures; open -> half-open
+    after recovery_timeout, letting one trial call through; the trial closes the
+    circuit on success or re-opens it on failure"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_started = None  # monotonic start of the half-open trial call
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self.transitions = deque(maxlen=20)  # (timestamp, from, to)
+
+    def _transition(self, state: str) -> None:
+        if state != self._state:
+            self.transitions.append((round(time.time(), 3), self._state, state))
+            self._state = state
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+            self._trial_started = None
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now (half-open admits a single trial)"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        now = time.monotonic()
+        # A trial that never reported back (e.g. cancelled) is replaced after recovery_timeout
+        if state == HALF_OPEN and (self._trial_started is None or now - self._trial_started >= self.recovery_timeout):
+            self._trial_started = now
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._trial_started = None
+        self._transition(CLOSED)
+
+    def record_neutral(self) -> None:
+        """The call was answered but refused for reasons of its own (e.g. a 4xx): says nothing about health"""
+        self._trial_started = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_started = None
+        if self._state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    def stats(self) -> Dict:
+        """State and counters for the stats endpoint"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected_calls": self.rejected,
+            "transitions": [
+                {"at": at, "from": old, "to": new} for at, old, new in self.transitions
+            ],
+        }
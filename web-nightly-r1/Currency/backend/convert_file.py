@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Streaming File Converter
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+"""
+Convert very large CSV/NDJSON ledger exports with constant memory
+Usage: python convert_file.py INPUT [-o OUTPUT] [--format csv|ndjson] [--remote]
+
+Rows need amount/from/to columns (CSV header) or keys (NDJSON). Rates are
+pinned once from a running Kconvert server; chunks are converted locally in
+a process pool. With --remote the file is streamed through POST
+/api/stream-convert instead.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import httpx
+from dotenv import load_dotenv
+
+import stream_convert
+from generate_token import generate_token
+from rate_engine import RateTable
+
+# Load environment variables
+load_dotenv()
+
+READ_SIZE = 256 * 1024
+
+def read_chunks(handle):
+    """Yield the input in fixed-size byte chunks"""
+    while True:
+        data = handle.read(READ_SIZE)
+        if not data:
+            return
+        yield data
+
+def pin_server_snapshot(client: httpx.Client, token: str, pivot: str) -> stream_convert.Snapshot:
+    """Pin the server's current pivot rates for every currency it supports"""
+    supported = client.get("/api/currencies")
+    supported.raise_for_status()
+    codes = [currency["code"] for currency in supported.json()["currencies"]]
+
+    response = client.get(f"/api/rates/{pivot}", params={"token": token, "targets": ",".join(codes)})
+    response.raise_for_status()
+    data = response.json()
+    rates = data["conversion_rates"]
+    rates.setdefault(pivot, 1.0)
+    table = RateTable(pivot, list(rates), rates.values(), data["rates_updated_unix"], time.time())
+    return stream_convert.pin_snapshot(table, rates)
+
+def main():
+    """Parse arguments and stream the file through the converter"""
+    parser = argparse.ArgumentParser(description="Convert a CSV/NDJSON file with Kconvert rates")
+    parser.add_argument("input", help="input file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=sorted(stream_convert.MEDIA_TYPES), help="default: from the file extension")
+    parser.add_argument("--server", default=os.getenv("KCONVERT_URL", "http://localhost:8000"))
+    parser.add_argument("--token", help="JWT (default: generated from JWT_SECRET_KEY)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("STREAM_WORKERS", "2")) or 1)
+    parser.add_argument("--chunk-bytes", type=int, default=int(os.getenv("STREAM_CHUNK_BYTES", str(stream_convert.DEFAULT_CHUNK_BYTES))))
+    parser.add_argument("--remote", action="store_true", help="convert on the server via /api/stream-convert")
+    args = parser.parse_args()
+
+    fmt = args.format or (stream_convert.NDJSON if args.input.endswith((".ndjson", ".jsonl")) else stream_convert.CSV)
+    token = args.token or (generate_token(10) if os.getenv("JWT_SECRET_KEY") else None)
+    if not token:
+        print("❌ Provide --token or set JWT_SECRET_KEY", file=sys.stderr)
+        sys.exit(1)
+
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    target = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    start_time = time.time()
+    written = 0
+
+    try:
+        with httpx.Client(base_url=args.server, timeout=httpx.Timeout(30.0, read=None)) as client:
+            if args.remote:
+                with client.stream(
+                    "POST",
+                    "/api/stream-convert",
+                    params={"token": token, "format": fmt},
+                    content=read_chunks(source),
+                    headers={"Content-Type": stream_convert.MEDIA_TYPES[fmt]}
+                ) as response:
+                    if response.status_code != 200:
+                        response.read()
+                        print(f"❌ Server error {response.status_code}: {response.text}", file=sys.stderr)
+                        sys.exit(1)
+                    for data in response.iter_bytes():
+                        target.write(data)
+                        written += len(data)
+            else:
+                snapshot = pin_server_snapshot(client, token, os.getenv("PIVOT_CURRENCY", "USD").upper())
+                with stream_convert.create_pool(args.workers) as pool:
+                    for data in stream_convert.convert_stream(
+                        read_chunks(source),
+                        fmt,
+                        snapshot,
+                        pool,
+                        chunk_bytes=args.chunk_bytes,
+                        max_in_flight=args.workers * 2
+                    ):
+                        target.write(data)
+                        written += len(data)
+    except httpx.HTTPError as e:
+        print(f"❌ Request to {args.server} failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if target is not sys.stdout.buffer:
+            target.close()
+
+    elapsed = time.time() - start_time
+    print(f"✅ Wrote {written / 1e6:.1f} MB in {elapsed:.1f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
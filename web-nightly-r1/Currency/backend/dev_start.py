@@ -14,8 +14,9 @@ import os
 import uvicorn
 from dotenv import load_dotenv
 
-# Load development environment
+# Load development environment; the reloader's app process then skips it
 load_dotenv('.env')
+os.environ["KCONVERT_DOTENV_LOADED"] = "1"
 
 if __name__ == "__main__":
     # Development-optimized uvicorn configuration
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Kconvert - HTTP Caching Helpers
+Pre-serialized bodies, strong ETags and conditional GET handling
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import gzip
+import hashlib
+import json
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional - gzip and identity are always available
+    brotli = None
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize like FastAPI's JSONResponse (compact, UTF-8)"""
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from a content digest or version parts"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etags: Iterable[str]) -> bool:
+    """Weak comparison of an If-None-Match header against our ETags"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return any(etag in candidates for etag in etags)
+
+
+def conditional_headers(etag: str, last_modified_unix: int = 0, cache_control: str = "private, no-cache") -> Dict[str, str]:
+    """Validator headers for a versioned response"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified_unix:
+        headers["Last-Modified"] = formatdate(last_modified_unix, usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified_unix: int = 0) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since when it is absent"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, (etag,))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or not last_modified_unix:
+        return False
+    try:
+        return last_modified_unix <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> set:
+    """Content codings the client accepts (ignoring those with q=0)"""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.lower())
+    return accepted
+
+
+class PreparedResponse:
+    """JSON body serialized and compressed once, served with a strong ETag"""
+
+    def __init__(self, content: Any, max_age: int = 86400):
+        self.body = dump_json(content)
+        self.etag = make_etag(hashlib.sha256(self.body).hexdigest())
+        self.cache_control = f"public, max-age={max_age}"
+
+        # Each content coding is a distinct representation with its own strong ETag
+        tag = self.etag.strip('"')
+        self.variants: Dict[str, tuple] = {"identity": (self.body, self.etag)}
+        self.variants["gzip"] = (gzip.compress(self.body, compresslevel=9, mtime=0), f'"{tag}-gzip"')
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(self.body), f'"{tag}-br"')
+        self.etags = [etag for _, etag in self.variants.values()]
+
+    def select(self, accept_encoding: Optional[str]) -> str:
+        """Pick the smallest variant the client accepts"""
+        accepted = accepted_encodings(accept_encoding)
+        for coding in ("br", "gzip"):
+            if coding in self.variants and (coding in accepted or "*" in accepted):
+                return coding
+        return "identity"
+
+    def respond(self, request: Request) -> Response:
+        """304 on a matching If-None-Match, otherwise the pre-built bytes"""
+        coding = self.select(request.headers.get("accept-encoding"))
+        body, etag = self.variants[coding]
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+
+        if etag_matches(request.headers.get("if-none-match"), self.etags):
+            return Response(status_code=304, headers=headers)
+
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(content=body, media_type="application/json", headers=headers)
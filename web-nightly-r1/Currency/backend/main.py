@@ -10,12 +10,7 @@ Main entry point for Currency Converter API
 Simple ASGI app export for deployment platforms like Zeabur
 """
 
-from dotenv import load_dotenv
-
-# Load environment variables first
-load_dotenv()
-
-# Import the optimized FastAPI app
+# Import the optimized FastAPI app (it loads .env itself)
 from main_optimized import app
 
 # Export for ASGI servers (required by Zeabur, Gunicorn, etc.)
@@ -7,26 +7,45 @@ Copyright (c) 2025 Team 6
 All rights reserved.
 """
 
-from fastapi import FastAPI, HTTPException, Query, Request, Header
+from fastapi import FastAPI, HTTPException, Query, Request, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
-from jose import JWTError, jwt
-from dotenv import load_dotenv
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from pydantic import BaseModel, field_validator
+from fastapi.responses import Response, StreamingResponse
 import os
 import time
-import httpx
 import asyncio
 import re
-from typing import Optional, Dict, List
+import tempfile
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 import logging
+from bounded_cache import BoundedTTLCache
+from circuit_breaker import CircuitBreaker
+from http_cache import PreparedResponse, conditional_headers, is_not_modified, make_etag
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from metrics import UPSTREAM_BUCKETS, MetricsMiddleware, Registry, RequestMetrics
+from prefetch import PrefetchScheduler
+from rate_engine import RateTable
+from rate_hub import RateHub, Subscriber
+from rate_limit import RateLimiter
+from rate_snapshot import load_tables, save_tables
+from shared_rates import SharedRateStore
+from singleflight import SingleFlight
+from token_cache import VerifiedTokenCache
 
-# Load environment variables
-load_dotenv()
+# Serverless (cold-start optimized) mode: set KCONVERT_SERVERLESS=1, or detected on Vercel.
+# Configuration comes from the platform there, so no .env file is read.
+SERVERLESS = os.getenv("KCONVERT_SERVERLESS", "1" if os.getenv("VERCEL") else "0").lower() in ("1", "true")
+
+# Heavy or optional dependencies (httpx, jose, bulk/stream conversion with NumPy, redis)
+# are imported on first use, so startup only pays for what every request needs.
+
+# Load environment variables, once per process tree (entry scripts may already have)
+if not SERVERLESS and not os.getenv("KCONVERT_DOTENV_LOADED"):
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ["KCONVERT_DOTENV_LOADED"] = "1"
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -35,32 +54,270 @@ logger = logging.getLogger(__name__)
 # Configuration - validate required settings
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 EXCHANGE_API_KEY = os.getenv("EXCHANGE_API_KEY")
+EXCHANGE_API_URL = os.getenv("EXCHANGE_API_URL", "https://v6.exchangerate-api.com/v6").rstrip("/")
 if not SECRET_KEY or not EXCHANGE_API_KEY:
     raise ValueError("JWT_SECRET_KEY and EXCHANGE_API_KEY are required")
 
 TOKEN_EXP_MINUTES = int(os.getenv("TOKEN_EXP_MINUTES", "10"))
 RATE_LIMIT = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
 AUTH_RATE_LIMIT = int(os.getenv("AUTH_RATE_LIMIT_PER_MINUTE", "30"))
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")  # shares limits across workers/instances
+PIVOT_CURRENCY = os.getenv("PIVOT_CURRENCY", "USD").upper()
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RECOVERY_SECONDS = float(os.getenv("CIRCUIT_RECOVERY_SECONDS", "30"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "100000"))
+# Body size cap, checked while reading so an oversized upload is refused before it is buffered
+BULK_MAX_BYTES = int(os.getenv("BULK_MAX_BYTES", str(BULK_MAX_ROWS * 64)))
+# 0 parses chunks in threads instead of processes (the default serverless, where process pools are unavailable)
+STREAM_WORKERS = int(os.getenv("STREAM_WORKERS", "0" if SERVERLESS else "2"))
+STREAM_CHUNK_BYTES = int(os.getenv("STREAM_CHUNK_BYTES", str(1024 * 1024)))
+RATE_PUSH_INTERVAL = int(os.getenv("RATE_PUSH_INTERVAL_SECONDS", "60"))  # how often subscribed bases are revalidated
+PUSH_HEARTBEAT_SECONDS = 15  # SSE keep-alive comment interval for idle streams
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "5"))
+PREFETCH_LEAD_SECONDS = float(os.getenv("PREFETCH_LEAD_SECONDS", "30"))  # refresh this long before the soft TTL
+# Upstream budget for prefetches, 0 disables (the default serverless: instances are frozen between requests)
+PREFETCH_CALLS_PER_HOUR = int(os.getenv("PREFETCH_CALLS_PER_HOUR", "0" if SERVERLESS else "60"))
+PREFETCH_HALF_LIFE = float(os.getenv("PREFETCH_HALF_LIFE_SECONDS", "600"))  # popularity decay
+PREFETCH_INTERVAL = 10  # seconds between checks for hot tables about to expire
 CORS_ORIGINS = os.getenv("OTHER_ORIGINS", "").split(",") if os.getenv("OTHER_ORIGINS") else ["http://localhost:3000", "http://127.0.0.1:3000"]
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiter (GCRA per client IP, in process unless RATE_LIMIT_REDIS_URL is set)
+limiter = RateLimiter(RATE_LIMIT_REDIS_URL)
 
-# Global HTTP client with connection pooling
-http_client = httpx.AsyncClient(
-    timeout=httpx.Timeout(10.0, connect=5.0),
-    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
-)
+# Global HTTP client with connection pooling, created on the first upstream fetch
+http_client = None
+
+def get_http_client():
+    """Shared upstream client (httpx is imported here, not at startup)"""
+    global http_client
+    if http_client is None:
+        import httpx
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    return http_client
 
 # Real-time cache with TTL (5 minutes)
-cache = {}
-CACHE_TTL = 300  # 5 minutes
+CACHE_TTL = int(os.getenv("CACHE_TTL_EXCHANGE_RATES", "300"))  # 5 minutes - soft TTL, entries are revalidated in the background after this
+CACHE_HARD_TTL = int(os.getenv("CACHE_HARD_TTL_SECONDS", "3600"))  # stale entries are never served past this
+CACHE_MAX_ENTRIES = int(os.getenv("MAX_CACHE_SIZE_EXCHANGE", "1000"))
+CACHE_MAX_BYTES = int(os.getenv("MAX_CACHE_BYTES_EXCHANGE", str(32 * 1024 * 1024)))
+CACHE_SWEEP_INTERVAL = 60  # seconds between proactive expiry sweeps
+
+# Bounded LRU cache: key -> (data, stored_at), evicted by count/bytes, expired at the hard TTL
+cache = BoundedTTLCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_HARD_TTL)
+
+# Keeps background refresh tasks referenced until they finish
+background_tasks = set()
+
+# Cross-worker pivot table: one worker refreshes from upstream, the others map it in
+SHARED_RATES_PATH = os.getenv("SHARED_RATES_PATH", "")
+SHARED_RATES_WAIT = 5.0  # seconds to wait for another worker's refresh before fetching ourselves
+shared_rates = SharedRateStore(SHARED_RATES_PATH) if SHARED_RATES_PATH else None
+
+# Latest rate tables are saved here on refresh and shutdown and reloaded on startup (empty disables)
+RATE_SNAPSHOT_PATH = os.getenv("RATE_SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "kconvert-rates.snapshot"))
+# Refreshes within this many seconds are written in one save, in a thread off the event loop
+RATE_SNAPSHOT_SAVE_DELAY = float(os.getenv("RATE_SNAPSHOT_SAVE_DELAY_SECONDS", "1"))
+snapshot_stats = {"restored_tables": 0, "saves": 0}
+snapshot_save_task: Optional[asyncio.Task] = None
+snapshot_dirty = False
+snapshot_write_lock = threading.Lock()  # the shutdown save waits for a write still in its thread
+
+# Tokens that already passed full verification, valid until their exp
+token_cache = VerifiedTokenCache(max_entries=TOKEN_CACHE_SIZE)
+
+# Upstream circuit breaker and the last table each base was served from successfully
+upstream_breaker = CircuitBreaker(
+    "exchangerate-api",
+    failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+    recovery_timeout=CIRCUIT_RECOVERY_SECONDS
+)
+last_known_good: Dict[str, RateTable] = {}
+
+# Bases upstream answered `unsupported-code` for, and until when they are refused without asking again
+unquoted_bases: Dict[str, float] = {}
+
+# Coalesces concurrent upstream fetches for the same base
+upstream_flight = SingleFlight()
+
+# Pushes changed rates to SSE/WebSocket subscribers
+rate_hub = RateHub()
+
+# Prometheus metrics - every labelled child used on the request path is resolved here, once
+UPSTREAM_PROVIDER = "exchangerate-api"
+metrics_registry = Registry()
+request_metrics = RequestMetrics(metrics_registry, "kconvert")
+upstream_latency = metrics_registry.histogram(
+    "kconvert_upstream_request_duration_seconds", "Upstream rate fetch latency", ("provider",), UPSTREAM_BUCKETS
+).labels(UPSTREAM_PROVIDER)
+_upstream_errors = metrics_registry.counter(
+    "kconvert_upstream_errors_total", "Failed upstream rate fetches by kind", ("provider", "kind")
+)
+UPSTREAM_ERRORS = {
+    kind: _upstream_errors.labels(UPSTREAM_PROVIDER, kind)
+    for kind in ("timeout", "http_status", "connection", "api_error", "invalid_payload", "circuit_open")
+}
+_cache_requests = metrics_registry.counter(
+    "kconvert_cache_requests_total", "Cache lookups by tier and result", ("tier", "result")
+)
+RATES_CACHE = {result: _cache_requests.labels("rates", result) for result in ("hit", "stale", "miss", "fallback")}
+SHARED_RATES_CACHE = {result: _cache_requests.labels("shared_rates", result) for result in ("hit", "miss")}
+_jwt_failures = metrics_registry.counter("kconvert_jwt_failures_total", "Rejected tokens by reason", ("reason",))
+JWT_FAILURES = {reason: _jwt_failures.labels(reason) for reason in ("format", "expired", "owner", "invalid")}
+metrics_registry.collected(
+    "kconvert_token_cache_requests_total", "Verified-token cache lookups", "counter", ("result",),
+    lambda: ((("hit",), token_cache.hits), (("miss",), token_cache.misses))
+)
+metrics_registry.collected(
+    "kconvert_rate_limit_decisions_total", "Rate limiter decisions", "counter", ("result",),
+    lambda: ((("allowed",), limiter.allowed), (("rejected",), limiter.rejected))
+)
+metrics_registry.collected(
+    "kconvert_circuit_open", "1 while the upstream circuit is open", "gauge", ("provider",),
+    lambda: (((upstream_breaker.name,), int(upstream_breaker.is_open)),)
+)
+metrics_registry.collected(
+    "kconvert_cache_entries", "Resident rate cache entries", "gauge", (),
+    lambda: (((), len(cache)),)
+)
+metrics_registry.collected(
+    "kconvert_push_subscribers", "Connected SSE/WebSocket rate subscribers", "gauge", (),
+    lambda: (((), len(rate_hub)),)
+)
+
+def cached_rates_expiry(base: str) -> Optional[float]:
+    """When base's cached table stops being fresh (None if it is not cached)"""
+    cache_key = get_cache_key(base)
+    if cache_key not in cache:
+        return None
+    _, timestamp = cache[cache_key]
+    return timestamp + CACHE_TTL
+
+# Popular tables are refreshed just before their soft TTL so hot bases never miss
+prefetcher = PrefetchScheduler(
+    refresh=lambda base: upstream_flight.do(get_cache_key(base), lambda: refresh_rate_table(base)),
+    expires_at=cached_rates_expiry,
+    top_n=PREFETCH_TOP_N,
+    lead_seconds=PREFETCH_LEAD_SECONDS,
+    calls_per_hour=PREFETCH_CALLS_PER_HOUR,
+    half_life=PREFETCH_HALF_LIFE,
+    can_fetch=lambda: not upstream_breaker.is_open,
+)
+
+# Process pool for streaming conversions, started on first use
+stream_pool = None
+
+def get_stream_pool():
+    """Chunk worker pool (None = default thread executor when STREAM_WORKERS is 0)"""
+    global stream_pool
+    if stream_pool is None and STREAM_WORKERS > 0:
+        import stream_convert
+        stream_pool = stream_convert.create_pool(STREAM_WORKERS)
+    return stream_pool
+
+async def sweep_cache_periodically() -> None:
+    """Proactively drop expired cache entries that are never read again"""
+    while True:
+        await asyncio.sleep(CACHE_SWEEP_INTERVAL)
+        removed = cache.purge_expired()
+        if removed:
+            logger.info(f"Cache sweep removed {removed} expired entries")
+        limiter.compact()
+
+async def push_rates_periodically() -> None:
+    """Keep subscribed bases revalidated so the hub sees upstream updates without polling clients"""
+    while True:
+        await asyncio.sleep(RATE_PUSH_INTERVAL)
+        for base in rate_hub.bases():
+            try:
+                await fetch_rate_table(base)
+            except HTTPException as e:
+                logger.warning(f"Rate push refresh failed for {base}: {e.detail}")
+            except Exception:
+                # Anything unexpected must not end the loop - every subscriber would stop updating
+                logger.exception(f"Rate push refresh failed for {base}")
+
+def save_rate_snapshot(tables: List[RateTable]) -> None:
+    """Persist the latest table of every base for the next instance (blocking - run in a thread)"""
+    if not RATE_SNAPSHOT_PATH:
+        return
+    try:
+        with snapshot_write_lock:
+            save_tables(RATE_SNAPSHOT_PATH, tables)
+        snapshot_stats["saves"] += 1
+    except OSError as e:
+        logger.warning(f"Could not save rate snapshot: {e}")
+
+def schedule_snapshot_save() -> None:
+    """Save the snapshot soon, coalescing every refresh until the save starts"""
+    global snapshot_dirty, snapshot_save_task
+    if not RATE_SNAPSHOT_PATH:
+        return
+    snapshot_dirty = True
+    if snapshot_save_task is None or snapshot_save_task.done():
+        snapshot_save_task = asyncio.ensure_future(save_snapshot_later())
+
+async def save_snapshot_later() -> None:
+    """Write the snapshot in a thread; refreshes during a write trigger one more"""
+    global snapshot_dirty
+    while snapshot_dirty:
+        await asyncio.sleep(RATE_SNAPSHOT_SAVE_DELAY)
+        snapshot_dirty = False
+        await asyncio.to_thread(save_rate_snapshot, list(last_known_good.values()))
+
+def restore_rate_snapshot() -> int:
+    """Load saved tables still within the hard TTL so the first requests are cache hits"""
+    if not RATE_SNAPSHOT_PATH:
+        return 0
+    try:
+        tables = load_tables(RATE_SNAPSHOT_PATH)
+    except OSError as e:
+        logger.warning(f"Could not read rate snapshot: {e}")
+        return 0
+    
+    restored = 0
+    for table in tables:
+        # Keep the original fetch time: past the soft TTL they are served stale and revalidated
+        if get_cache_status(table.fetched_at) is None:
+            continue
+        set_cached_rates(get_cache_key(table.pivot), table, table.fetched_at)
+        last_known_good[table.pivot] = table
+        restored += 1
+    snapshot_stats["restored_tables"] = restored
+    if restored:
+        logger.info(f"Restored {restored} rate tables from {RATE_SNAPSHOT_PATH}")
+    return restored
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the cache from the last snapshot and run background maintenance for the app lifetime"""
+    restore_rate_snapshot()
+    request_metrics.prepare(app.routes)
+    sweeper = asyncio.create_task(sweep_cache_periodically())
+    pusher = asyncio.create_task(push_rates_periodically())
+    prefetch = asyncio.create_task(prefetcher.run(PREFETCH_INTERVAL)) if PREFETCH_CALLS_PER_HOUR > 0 else None
+    yield
+    sweeper.cancel()
+    pusher.cancel()
+    if prefetch is not None:
+        prefetch.cancel()
+    if snapshot_save_task is not None:
+        snapshot_save_task.cancel()
+    await asyncio.to_thread(save_rate_snapshot, list(last_known_good.values()))
+    if stream_pool is not None:
+        stream_pool.shutdown(wait=False, cancel_futures=True)
+    if http_client is not None:
+        await http_client.aclose()
 
 # FastAPI app
 app = FastAPI(
     title="Kconvert API",
     description="Ultra-optimized currency converter",
-    version="3.0.0"
+    version="3.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -73,9 +330,9 @@ app.add_middleware(
     max_age=600,  # Cache preflight for 10 minutes
 )
 
-# Rate limiting
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Outermost, so latency covers CORS and error handling too
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
 
 # Comprehensive 100+ currencies list
 CURRENCIES = {
@@ -140,126 +397,308 @@ CURRENCIES = {
     "SBD": "Solomon Islands Dollar", "PGK": "Papua New Guinean Kina", "XPF": "CFP Franc",
 }
 
-# Pydantic models for request validation
-class ConvertRequest(BaseModel):
-    amount: float
-    from_currency: str
-    to_currency: str
-    
-    @field_validator('amount')
-    @classmethod
-    def validate_amount(cls, v):
-        if v <= 0 or v > 1000000000:
-            raise ValueError('Amount must be positive and less than 1 billion')
-        return v
-    
-    @field_validator('from_currency', 'to_currency')
-    @classmethod
-    def validate_currency(cls, v):
-        if not re.match(r'^[A-Z]{3}$', v.upper()):
-            raise ValueError('Currency must be 3 uppercase letters')
-        return v.upper()
-
-class RatesRequest(BaseModel):
-    base: str
-    targets: str
-    
-    @field_validator('base')
-    @classmethod
-    def validate_base(cls, v):
-        if not re.match(r'^[A-Z]{3}$', v.upper()):
-            raise ValueError('Base currency must be 3 uppercase letters')
-        return v.upper()
-    
-    @field_validator('targets')
-    @classmethod
-    def validate_targets(cls, v):
-        targets = [t.strip().upper() for t in v.split(',')]
-        for target in targets:
-            if not re.match(r'^[A-Z]{3}$', target):
-                raise ValueError(f'Invalid target currency: {target}')
-        return ','.join(targets)
+# Regions for currency grouping
+REGIONS = {
+    "North America": ["USD", "CAD", "MXN"],
+    "Europe": ["EUR", "GBP", "CHF", "SEK", "NOK", "PLN"],
+    "Asia Pacific": ["JPY", "CNY", "AUD", "NZD", "SGD", "HKD", "KRW", "THB", "MYR", "TWD"],
+    "Middle East & Africa": ["AED", "SAR", "ILS", "ZAR", "TRY"],
+    "South America": ["BRL", "CLP", "COP", "ARS"],
+    "Other": ["RUB", "INR"]
+}
+
+# Static responses serialized once at startup
+CURRENCIES_RESPONSE = PreparedResponse({
+    "currencies": [{"code": code, "name": name} for code, name in CURRENCIES.items()],
+    "count": len(CURRENCIES)
+})
+REGIONS_RESPONSE = PreparedResponse({
+    "regions": [{"name": region, "currencies": currencies} for region, currencies in REGIONS.items()],
+    "count": len(REGIONS)
+})
 
 def create_jwt(owner: str = "oxchin") -> str:
     """Create JWT token"""
+    from jose import jwt  # imports the crypto backends - deferred until a token is issued
+    
     now = time.time()
     payload = {"owner": owner, "iat": now, "exp": now + (TOKEN_EXP_MINUTES * 60)}
     return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
 
-def verify_jwt(token: str) -> None:
-    """Verify JWT token with enhanced security"""
+def verify_jwt(token: str) -> float:
+    """Verify JWT token with enhanced security, returning its expiry time"""
     if not token or len(token) < 10:
+        JWT_FAILURES["format"].inc()
         raise HTTPException(status_code=401, detail="Invalid token format")
     
+    # Fast path: token already verified and not yet expired
+    digest = token_cache.digest(token)
+    exp = token_cache.get(digest)
+    if exp is not None:
+        return exp
+    
+    from jose import ExpiredSignatureError, JWTError, jwt  # only on a token cache miss
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
         if payload.get("exp", 0) < time.time():
+            JWT_FAILURES["expired"].inc()
             raise HTTPException(status_code=401, detail="Token expired")
         if payload.get("owner") != "oxchin":
+            JWT_FAILURES["owner"].inc()
             raise HTTPException(status_code=403, detail="Invalid owner")
+        token_cache.add(digest, payload["exp"])
+        return payload["exp"]
     except JWTError as e:
+        JWT_FAILURES["expired" if isinstance(e, ExpiredSignatureError) else "invalid"].inc()
         logger.warning(f"JWT verification failed: {str(e)}")
         raise HTTPException(status_code=403, detail="Invalid token")
 
-def get_cache_key(base: str, targets: str = None) -> str:
-    """Generate cache key for rates"""
-    return f"rates:{base}:{targets or 'all'}"
+def get_cache_key(base: str) -> str:
+    """Generate cache key for the canonical rate table of base"""
+    return f"rates:{base}"
 
-def is_cache_valid(timestamp: float) -> bool:
-    """Check if cache entry is still valid"""
-    return time.time() - timestamp < CACHE_TTL
+def get_cache_status(timestamp: float) -> Optional[str]:
+    """Classify entry age: 'fresh' within soft TTL, 'stale' until hard TTL, else None"""
+    age = time.time() - timestamp
+    if age < CACHE_TTL:
+        return "fresh"
+    if age < CACHE_HARD_TTL:
+        return "stale"
+    return None
 
-def get_cached_rates(cache_key: str) -> Optional[Dict]:
-    """Get rates from cache if valid"""
+def lookup_cached_rates(cache_key: str) -> Tuple[Optional[Any], Optional[str]]:
+    """Get cached entry and its freshness, dropping entries past the hard TTL"""
     if cache_key in cache:
         data, timestamp = cache[cache_key]
-        if is_cache_valid(timestamp):
-            return data
-        else:
-            del cache[cache_key]
-    return None
+        status = get_cache_status(timestamp)
+        if status:
+            return data, status
+        del cache[cache_key]
+    return None, None
 
-def set_cached_rates(cache_key: str, data: Dict) -> None:
-    """Set rates in cache with timestamp"""
-    cache[cache_key] = (data, time.time())
+def set_cached_rates(cache_key: str, data: RateTable, stored_at: Optional[float] = None) -> None:
+    """Set rates in cache with timestamp (defaults to now)"""
+    cache[cache_key] = (data, stored_at if stored_at is not None else time.time())
 
-async def fetch_rates(base: str, use_cache: bool = True) -> Dict:
-    """Fetch exchange rates with caching and parallel processing"""
-    cache_key = get_cache_key(base)
+def upstream_error_type(payload: Any) -> Optional[str]:
+    """exchangerate-api's `error-type` from an error payload, if it has one"""
+    return payload.get("error-type") if isinstance(payload, dict) else None
+
+def refuse_unquoted(base: str) -> HTTPException:
+    """Remember that upstream does not quote base (for the hard TTL) and return the error to raise"""
+    unquoted_bases[base] = time.time() + CACHE_HARD_TTL
+    logger.warning(f"Upstream does not quote {base}")
+    return HTTPException(status_code=400, detail=f"Unsupported currency: {base}")
+
+async def fetch_upstream(base: str) -> Dict:
+    """Fetch a `latest` payload for base from exchangerate-api (fails fast while the circuit is open)
+    
+    Only upstream faults count towards opening the circuit: 5xx answers,
+    timeouts, connection errors and broken payloads. Errors about the request
+    itself (4xx, `result` != success, e.g. an unsupported code) do not, so
+    clients cannot open it by asking for codes upstream does not quote.
+    """
+    if not upstream_breaker.allow():
+        UPSTREAM_ERRORS["circuit_open"].inc()
+        raise HTTPException(status_code=503, detail="Exchange API unavailable (circuit open)")
     
-    # Check cache first
-    if use_cache:
-        cached_data = get_cached_rates(cache_key)
-        if cached_data:
-            logger.info(f"Cache hit for {base}")
-            return cached_data
+    client = get_http_client()
+    import httpx  # already loaded by get_http_client(); needed for the exception types
     
+    start_time = time.time()
     try:
-        url = f"https://v6.exchangerate-api.com/v6/{EXCHANGE_API_KEY}/latest/{base}"
-        start_time = time.time()
+        url = f"{EXCHANGE_API_URL}/{EXCHANGE_API_KEY}/latest/{base}"
         
-        response = await http_client.get(url)
+        response = await client.get(url)
         response.raise_for_status()
         
         response_time = time.time() - start_time
+        upstream_latency.observe(response_time)
         logger.info(f"API response time for {base}: {response_time:.3f}s")
         
         data = response.json()
         if data.get("result") != "success":
+            upstream_breaker.record_neutral()
+            UPSTREAM_ERRORS["api_error"].inc()
+            if upstream_error_type(data) == "unsupported-code":
+                raise refuse_unquoted(base)
             raise HTTPException(status_code=500, detail="Exchange API error")
-        
-        # Cache the result
-        if use_cache:
-            set_cached_rates(cache_key, data)
-            logger.info(f"Cached rates for {base}")
-        
+        upstream_breaker.record_success()
         return data
     except httpx.TimeoutException:
+        upstream_breaker.record_failure()
+        upstream_latency.observe(time.time() - start_time)
+        UPSTREAM_ERRORS["timeout"].inc()
         logger.error(f"Timeout fetching rates for {base}")
         raise HTTPException(status_code=504, detail="Request timeout")
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code >= 500:
+            upstream_breaker.record_failure()
+        else:
+            upstream_breaker.record_neutral()
+        upstream_latency.observe(time.time() - start_time)
+        UPSTREAM_ERRORS["http_status"].inc()
+        logger.error(f"Upstream status {e.response.status_code} for {base}")
+        try:
+            error_type = upstream_error_type(e.response.json())
+        except ValueError:
+            error_type = None
+        if error_type == "unsupported-code":
+            raise refuse_unquoted(base)
+        raise HTTPException(status_code=502, detail="Exchange API error")
     except httpx.RequestError as e:
+        upstream_breaker.record_failure()
+        UPSTREAM_ERRORS["connection"].inc()
         logger.error(f"Request error for {base}: {str(e)}")
         raise HTTPException(status_code=503, detail="Service unavailable")
+    except (ValueError, AttributeError) as e:
+        # A 200 whose body is not a JSON object
+        upstream_breaker.record_failure()
+        UPSTREAM_ERRORS["invalid_payload"].inc()
+        logger.error(f"Invalid payload for {base}: {e}")
+        raise HTTPException(status_code=502, detail="Exchange API error")
+
+def read_shared_pivot_table() -> Optional[RateTable]:
+    """Pivot table published by any worker, if still within the soft TTL"""
+    table = shared_rates.read()
+    if table is not None and time.time() - table.fetched_at < CACHE_TTL:
+        SHARED_RATES_CACHE["hit"].inc()
+        return table
+    SHARED_RATES_CACHE["miss"].inc()
+    return None
+
+async def fetch_shared_pivot_table() -> RateTable:
+    """Get the pivot table through the cross-worker store
+    
+    The worker that wins the refresh lock calls upstream and publishes;
+    the others wait briefly for that publish instead of fetching too.
+    """
+    table = read_shared_pivot_table()
+    if table is not None:
+        return table
+    
+    if shared_rates.try_lock_refresh():
+        try:
+            # Another worker may have published while we were acquiring the lock
+            table = read_shared_pivot_table()
+            if table is None:
+                data = await fetch_upstream(PIVOT_CURRENCY)
+                table = RateTable.from_payload(data, fetched_at=time.time())
+                shared_rates.publish(table)
+            return table
+        finally:
+            shared_rates.unlock_refresh()
+    
+    deadline = time.time() + SHARED_RATES_WAIT
+    while time.time() < deadline:
+        await asyncio.sleep(0.05)
+        table = read_shared_pivot_table()
+        if table is not None:
+            return table
+    
+    logger.warning("Timed out waiting for shared rate refresh, fetching directly")
+    data = await fetch_upstream(PIVOT_CURRENCY)
+    return RateTable.from_payload(data, fetched_at=time.time())
+
+async def refresh_rate_table(base: str) -> RateTable:
+    """Fetch base from upstream (or the shared store) and cache its rate table"""
+    if shared_rates is not None and base == PIVOT_CURRENCY:
+        table = await fetch_shared_pivot_table()
+    else:
+        data = await fetch_upstream(base)
+        table = RateTable.from_payload(data, fetched_at=time.time())
+    
+    # One canonical table per base and upstream publication: keep the resident
+    # table when the provider has not published a newer one
+    current, _ = lookup_cached_rates(get_cache_key(base))
+    if current is not None and current.version == table.version:
+        current.fetched_at = table.fetched_at
+        table = current
+    # Age entries from the upstream fetch so every worker expires them together
+    set_cached_rates(get_cache_key(base), table, table.fetched_at)
+    last_known_good[base] = table
+    schedule_snapshot_save()
+    if table is not current:
+        rate_hub.publish(table)
+    logger.info(f"Cached rate table for {base}")
+    return table
+
+def schedule_refresh(base: str) -> None:
+    """Revalidate base's rate table in the background unless already in flight"""
+    cache_key = get_cache_key(base)
+    if cache_key in upstream_flight or upstream_breaker.is_open:
+        return
+    
+    task = asyncio.ensure_future(upstream_flight.do(cache_key, lambda: refresh_rate_table(base)))
+    background_tasks.add(task)
+    task.add_done_callback(_background_refresh_done)
+
+def _background_refresh_done(task: asyncio.Task) -> None:
+    """Release background refresh task and log failures"""
+    background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background refresh failed: {task.exception()}")
+
+async def fetch_rate_table(
+    base: str, use_cache: bool = True, quotes: Tuple[str, ...] = ()
+) -> Tuple[RateTable, str]:
+    """Get a rate table that can price base (and every code in quotes), triangulating through the pivot
+    
+    A single upstream call for PIVOT_CURRENCY serves every base it quotes;
+    only bases missing from the pivot vector are fetched directly, and a
+    fresh table that cannot price the request is not fetched again. Bases
+    upstream answered `unsupported-code` for are refused without a call.
+    Returns the table with its freshness: 'fresh', 'stale' (served from
+    cache while a background refresh runs) or 'revalidated' (just fetched).
+    """
+    def prices(table: RateTable) -> bool:
+        return base in table and all(code in table for code in quotes)
+    
+    for table_base in dict.fromkeys((PIVOT_CURRENCY, base)):
+        if unquoted_bases.get(table_base, 0.0) > time.time():
+            raise HTTPException(status_code=400, detail=f"Unsupported currency: {table_base}")
+        cache_key = get_cache_key(table_base)
+        if use_cache:
+            table, status = lookup_cached_rates(cache_key)
+            if table is not None and prices(table):
+                prefetcher.record(table_base)
+                if status == "stale":
+                    RATES_CACHE["stale"].inc()
+                    schedule_refresh(table_base)
+                else:
+                    RATES_CACHE["hit"].inc()
+                logger.info(f"Cache {status} for {base} via {table_base}")
+                return table, status
+            if status == "fresh":
+                # Upstream has not published since - refetching this table cannot price base
+                continue
+            # Concurrent misses share a single upstream call
+            RATES_CACHE["miss"].inc()
+            try:
+                table = await upstream_flight.do(cache_key, lambda: refresh_rate_table(table_base))
+            except HTTPException:
+                # Upstream down: serve the last known-good table, marked stale
+                fallback = last_known_good.get(table_base)
+                if fallback is None or not prices(fallback):
+                    raise
+                RATES_CACHE["fallback"].inc()
+                logger.warning(f"Serving last known-good rates for {base} via {table_base}")
+                return fallback, "stale"
+        else:
+            data = await fetch_upstream(table_base)
+            table = RateTable.from_payload(data, fetched_at=time.time())
+        if prices(table):
+            prefetcher.record(table_base)
+            return table, "revalidated"
+    
+    raise HTTPException(status_code=500, detail="Rate not available")
+
+async def fetch_rates(base: str, use_cache: bool = True) -> Dict:
+    """Fetch exchange rates for base, derived from the cached pivot table"""
+    table, status = await fetch_rate_table(base, use_cache)
+    payload = table.to_payload(base)
+    payload["data_freshness"] = status
+    return payload
 
 async def fetch_multiple_rates(bases: List[str]) -> Dict[str, Dict]:
     """Fetch multiple currency rates in parallel"""
@@ -311,7 +750,7 @@ async def auth_options():
     return Response(status_code=200)
 
 @app.get("/api/auth")
-@limiter.limit(f"{AUTH_RATE_LIMIT}/minute")
+@limiter.limit(AUTH_RATE_LIMIT)
 async def get_token(request: Request, origin: Optional[str] = Header(default=None, alias="Origin")):
     """Get JWT authentication token"""
     if origin and CORS_ORIGINS != ["*"] and origin not in CORS_ORIGINS:
@@ -324,38 +763,25 @@ async def get_token(request: Request, origin: Optional[str] = Header(default=Non
     }
 
 @app.get("/api/currencies")
-async def get_currencies():
-    """Get supported currencies"""
-    return {
-        "currencies": [{"code": code, "name": name} for code, name in CURRENCIES.items()],
-        "count": len(CURRENCIES)
-    }
+async def get_currencies(request: Request):
+    """Get supported currencies (pre-serialized, ETag-tagged)"""
+    return CURRENCIES_RESPONSE.respond(request)
 
 @app.get("/api/regions")
-async def get_regions():
-    """Get supported regions/countries for currency grouping"""
-    regions = {
-        "North America": ["USD", "CAD", "MXN"],
-        "Europe": ["EUR", "GBP", "CHF", "SEK", "NOK", "PLN"],
-        "Asia Pacific": ["JPY", "CNY", "AUD", "NZD", "SGD", "HKD", "KRW", "THB", "MYR", "TWD"],
-        "Middle East & Africa": ["AED", "SAR", "ILS", "ZAR", "TRY"],
-        "South America": ["BRL", "CLP", "COP", "ARS"],
-        "Other": ["RUB", "INR"]
-    }
-    return {
-        "regions": [{"name": region, "currencies": currencies} for region, currencies in regions.items()],
-        "count": len(regions)
-    }
+async def get_regions(request: Request):
+    """Get supported regions/countries for currency grouping (pre-serialized, ETag-tagged)"""
+    return REGIONS_RESPONSE.respond(request)
 
 @app.get("/api/rates/{base}")
-@limiter.limit(f"{RATE_LIMIT}/minute")
+@limiter.limit(RATE_LIMIT)
 async def get_rates(
     request: Request,
+    response: Response,
     base: str,
     token: str = Query(...),
     targets: str = Query(...)
 ):
-    """Get exchange rates with enhanced validation and caching"""
+    """Get exchange rates with enhanced validation, caching and conditional GET"""
     start_time = time.time()
     verify_jwt(token)
     
@@ -373,37 +799,32 @@ async def get_rates(
     if invalid:
         raise HTTPException(status_code=400, detail=f"Unsupported currencies: {invalid}")
     
-    # Check cache first
-    cache_key = get_cache_key(base, ','.join(sorted(target_list)))
-    cached_result = get_cached_rates(cache_key)
-    if cached_result:
-        processing_time = time.time() - start_time
-        cached_result["processing_time_ms"] = round(processing_time * 1000, 2)
-        cached_result["cache_hit"] = True
-        return cached_result
+    # Slice the canonical rate table - no per-target-combination cache entries
+    table, freshness = await fetch_rate_table(base)
     
-    # Fetch fresh data
-    data = await fetch_rates(base)
-    rates = data.get("conversion_rates", {})
-    filtered_rates = {t: rates.get(t) for t in target_list if t in rates}
+    # Version the response by upstream publication so polling clients get a 304
+    etag = make_etag(base, ",".join(target_list), table.pivot, table.version)
+    headers = conditional_headers(etag, table.time_last_update_unix)
+    if is_not_modified(request, etag, table.time_last_update_unix):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     
+    filtered_rates = table.rates_for(base, target_list)
     processing_time = time.time() - start_time
     result = {
         "base_currency": base,
         "conversion_rates": filtered_rates,
         "rates_count": len(filtered_rates),
+        "rates_updated_unix": table.time_last_update_unix,
         "timestamp": time.time(),
         "processing_time_ms": round(processing_time * 1000, 2),
-        "cache_hit": False,
-        "data_freshness": "live"
+        "cache_hit": freshness != "revalidated",
+        "data_freshness": freshness
     }
-    
-    # Cache the result
-    set_cached_rates(cache_key, result)
     return result
 
 @app.get("/api/convert")
-@limiter.limit(f"{RATE_LIMIT}/minute")
+@limiter.limit(RATE_LIMIT)
 async def convert(
     request: Request,
     token: str = Query(...),
@@ -445,36 +866,10 @@ async def convert(
             "conversion_type": "same_currency"
         }
     
-    # Check cache for conversion rate
-    cache_key = get_cache_key(from_curr, to_curr)
-    cached_data = get_cached_rates(cache_key)
-    
-    if cached_data and "conversion_rates" in cached_data:
-        rates = cached_data["conversion_rates"]
-        if to_curr in rates:
-            rate = rates[to_curr]
-            converted = round(amount * rate, 6)  # Higher precision
-            processing_time = time.time() - start_time
-            
-            return {
-                "amount": amount,
-                "from_currency": from_curr,
-                "to_currency": to_curr,
-                "converted_amount": converted,
-                "exchange_rate": rate,
-                "timestamp": time.time(),
-                "processing_time_ms": round(processing_time * 1000, 2),
-                "cache_hit": True,
-                "conversion_type": "cached"
-            }
-    
-    # Fetch fresh rates
-    data = await fetch_rates(from_curr)
-    rates = data.get("conversion_rates", {})
-    if to_curr not in rates:
-        raise HTTPException(status_code=500, detail="Rate not available")
+    # Read the rate straight from the canonical rate table (the direct one if the pivot lacks to_curr)
+    table, freshness = await fetch_rate_table(from_curr, quotes=(to_curr,))
     
-    rate = rates[to_curr]
+    rate = table.rate(from_curr, to_curr)
     converted = round(amount * rate, 6)  # Higher precision
     processing_time = time.time() - start_time
     
@@ -484,17 +879,20 @@ async def convert(
         "to_currency": to_curr,
         "converted_amount": converted,
         "exchange_rate": rate,
+        "rates_updated_unix": table.time_last_update_unix,
         "timestamp": time.time(),
         "processing_time_ms": round(processing_time * 1000, 2),
-        "cache_hit": False,
-        "conversion_type": "live",
-        "rate_source": "exchangerate-api"
+        "cache_hit": freshness != "revalidated",
+        "data_freshness": freshness,
+        "conversion_type": "live" if freshness == "revalidated" else "cached",
+        "rate_source": "exchangerate-api",
+        "pivot_currency": table.pivot
     }
     
     return result
 
 @app.get("/api/batch-convert")
-@limiter.limit(f"{RATE_LIMIT}/minute")
+@limiter.limit(RATE_LIMIT)
 async def batch_convert(
     request: Request,
     token: str = Query(...),
@@ -521,9 +919,9 @@ async def batch_convert(
     if invalid_to:
         raise HTTPException(status_code=400, detail=f"Invalid to currencies: {invalid_to}")
     
-    # Fetch rates
-    data = await fetch_rates(from_curr)
-    rates = data.get("conversion_rates", {})
+    # Slice the canonical rate table
+    table, freshness = await fetch_rate_table(from_curr)
+    rates = table.rates_for(from_curr, to_curr_list)
     
     conversions = []
     for to_curr in to_curr_list:
@@ -542,29 +940,304 @@ async def batch_convert(
         "from_currency": from_curr,
         "conversions": conversions,
         "total_conversions": len(conversions),
+        "rates_updated_unix": table.time_last_update_unix,
+        "data_freshness": freshness,
         "timestamp": time.time(),
         "processing_time_ms": round(processing_time * 1000, 2)
     }
 
+@app.post("/api/bulk-convert")
+@limiter.limit(RATE_LIMIT)
+async def bulk_convert_rows(request: Request, token: str = Query(...)):
+    """Convert many (amount, from, to) rows in one vectorized pass
+    
+    Body is columnar JSON {"amount": [...], "from": [...], "to": [...]} or the
+    packed binary layout in bulk_convert (Content-Type application/vnd.kconvert.bulk).
+    Rows that cannot be converted get a per-row error code instead of failing the batch.
+    """
+    start_time = time.time()
+    verify_jwt(token)
+    import bulk_convert  # NumPy-backed, loaded by the first bulk request
+    
+    body = await read_body_limited(request, BULK_MAX_BYTES)
+    binary = request.headers.get("content-type", "").startswith(bulk_convert.BINARY_CONTENT_TYPE)
+    try:
+        if binary:
+            columns = bulk_convert.parse_binary(body, BULK_MAX_ROWS)
+        else:
+            columns = bulk_convert.parse_json(body, BULK_MAX_ROWS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Every row is priced from the pivot table - one lookup for the whole batch
+    table, freshness = await fetch_rate_table(PIVOT_CURRENCY)
+    converted, rates, errors = bulk_convert.convert_columns(table, columns, CURRENCIES)
+    
+    processing_time = time.time() - start_time
+    rows = len(columns)
+    rows_per_second = round(rows / processing_time) if processing_time > 0 else rows
+    
+    if binary or bulk_convert.BINARY_CONTENT_TYPE in request.headers.get("accept", ""):
+        return Response(
+            content=bulk_convert.pack_binary_result(converted, rates, errors, table.time_last_update_unix),
+            media_type=bulk_convert.BINARY_CONTENT_TYPE,
+            headers={
+                "X-Data-Freshness": freshness,
+                "X-Processing-Time-Ms": str(round(processing_time * 1000, 2)),
+                "X-Rows-Per-Second": str(rows_per_second)
+            }
+        )
+    
+    return {
+        "rows": rows,
+        "failed_rows": bulk_convert.failed_count(errors),
+        **bulk_convert.json_result(converted, rates, errors),
+        "rates_updated_unix": table.time_last_update_unix,
+        "data_freshness": freshness,
+        "timestamp": time.time(),
+        "processing_time_ms": round(processing_time * 1000, 2),
+        "rows_per_second": rows_per_second
+    }
+
+async def read_body_limited(request: Request, max_bytes: int) -> bytes:
+    """Request body, refused with 413 as soon as it exceeds max_bytes"""
+    too_large = HTTPException(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+    try:
+        declared = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if declared > max_bytes:
+        raise too_large
+    
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+async def read_upload(request: Request, done: asyncio.Event):
+    """request.stream() that sets done once the whole upload has been read"""
+    async for chunk in request.stream():
+        yield chunk
+    done.set()
+
+class UploadStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body is converted from an upload still being read
+    
+    On ASGI < 2.4 servers Starlette watches receive() for a disconnect while
+    streaming, which would swallow the upload chunks. Until upload_done is set
+    the upload reader owns receive() (and raises ClientDisconnect itself), then
+    Starlette's listener takes over; disconnect and background handling are
+    the base class's.
+    """
+    def __init__(self, content, upload_done: asyncio.Event, **kwargs):
+        super().__init__(content, **kwargs)
+        self.upload_done = upload_done
+    
+    async def listen_for_disconnect(self, receive):
+        await self.upload_done.wait()
+        await super().listen_for_disconnect(receive)
+
+@app.post("/api/stream-convert")
+@limiter.limit(RATE_LIMIT)
+async def stream_convert_rows(
+    request: Request,
+    token: str = Query(...),
+    fmt: Optional[str] = Query(None, alias="format")
+):
+    """Convert a CSV or NDJSON upload of any size, streaming rows back as they are done
+    
+    CSV needs amount/from/to header columns; NDJSON lines need amount/from/to keys.
+    Each row gets exchange_rate, converted_amount and an error code. The whole
+    stream is priced from one pinned snapshot and only a few chunks are held in memory.
+    """
+    verify_jwt(token)
+    import stream_convert  # loaded by the first streaming request
+    
+    try:
+        fmt = stream_convert.detect_format(request.headers.get("content-type", ""), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    upload_done = asyncio.Event()
+    chunks = read_upload(request, upload_done)
+    if fmt == stream_convert.CSV:
+        # Reject a bad header before the 200 response starts
+        header, chunks = await stream_convert.peek_header(chunks)
+        try:
+            stream_convert.csv_field_positions(header)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    table, freshness = await fetch_rate_table(PIVOT_CURRENCY)
+    snapshot = stream_convert.pin_snapshot(table, CURRENCIES)
+    
+    return UploadStreamingResponse(
+        stream_convert.convert_stream_async(
+            chunks,
+            fmt,
+            snapshot,
+            get_stream_pool(),
+            chunk_bytes=STREAM_CHUNK_BYTES,
+            max_in_flight=max(STREAM_WORKERS, 1) * 2
+        ),
+        upload_done,
+        media_type=stream_convert.MEDIA_TYPES[fmt],
+        headers={
+            "X-Rates-Updated-Unix": str(table.time_last_update_unix),
+            "X-Data-Freshness": freshness
+        }
+    )
+
+def parse_subscription(base: str, targets: str) -> Tuple[str, Tuple[str, ...]]:
+    """Validate a push subscription; empty targets means every supported currency"""
+    base = base.upper().strip()
+    if not re.match(r'^[A-Z]{3}$', base) or base not in CURRENCIES:
+        raise HTTPException(status_code=400, detail=f"Unsupported currency: {base}")
+    
+    target_list = [t.strip().upper() for t in targets.split(",") if t.strip()] or list(CURRENCIES)
+    invalid = [t for t in target_list if not re.match(r'^[A-Z]{3}$', t) or t not in CURRENCIES]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Unsupported currencies: {invalid}")
+    return base, tuple(target_list)
+
+async def sse_events(subscriber: Subscriber, expires_at: float):
+    """Full snapshot, then one event per change; ends when the token expires"""
+    try:
+        yield b"retry: 5000\ndata: " + subscriber.topic.snapshot_frame() + b"\n\n"
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                break
+            try:
+                frame = await asyncio.wait_for(subscriber.next_frame(), timeout=min(PUSH_HEARTBEAT_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            yield b"data: " + frame + b"\n\n"
+        yield b"event: token_expired\ndata: {}\n\n"
+    finally:
+        rate_hub.unsubscribe(subscriber)
+
+@app.get("/api/stream/rates/{base}")
+@limiter.limit(RATE_LIMIT)
+async def stream_rates(
+    request: Request,
+    base: str,
+    token: str = Query(...),
+    targets: str = Query("")
+):
+    """Server-Sent Events feed of rate changes for base - replaces polling /api/rates
+    
+    The first event carries every subscribed rate ("full": true); later events
+    carry only the rates that changed when the cached table was refreshed.
+    """
+    expires_at = verify_jwt(token)
+    base, target_list = parse_subscription(base, targets)
+    table, _ = await fetch_rate_table(base)
+    subscriber = rate_hub.subscribe(base, target_list, table)
+    
+    return StreamingResponse(
+        sse_events(subscriber, expires_at),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/api/ws/rates/{base}")
+async def websocket_rates(
+    websocket: WebSocket,
+    base: str,
+    token: str = Query(...),
+    targets: str = Query("")
+):
+    """WebSocket feed with the same messages as /api/stream/rates/{base}"""
+    try:
+        expires_at = verify_jwt(token)
+        base, target_list = parse_subscription(base, targets)
+        table, _ = await fetch_rate_table(base)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=str(e.detail))
+        return
+    
+    await websocket.accept()
+    subscriber = rate_hub.subscribe(base, target_list, table)
+    
+    async def pump():
+        await websocket.send_text(subscriber.topic.snapshot_frame().decode("utf-8"))
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                await websocket.close(code=4401, reason="Token expired")
+                return
+            try:
+                frame = await asyncio.wait_for(subscriber.next_frame(), timeout=remaining)
+            except asyncio.TimeoutError:
+                continue
+            await websocket.send_text(frame.decode("utf-8"))
+    
+    sender = asyncio.create_task(pump())
+    try:
+        # Client messages are ignored; reading them is how a disconnect is noticed
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        sender.cancel()
+        if sender.done() and not sender.cancelled() and sender.exception() is not None:
+            logger.info(f"WebSocket push ended: {sender.exception()}")
+        rate_hub.unsubscribe(subscriber)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
 @app.get("/api/cache/stats")
 async def cache_stats():
     """Get cache statistics"""
     total_entries = len(cache)
     valid_entries = 0
+    stale_entries = 0
     expired_entries = 0
     
     for key, (_, timestamp) in cache.items():
-        if is_cache_valid(timestamp):
+        status = get_cache_status(timestamp)
+        if status == "fresh":
             valid_entries += 1
+        elif status == "stale":
+            stale_entries += 1
         else:
             expired_entries += 1
     
+    # Share of rate lookups answered from cache (fresh or stale) since startup
+    hits = RATES_CACHE["hit"].value
+    stale_hits = RATES_CACHE["stale"].value
+    misses = RATES_CACHE["miss"].value
+    
     return {
         "total_entries": total_entries,
         "valid_entries": valid_entries,
+        "stale_entries": stale_entries,
         "expired_entries": expired_entries,
         "cache_ttl_seconds": CACHE_TTL,
-        "hit_ratio": round(valid_entries / max(total_entries, 1), 3)
+        "cache_hard_ttl_seconds": CACHE_HARD_TTL,
+        "background_refreshes": len(background_tasks),
+        "unquoted_bases": sorted(base for base, until in unquoted_bases.items() if until > time.time()),
+        "requests": {result: counter.value for result, counter in RATES_CACHE.items()},
+        "hit_ratio": round((hits + stale_hits) / max(hits + stale_hits + misses, 1), 3),
+        "memory": cache.stats(),
+        "single_flight": upstream_flight.stats(),
+        "token_cache": token_cache.stats(),
+        "shared_rates": shared_rates.stats() if shared_rates is not None else None,
+        "circuit_breakers": {upstream_breaker.name: upstream_breaker.stats()},
+        "rate_push": rate_hub.stats(),
+        "prefetch": prefetcher.stats(),
+        "rate_limit": limiter.stats(),
+        "rate_snapshot": {"path": RATE_SNAPSHOT_PATH or None, **snapshot_stats}
     }
 
 @app.delete("/api/cache/clear")
@@ -572,6 +1245,7 @@ async def clear_cache():
     """Clear all cache entries"""
     cleared_count = len(cache)
     cache.clear()
+    unquoted_bases.clear()
     return {
         "message": "Cache cleared",
         "cleared_entries": cleared_count,
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Prometheus Metrics
+Preallocated counters and latency histograms rendered in the Prometheus text format
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds - request latency from sub-millisecond cache hits up to slow upstream misses
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UPSTREAM_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter; inc() is a single attribute update"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class Histogram:
+    """Fixed-bucket histogram; observe() updates preallocated slots only"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (what histogram_quantile approximates)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Family:
+    """A named metric with labels; children are created once and then reused"""
+
+    def __init__(self, name: str, help_text: str, kind: str, label_names: Sequence[str], factory: Callable):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self._factory = factory
+        self.children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        """Child for these label values - resolve once at setup, not per request"""
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = self._factory()
+        return child
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        for values, child in self.children.items():
+            labels = _label_text(self.label_names, values)
+            if self.kind == "histogram":
+                cumulative = 0
+                for bound, count in zip(child.bounds + (float("inf"),), child.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    sep = "," if labels else ""
+                    lines.append(f'{self.name}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{self.name}_sum{suffix} {_number(child.sum)}")
+                lines.append(f"{self.name}_count{suffix} {child.count}")
+            else:
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{self.name}{suffix} {_number(child.value)}")
+
+
+class CollectedFamily:
+    """Metric read from existing state at scrape time (zero cost on the request path)"""
+
+    def __init__(self, name: str, help_text: str, kind: str, label_names: Sequence[str],
+                 collect: Callable[[], Iterable[Tuple[Sequence[str], float]]]):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self.collect = collect
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        for values, value in self.collect():
+            labels = _label_text(self.label_names, values)
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}{suffix} {_number(value)}")
+
+
+class Registry:
+    """All metrics exposed on /metrics"""
+
+    def __init__(self):
+        self._families: List = []
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Family:
+        family = Family(name, help_text, "counter", label_names, Counter)
+        self._families.append(family)
+        return family
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Family:
+        family = Family(name, help_text, "histogram", label_names, lambda: Histogram(buckets))
+        self._families.append(family)
+        return family
+
+    def collected(self, name: str, help_text: str, kind: str, label_names: Sequence[str],
+                  collect: Callable[[], Iterable[Tuple[Sequence[str], float]]]) -> CollectedFamily:
+        family = CollectedFamily(name, help_text, kind, label_names, collect)
+        self._families.append(family)
+        return family
+
+    def render(self) -> bytes:
+        lines: List[str] = []
+        for family in self._families:
+            family.render(lines)
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+
+class RequestMetrics:
+    """Per-route latency histogram and responses by status class
+
+    Routes are keyed by their path template (from scope["route"]) so label
+    cardinality is bounded; every route's histogram and counters are
+    allocated by prepare() before the first request.
+    """
+
+    UNMATCHED = "unmatched"
+
+    def __init__(self, registry: Registry, prefix: str):
+        self.latency = registry.histogram(
+            f"{prefix}_http_request_duration_seconds",
+            "Time from request to response headers, by route template",
+            ("route",),
+        )
+        self.responses = registry.counter(
+            f"{prefix}_http_responses_total",
+            "HTTP responses by route template and status class",
+            ("route", "status"),
+        )
+        self._routes: Dict[str, Tuple[Histogram, List[Counter]]] = {}
+        self._unmatched = self._route(self.UNMATCHED)
+
+    def _route(self, path: str) -> Tuple[Histogram, List[Counter]]:
+        entry = self._routes.get(path)
+        if entry is None:
+            entry = self._routes[path] = (
+                self.latency.labels(path),
+                [self.responses.labels(path, status) for status in STATUS_CLASSES],
+            )
+        return entry
+
+    def prepare(self, routes: Iterable) -> None:
+        for route in routes:
+            path = getattr(route, "path", None)
+            if path and getattr(route, "methods", None):
+                self._route(path)
+
+    def observe(self, route, status: int, seconds: float) -> None:
+        path = getattr(route, "path", None)
+        # Routes missed by prepare() (e.g. no lifespan on serverless) are added on first use
+        entry = (self._routes.get(path) or self._route(path)) if path else self._unmatched
+        entry[0].observe(seconds)
+        if 100 <= status < 600:
+            entry[1][status // 100 - 1].inc()
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing HTTP requests into RequestMetrics (WebSockets are not timed)"""
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        elapsed: Optional[float] = None
+
+        async def timed_send(message):
+            nonlocal status, elapsed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - start
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            self.metrics.observe(
+                scope.get("route"), status, elapsed if elapsed is not None else time.perf_counter() - start
+            )
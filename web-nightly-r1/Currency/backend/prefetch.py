@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Popularity-Driven Prefetch
+Refreshes the most requested rate tables shortly before they expire
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DecayingCounter:
+    """Request counts per key that halve every half_life seconds
+
+    Decay is applied lazily when a key is touched, so recording a hit is O(1).
+    Once more than max_keys are tracked, the coldest half is dropped.
+    """
+
+    def __init__(self, half_life: float = 600.0, max_keys: int = 1024):
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self._scores: Dict[str, Tuple[float, float]] = {}  # key -> (score, as of)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _decayed(self, score: float, since: float, now: float) -> float:
+        return score * math.pow(0.5, (now - since) / self.half_life)
+
+    def hit(self, key: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        score, since = self._scores.get(key, (0.0, now))
+        self._scores[key] = (self._decayed(score, since, now) + 1.0, now)
+        if len(self._scores) > self.max_keys:
+            self._compact(now)
+
+    def score(self, key: str, now: Optional[float] = None) -> float:
+        entry = self._scores.get(key)
+        if entry is None:
+            return 0.0
+        return self._decayed(entry[0], entry[1], time.time() if now is None else now)
+
+    def top(self, n: int, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """The n hottest keys with their current scores, hottest first"""
+        now = time.time() if now is None else now
+        scores = ((key, self._decayed(score, since, now)) for key, (score, since) in self._scores.items())
+        return heapq.nlargest(n, scores, key=lambda item: item[1])
+
+    def _compact(self, now: float) -> None:
+        keep = self.top(self.max_keys // 2, now)
+        self._scores = {key: (score, now) for key, score in keep}
+
+
+class CallBudget:
+    """At most calls_per_hour spends in any sliding hour"""
+
+    def __init__(self, calls_per_hour: int):
+        self.calls_per_hour = calls_per_hour
+        self._spent: deque = deque()
+
+    def remaining(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        while self._spent and self._spent[0] <= now - 3600:
+            self._spent.popleft()
+        return max(self.calls_per_hour - len(self._spent), 0)
+
+    def try_spend(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        if self.remaining(now) <= 0:
+            return False
+        self._spent.append(now)
+        return True
+
+
+class PrefetchScheduler:
+    """Refresh the top_n most requested keys within lead_seconds of expiry
+
+    expires_at(key) returns when the cached entry stops being fresh (None when
+    nothing is cached) and refresh(key) fetches it from upstream. Keys scoring
+    below min_score are never prefetched, and refreshes stop once the hourly
+    call budget is spent, so prefetching cannot multiply upstream usage. A key
+    whose refresh failed is not retried for retry_backoff seconds, doubling
+    per consecutive failure up to max_backoff.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[str], Awaitable[Any]],
+        expires_at: Callable[[str], Optional[float]],
+        top_n: int = 5,
+        lead_seconds: float = 30.0,
+        calls_per_hour: int = 60,
+        half_life: float = 600.0,
+        min_score: float = 1.0,
+        can_fetch: Optional[Callable[[], bool]] = None,
+        retry_backoff: float = 60.0,
+        max_backoff: float = 3600.0,
+    ):
+        self.refresh = refresh
+        self.expires_at = expires_at
+        self.top_n = top_n
+        self.lead_seconds = lead_seconds
+        self.min_score = min_score
+        self.can_fetch = can_fetch
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self._failures: Dict[str, Tuple[int, float]] = {}  # key -> (consecutive failures, retry at)
+        self.counter = DecayingCounter(half_life)
+        self.budget = CallBudget(calls_per_hour)
+        self.prefetched = 0
+        self.failed = 0
+        self.over_budget = 0
+
+    def record(self, key: str) -> None:
+        """Count one request served from key"""
+        self.counter.hit(key)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Hot keys that are missing or about to expire"""
+        now = time.time() if now is None else now
+        due = []
+        for key, score in self.counter.top(self.top_n, now):
+            if score < self.min_score:
+                break
+            if key in self._failures and self._failures[key][1] > now:
+                continue  # backing off after a failed refresh
+            expires_at = self.expires_at(key)
+            if expires_at is None or expires_at - now <= self.lead_seconds:
+                due.append(key)
+        return due
+
+    async def run_once(self) -> int:
+        """Refresh every due key the budget allows, returning how many were refreshed"""
+        if self.can_fetch is not None and not self.can_fetch():
+            return 0
+        keys = []
+        for key in self.due():
+            if not self.budget.try_spend():
+                self.over_budget += 1
+                break
+            keys.append(key)
+        if not keys:
+            return 0
+
+        results = await asyncio.gather(*(self.refresh(key) for key in keys), return_exceptions=True)
+        refreshed = 0
+        now = time.time()
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                self.failed += 1
+                failures = self._failures.get(key, (0, 0.0))[0] + 1
+                backoff = min(self.retry_backoff * 2 ** (failures - 1), self.max_backoff)
+                self._failures[key] = (failures, now + backoff)
+                logger.warning(f"Prefetch of {key} failed, retrying in {backoff:.0f}s: {result}")
+            else:
+                refreshed += 1
+                self._failures.pop(key, None)
+        self.prefetched += refreshed
+        return refreshed
+
+    async def run(self, interval: float) -> None:
+        """Check for due keys every interval seconds (runs for the app lifetime)"""
+        while True:
+            await asyncio.sleep(interval)
+            await self.run_once()
+
+    def stats(self) -> Dict:
+        """Counters for the stats endpoint"""
+        return {
+            "tracked_keys": len(self.counter),
+            "hot": {key: round(score, 2) for key, score in self.counter.top(self.top_n)},
+            "prefetched": self.prefetched,
+            "failed": self.failed,
+            "over_budget": self.over_budget,
+            "backing_off": sorted(key for key, (_, retry_at) in self._failures.items() if retry_at > time.time()),
+            "budget_remaining": self.budget.remaining(),
+            "calls_per_hour": self.budget.calls_per_hour,
+        }
@@ -11,10 +11,18 @@ Configures uvicorn with maximum performance settings
 """
 
 import os
+import tempfile
 from dotenv import load_dotenv
 
-# Load production environment
+# Load production environment (before WORKERS is read); main_optimized then skips it
 load_dotenv()
+os.environ["KCONVERT_DOTENV_LOADED"] = "1"
+
+# Worker processes - more than one shares the pivot rate table through a memory-mapped file
+WORKERS = int(os.getenv("WORKERS", "1"))
+if WORKERS > 1:
+    shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    os.environ.setdefault("SHARED_RATES_PATH", os.path.join(shm_dir, "kconvert-rates"))
 
 # Import the FastAPI app for ASGI
 from main_optimized import app
@@ -26,10 +34,10 @@ if __name__ == "__main__":
     import uvicorn
     # Production-optimized uvicorn configuration
     uvicorn.run(
-        app,
+        "main_optimized:app" if WORKERS > 1 else app,  # multiple workers need an import string
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8000)),
-        workers=1,  # Single worker for Zeabur
+        workers=WORKERS,  # Single worker for Zeabur unless WORKERS is set
         log_level="info",  # Better logging for debugging
         access_log=True,  # Enable access logs for monitoring
         reload=False,  # Disable auto-reload in production
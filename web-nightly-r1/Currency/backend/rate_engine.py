@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Cross-Rate Engine
+One pivot rate vector serves every base currency via triangulation
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import hashlib
+import sys
+from array import array
+from importlib.util import find_spec
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# NumPy is optional - pure Python path is used instead. Only matrix() needs it,
+# so it is imported there on first use rather than on every startup.
+HAS_NUMPY = find_spec("numpy") is not None
+
+
+class RateTable:
+    """Compact pivot rate vector: 1 PIVOT = values[i] units of codes[i]"""
+
+    __slots__ = ("pivot", "codes", "index", "values", "time_last_update_unix", "fetched_at", "_digest")
+
+    def __init__(
+        self,
+        pivot: str,
+        codes: Sequence[str],
+        values: Iterable[float],
+        time_last_update_unix: int = 0,
+        fetched_at: float = 0.0,
+    ):
+        self.pivot = pivot
+        self.codes: Tuple[str, ...] = tuple(codes)
+        self.index: Dict[str, int] = {code: i for i, code in enumerate(self.codes)}
+        self.values = array("d", values)
+        self.time_last_update_unix = int(time_last_update_unix)
+        self.fetched_at = fetched_at
+        self._digest: Optional[str] = None
+
+        if len(self.values) != len(self.codes):
+            raise ValueError("Rate vector length does not match currency codes")
+        if pivot not in self.index:
+            raise ValueError(f"Pivot currency {pivot} missing from rate vector")
+
+    @classmethod
+    def from_payload(cls, payload: Dict, fetched_at: float = 0.0) -> "RateTable":
+        """Build table from an exchangerate-api `latest` payload"""
+        rates = payload.get("conversion_rates") or {}
+        codes = [code for code, value in rates.items() if value]
+        return cls(
+            pivot=payload.get("base_code", ""),
+            codes=codes,
+            values=(float(rates[code]) for code in codes),
+            time_last_update_unix=payload.get("time_last_update_unix", 0),
+            fetched_at=fetched_at,
+        )
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.index
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate resident size, used by the bounded cache"""
+        return (
+            self.values.itemsize * len(self.values)
+            + sys.getsizeof(self.index)
+            + sum(sys.getsizeof(code) for code in self.codes)
+        )
+
+    @property
+    def version(self) -> str:
+        """Upstream publication this table came from
+
+        The upstream update time when the payload carries one, otherwise a
+        digest of the sorted rates so a table without it still changes
+        version when its rates do.
+        """
+        if self.time_last_update_unix:
+            return str(self.time_last_update_unix)
+        if self._digest is None:
+            digest = hashlib.sha256(self.pivot.encode("ascii"))
+            for code, value in sorted(zip(self.codes, self.values)):
+                digest.update(f"|{code}={value!r}".encode("ascii"))
+            self._digest = f"sha256:{digest.hexdigest()[:32]}"
+        return self._digest
+
+    def rate(self, base: str, target: str) -> float:
+        """Cross rate: 1 base = rate target (KeyError if either is unknown)"""
+        values = self.values
+        return values[self.index[target]] / values[self.index[base]]
+
+    def rates_for(self, base: str, targets: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Rates for base against targets (all codes when targets is None)"""
+        values = self.values
+        base_value = values[self.index[base]]
+        index = self.index
+        if targets is None:
+            return {code: values[i] / base_value for code, i in index.items()}
+        return {t: values[index[t]] / base_value for t in targets if t in index}
+
+    def to_payload(self, base: str) -> Dict:
+        """Render an exchangerate-api compatible payload for base"""
+        return {
+            "result": "success",
+            "base_code": base,
+            "time_last_update_unix": self.time_last_update_unix,
+            "conversion_rates": self.rates_for(base),
+            "rate_source": f"triangulated:{self.pivot}" if base != self.pivot else "direct",
+        }
+
+    def matrix(self, codes: Optional[Sequence[str]] = None):
+        """Full cross-rate matrix M[i][j] = 1 codes[i] in codes[j]
+
+        Uses a NumPy outer product when available, nested lists otherwise.
+        """
+        codes = list(codes) if codes is not None else list(self.codes)
+        positions = [self.index[code] for code in codes]
+
+        if HAS_NUMPY:
+            import numpy as np
+            vector = np.frombuffer(self.values, dtype=np.float64)[positions]
+            return np.outer(1.0 / vector, vector)
+
+        vector: List[float] = [self.values[i] for i in positions]
+        return [[target / base for target in vector] for base in vector]
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Rate Update Fan-Out Hub
+Pushes changed rates to SSE/WebSocket subscribers, serializing each update once
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import asyncio
+from collections import deque
+from typing import Dict, Optional, Set, Tuple
+
+from http_cache import dump_json
+from rate_engine import RateTable
+
+TopicKey = Tuple[str, Tuple[str, ...]]
+
+
+class Subscriber:
+    """One connected client: a short queue of pre-serialized frames"""
+
+    __slots__ = ("topic", "frames", "wakeup", "lagged", "max_pending")
+
+    def __init__(self, topic: "Topic", max_pending: int):
+        self.topic = topic
+        self.frames: deque = deque()
+        self.wakeup = asyncio.Event()
+        self.lagged = False
+        self.max_pending = max_pending
+
+    def push(self, frame: bytes) -> None:
+        if len(self.frames) >= self.max_pending:
+            # Too slow to keep up with deltas - resync with a full snapshot instead
+            self.frames.clear()
+            self.lagged = True
+        else:
+            self.frames.append(frame)
+        self.wakeup.set()
+
+    async def next_frame(self) -> bytes:
+        """Wait for the next frame to send (a full snapshot after lagging)"""
+        while not self.frames and not self.lagged:
+            self.wakeup.clear()
+            await self.wakeup.wait()
+        if self.lagged:
+            self.lagged = False
+            self.frames.clear()
+            return self.topic.snapshot_frame()
+        return self.frames.popleft()
+
+
+class Topic:
+    """Subscribers sharing one (base, targets) view and the last rates sent to them
+
+    source is the pivot of the table the view is served from (the shared pivot
+    table, or the base's own table when the pivot does not quote it); only
+    tables from that source update the topic.
+    """
+
+    def __init__(self, base: str, targets: Tuple[str, ...]):
+        self.base = base
+        self.targets = targets
+        self.source: Optional[str] = None
+        self.subscribers: Set[Subscriber] = set()
+        self.rates: Dict[str, float] = {}
+        self.updated_unix = 0
+        self._snapshot: Optional[bytes] = None
+
+    def _frame(self, rates: Dict[str, float], full: bool) -> bytes:
+        return dump_json({
+            "base": self.base,
+            "rates": rates,
+            "rates_updated_unix": self.updated_unix,
+            "full": full,
+        })
+
+    def snapshot_frame(self) -> bytes:
+        """Every subscribed rate, serialized once per table version"""
+        if self._snapshot is None:
+            self._snapshot = self._frame(self.rates, True)
+        return self._snapshot
+
+    def apply(self, table: RateTable) -> Optional[bytes]:
+        """Take table's rates and return the delta frame, or None if nothing changed"""
+        if table.time_last_update_unix < self.updated_unix or self.base not in table:
+            return None
+        rates = table.rates_for(self.base, self.targets or None)
+        changed = {code: rate for code, rate in rates.items() if self.rates.get(code) != rate}
+        self.rates = rates
+        self.updated_unix = table.time_last_update_unix
+        self._snapshot = None
+        if not changed:
+            return None
+        return self._frame(changed, False)
+
+
+class RateHub:
+    """Fan-out of rate changes to every subscriber of a (base, targets) topic
+
+    Subscribers asking for the same view share a topic, so an update is
+    diffed and serialized once per topic no matter how many clients listen.
+    """
+
+    def __init__(self, max_pending: int = 16):
+        self.max_pending = max_pending
+        self._topics: Dict[TopicKey, Topic] = {}
+        self.published = 0
+        self.frames_serialized = 0
+        self.frames_delivered = 0
+
+    def __len__(self) -> int:
+        return sum(len(topic.subscribers) for topic in self._topics.values())
+
+    def bases(self) -> Set[str]:
+        """Bases with at least one subscriber"""
+        return {topic.base for topic in self._topics.values()}
+
+    def subscribe(self, base: str, targets: Tuple[str, ...], table: Optional[RateTable] = None) -> Subscriber:
+        """Register a subscriber; table primes a new topic with the current rates"""
+        key = (base, tuple(sorted(set(targets))))
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = Topic(*key)
+        if table is not None:
+            # Primed from a table newer than the topic's: current subscribers get
+            # the change before the new one joins
+            topic.source = table.pivot
+            self._deliver(topic, topic.apply(table))
+        subscriber = Subscriber(topic, self.max_pending)
+        topic.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        topic = subscriber.topic
+        topic.subscribers.discard(subscriber)
+        if not topic.subscribers and self._topics.get((topic.base, topic.targets)) is topic:
+            del self._topics[(topic.base, topic.targets)]
+
+    def publish(self, table: RateTable) -> None:
+        """Push the rates that changed in table to the subscribers it is the source for
+
+        A base can be priced from the pivot table and from its own direct
+        table; applying both would alternate deltas between the two.
+        """
+        self.published += 1
+        for topic in list(self._topics.values()):
+            if topic.source in (None, table.pivot):
+                self._deliver(topic, topic.apply(table))
+
+    def _deliver(self, topic: Topic, frame: Optional[bytes]) -> None:
+        if frame is None or not topic.subscribers:
+            return
+        self.frames_serialized += 1
+        for subscriber in topic.subscribers:
+            subscriber.push(frame)
+        self.frames_delivered += len(topic.subscribers)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the stats endpoint"""
+        return {
+            "subscribers": len(self),
+            "topics": len(self._topics),
+            "tables_published": self.published,
+            "frames_serialized": self.frames_serialized,
+            "frames_delivered": self.frames_delivered,
+        }
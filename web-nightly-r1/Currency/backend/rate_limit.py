@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Request Rate Limiter
+GCRA limits per client, in process or shared by every worker through Redis
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import functools
+import inspect
+import logging
+import math
+import time
+from typing import Dict
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+PERIOD_SECONDS = 60.0  # limits are expressed per minute
+REDIS_TIMEOUT = 0.25  # seconds - a slow limiter must not stall requests
+REDIS_RETRY_SECONDS = 5.0  # after a Redis failure, limit in process for this long before retrying
+
+# GCRA in one atomic call: KEYS[1] holds the client's theoretical arrival time
+# on the Redis clock; ARGV = emission interval, burst. Returns {allowed, retry_after}.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local allow_at = tat + interval - burst * interval
+if now < allow_at then
+    return {0, tostring(allow_at - now)}
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+
+
+def client_address(request: Request) -> str:
+    """Client IP the limit is keyed on"""
+    return request.client.host if request.client else "127.0.0.1"
+
+
+class RateLimiter:
+    """Generic cell rate algorithm: N requests per minute with a burst of N
+
+    Each client costs one float (its theoretical arrival time, TAT) instead of
+    a window of counters. A request is admitted while TAT - now stays within the
+    burst, then TAT advances by one emission interval (60 / N seconds). Keys
+    whose TAT has passed are equivalent to new clients and are dropped by
+    compact(). Keys are kept in least-recently-seen order and capped at
+    max_keys: past the cap the least recently seen client is evicted (O(1)),
+    so a flood of distinct IPs cannot grow memory or slow every request down.
+    With a Redis client the check and update run in one Lua script
+    call, so every worker and instance shares the same quota; if Redis fails,
+    the in-process state is used for REDIS_RETRY_SECONDS before trying again.
+    """
+
+    def __init__(self, redis_url: str = "", prefix: str = "kconvert:rl:", max_keys: int = 100_000):
+        self.prefix = prefix
+        self.max_keys = max_keys
+        self._tat: Dict[str, float] = {}
+        self._script = None
+        self._backend_errors: tuple = (OSError,)
+        self._redis_healthy = True
+        self._redis_retry_at = 0.0
+        self.allowed = 0
+        self.rejected = 0
+        self.compacted = 0
+        self.evicted = 0
+        self.backend_errors = 0
+
+        if redis_url:
+            # redis is optional and only imported when configured - it is slow to import
+            try:
+                import redis.asyncio as redis_asyncio
+                from redis.exceptions import RedisError
+            except ImportError:
+                logger.warning("RATE_LIMIT_REDIS_URL set but redis is not installed; limiting per process")
+            else:
+                client = redis_asyncio.from_url(
+                    redis_url, socket_connect_timeout=REDIS_TIMEOUT, socket_timeout=REDIS_TIMEOUT
+                )
+                self._script = client.register_script(GCRA_SCRIPT)
+                self._backend_errors = (RedisError, OSError)
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._script is not None else "memory"
+
+    def _hit_local(self, key: str, interval: float, burst: int) -> float:
+        now = time.monotonic()
+        # Re-inserted on every hit, so the dict's first key is the least recently seen
+        tat = max(self._tat.pop(key, now), now)
+        allow_at = tat + interval - burst * interval
+        if now < allow_at:
+            self._tat[key] = tat
+            return allow_at - now
+        self._tat[key] = tat + interval
+        while len(self._tat) > self.max_keys:
+            del self._tat[next(iter(self._tat))]
+            self.evicted += 1
+        return 0.0
+
+    async def hit(self, key: str, per_minute: int) -> float:
+        """Count one request for key: 0.0 if admitted, else seconds until it would be"""
+        interval = PERIOD_SECONDS / per_minute
+        retry_after = None
+        if self._script is not None and (self._redis_healthy or time.monotonic() >= self._redis_retry_at):
+            try:
+                allowed, wait = await self._script(keys=[self.prefix + key], args=[interval, per_minute])
+                retry_after = 0.0 if int(allowed) else float(wait)
+                if not self._redis_healthy:
+                    logger.info("Rate limiter Redis backend recovered")
+                    self._redis_healthy = True
+            except self._backend_errors as e:
+                self.backend_errors += 1
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                if self._redis_healthy:
+                    logger.warning(f"Rate limiter Redis backend failed, limiting per process: {e}")
+                    self._redis_healthy = False
+        if retry_after is None:
+            retry_after = self._hit_local(key, interval, per_minute)
+
+        if retry_after > 0:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def compact(self) -> int:
+        """Drop clients whose bucket has fully refilled, returning how many were removed"""
+        now = time.monotonic()
+        idle = [key for key, tat in self._tat.items() if tat <= now]
+        for key in idle:
+            del self._tat[key]
+        self.compacted += len(idle)
+        return len(idle)
+
+    def limit(self, per_minute: int):
+        """Decorator limiting an endpoint to per_minute requests per client IP
+
+        The endpoint needs a `request: Request` parameter; each endpoint has
+        its own quota.
+        """
+        def decorator(func):
+            if "request" not in inspect.signature(func).parameters:
+                raise TypeError(f"{func.__name__} needs a 'request: Request' parameter to be rate limited")
+            scope = func.__name__
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request: Request = kwargs["request"]
+                retry_after = await self.hit(f"{scope}:{client_address(request)}", per_minute)
+                if retry_after > 0:
+                    raise HTTPException(
+                        status_code=429,
+                        detail=f"Rate limit exceeded: {per_minute} per 1 minute",
+                        headers={"Retry-After": str(math.ceil(retry_after))}
+                    )
+                return await func(*args, **kwargs)
+
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict:
+        """Counters for the stats endpoint"""
+        return {
+            "backend": self.backend,
+            "redis_healthy": self._redis_healthy if self._script is not None else None,
+            "tracked_clients": len(self._tat),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "compacted": self.compacted,
+            "evicted": self.evicted,
+            "backend_errors": self.backend_errors,
+        }
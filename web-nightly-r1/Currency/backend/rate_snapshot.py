@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Persistent Rate Snapshot
+Latest rate tables saved to a local file so a restarted instance starts warm
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import os
+import struct
+from array import array
+from typing import Iterable, List
+
+from rate_engine import RateTable
+
+MAGIC = b"KCSN"
+LAYOUT_VERSION = 1
+
+# magic, layout version, table count
+FILE_HEADER = struct.Struct("<4sII")
+# pivot, time_last_update_unix, fetched_at, code count - then codes (3 bytes each) and float64 values
+TABLE_HEADER = struct.Struct("<3s1xqdI")
+
+
+def save_tables(path: str, tables: Iterable[RateTable]) -> int:
+    """Atomically replace the snapshot at path with tables, returning how many were written"""
+    parts = []
+    for table in tables:
+        parts.append(TABLE_HEADER.pack(
+            table.pivot.encode("ascii"), table.time_last_update_unix, table.fetched_at, len(table.codes)
+        ))
+        parts.append("".join(table.codes).encode("ascii"))
+        parts.append(table.values.tobytes())
+    count = len(parts) // 3
+
+    # Unique temp name so several workers can save at once; readers see old or new, never partial
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(FILE_HEADER.pack(MAGIC, LAYOUT_VERSION, count))
+        f.writelines(parts)
+    os.replace(tmp_path, path)
+    return count
+
+
+def load_tables(path: str) -> List[RateTable]:
+    """Tables saved at path (empty if the file is missing, foreign or truncated)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+
+    if len(data) < FILE_HEADER.size:
+        return []
+    magic, version, count = FILE_HEADER.unpack_from(data)
+    if magic != MAGIC or version != LAYOUT_VERSION:
+        return []
+
+    tables = []
+    offset = FILE_HEADER.size
+    try:
+        for _ in range(count):
+            pivot, updated_unix, fetched_at, size = TABLE_HEADER.unpack_from(data, offset)
+            offset += TABLE_HEADER.size
+            codes = data[offset:offset + size * 3].decode("ascii")
+            offset += size * 3
+            values = array("d")
+            values.frombytes(data[offset:offset + size * 8])
+            offset += size * 8
+            tables.append(RateTable(
+                pivot.decode("ascii"),
+                [codes[i:i + 3] for i in range(0, size * 3, 3)],
+                values,
+                updated_unix,
+                fetched_at,
+            ))
+    except (struct.error, UnicodeDecodeError, ValueError):
+        return []
+    return tables
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Cross-Worker Shared Rate Table
+Memory-mapped rate vector that one worker refreshes and every worker reads
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, Optional
+
+from rate_engine import RateTable
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows - the shared store is POSIX only
+    fcntl = None
+
+MAGIC = b"KCRT"
+LAYOUT_VERSION = 1
+
+# magic, layout version, seq, fetched_at, time_last_update_unix, count, pivot
+HEADER = struct.Struct("<4sIQdqI3s1x")
+SEQ_OFFSET = 8
+SEQ = struct.Struct("<Q")
+
+
+class SharedRateStore:
+    """Seqlock-protected rate table in a memory-mapped file
+
+    Layout: HEADER | codes (3 bytes each) | float64 values. Writers bump seq
+    to odd, write, then bump it back to even; readers retry while seq is odd
+    or changed under them. Readers only copy the vector when seq moves, so a
+    steady-state read is a single 8-byte load from shared memory.
+    """
+
+    def __init__(self, path: str, max_codes: int = 512):
+        if fcntl is None:
+            raise RuntimeError("Shared rate store requires fcntl (POSIX)")
+
+        self.path = path
+        self.max_codes = max_codes
+        self.codes_offset = HEADER.size
+        self.values_offset = self.codes_offset + ((max_codes * 3 + 7) // 8) * 8
+        self.size = self.values_offset + max_codes * 8
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock_fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < self.size:
+                os.ftruncate(self._fd, self.size)
+            self._map = mmap.mmap(self._fd, self.size)
+            if self._map[:4] != MAGIC:
+                self._map[:HEADER.size] = HEADER.pack(MAGIC, LAYOUT_VERSION, 0, 0.0, 0, 0, b"")
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        self._local: Optional[RateTable] = None
+        self._local_seq = -1
+        self.publishes = 0
+        self.loads = 0
+
+    def _seq(self) -> int:
+        return SEQ.unpack_from(self._map, SEQ_OFFSET)[0]
+
+    def publish(self, table: RateTable) -> None:
+        """Write table for every worker (serialized by an exclusive file lock)"""
+        count = len(table.codes)
+        if count > self.max_codes:
+            raise ValueError(f"Rate table has {count} codes, store holds {self.max_codes}")
+
+        codes = "".join(table.codes).encode("ascii")
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            seq = self._seq()
+            SEQ.pack_into(self._map, SEQ_OFFSET, seq + 1)
+            self._map[self.codes_offset:self.codes_offset + len(codes)] = codes
+            self._map[self.values_offset:self.values_offset + count * 8] = table.values.tobytes()
+            HEADER.pack_into(
+                self._map, 0, MAGIC, LAYOUT_VERSION, seq + 1,
+                table.fetched_at, table.time_last_update_unix, count, table.pivot.encode("ascii"),
+            )
+            SEQ.pack_into(self._map, SEQ_OFFSET, seq + 2)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+        self._local, self._local_seq = table, seq + 2
+        self.publishes += 1
+
+    def read(self) -> Optional[RateTable]:
+        """Latest published table, or None if nothing was published yet"""
+        for _ in range(100):
+            seq = self._seq()
+            if seq == self._local_seq:
+                return self._local
+            if seq % 2:
+                continue  # writer in progress
+
+            _, _, _, fetched_at, updated_unix, count, pivot = HEADER.unpack_from(self._map, 0)
+            if count == 0:
+                return None
+            codes = self._map[self.codes_offset:self.codes_offset + count * 3].decode("ascii")
+            values = self._map[self.values_offset:self.values_offset + count * 8]
+            if self._seq() != seq:
+                continue  # torn read, retry
+
+            table = RateTable(
+                pivot=pivot.decode("ascii"),
+                codes=[codes[i:i + 3] for i in range(0, count * 3, 3)],
+                values=memoryview(values).cast("d"),
+                time_last_update_unix=updated_unix,
+                fetched_at=fetched_at,
+            )
+            self._local, self._local_seq = table, seq
+            self.loads += 1
+            return table
+        return None
+
+    def try_lock_refresh(self) -> bool:
+        """Elect this worker as the upstream refresher (non-blocking)"""
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def unlock_refresh(self) -> None:
+        fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def stats(self) -> Dict:
+        """Counters for the stats endpoint"""
+        return {
+            "path": self.path,
+            "seq": self._seq(),
+            "publishes": self.publishes,
+            "loads": self.loads,
+        }
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Single-Flight Request Coalescing
+Concurrent cache misses for the same key share one upstream call
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Run at most one coroutine per key; concurrent callers await its result"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0      # coroutines actually executed
+        self.coalesced = 0  # callers that joined an in-flight call (upstream calls saved)
+        self.errors = 0     # executed calls that raised
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return fn()'s result, sharing one execution between concurrent callers
+
+        The call runs in its own task and every caller awaits it through
+        asyncio.shield, so a cancelled caller never cancels the shared fetch.
+        Exceptions are propagated to every caller of that key only, and the
+        key is released as soon as the call finishes so the next miss retries.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda done, key=key: self._release(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop finished task and retrieve its exception so it is never left unobserved"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the stats endpoint"""
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.calls,
+            "upstream_calls_saved": self.coalesced,
+            "errors": self.errors,
+        }
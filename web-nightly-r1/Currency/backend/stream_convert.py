@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Streaming File Conversion
+Converts CSV/NDJSON streams chunk by chunk against one pinned rate snapshot
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import math
+import multiprocessing
+from array import array
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+import bulk_convert
+from rate_engine import RateTable
+
+CSV = "csv"
+NDJSON = "ndjson"
+MEDIA_TYPES = {CSV: "text/csv", NDJSON: "application/x-ndjson"}
+
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+
+# Column names accepted for each field (first match wins)
+AMOUNT_FIELDS = ("amount",)
+FROM_FIELDS = ("from", "from_currency")
+TO_FIELDS = ("to", "to_currency")
+OUTPUT_FIELDS = ("exchange_rate", "converted_amount", "error")
+
+# Immutable, picklable rate snapshot shipped to every chunk: (pivot, codes, values, updated unix)
+Snapshot = Tuple[str, Tuple[str, ...], bytes, int]
+
+
+def pin_snapshot(table: RateTable, allowed) -> Snapshot:
+    """Freeze the supported part of table so every chunk of a stream uses the same rates"""
+    positions = [i for i, code in enumerate(table.codes) if code in allowed or code == table.pivot]
+    codes = tuple(table.codes[i] for i in positions)
+    values = array("d", (table.values[i] for i in positions))
+    return table.pivot, codes, values.tobytes(), table.time_last_update_unix
+
+
+def snapshot_table(snapshot: Snapshot) -> RateTable:
+    pivot, codes, values, updated_unix = snapshot
+    vector = array("d")
+    vector.frombytes(values)
+    return RateTable(pivot, codes, vector, updated_unix)
+
+
+def detect_format(content_type: str, fmt: Optional[str] = None) -> str:
+    """Explicit format, else from the content type (CSV by default)"""
+    if fmt:
+        fmt = fmt.lower()
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"Unsupported format: {fmt}")
+        return fmt
+    return NDJSON if "ndjson" in (content_type or "") or "jsonl" in (content_type or "") else CSV
+
+
+class LineChunker:
+    """Cuts a byte stream into blocks of whole lines of roughly chunk_bytes each
+
+    Records must not contain raw newlines (quoted multi-line CSV fields are not supported).
+    With keep_header the first line is held back as the header.
+    """
+
+    def __init__(self, chunk_bytes: int = DEFAULT_CHUNK_BYTES, keep_header: bool = False):
+        self.chunk_bytes = chunk_bytes
+        self.header: Optional[bytes] = None if keep_header else b""
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        self._buffer += data
+        if self.header is None:
+            end = self._buffer.find(b"\n")
+            if end < 0:
+                return []
+            self.header = bytes(self._buffer[:end]).rstrip(b"\r")
+            del self._buffer[:end + 1]
+
+        blocks = []
+        while len(self._buffer) >= self.chunk_bytes:
+            end = self._buffer.rfind(b"\n", 0, self.chunk_bytes)
+            if end < 0:
+                end = self._buffer.find(b"\n", self.chunk_bytes)  # one oversized line
+                if end < 0:
+                    break
+            blocks.append(bytes(self._buffer[:end + 1]))
+            del self._buffer[:end + 1]
+        return blocks
+
+    def flush(self) -> List[bytes]:
+        if self.header is None:
+            self.header = bytes(self._buffer).rstrip(b"\r\n")
+            self._buffer.clear()
+        if not self._buffer:
+            return []
+        block = bytes(self._buffer)
+        self._buffer.clear()
+        return [block]
+
+
+def _field_index(header: List[str], names: Tuple[str, ...]) -> int:
+    lowered = [name.strip().lstrip("\ufeff").lower() for name in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    raise ValueError(f"CSV header needs a '{names[0]}' column")
+
+
+def _to_float(value) -> float:
+    if isinstance(value, bool):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _cell(value: float) -> str:
+    return "" if value != value else repr(value)
+
+
+def csv_field_positions(header: bytes) -> Tuple[int, int, int]:
+    """Positions of the amount, from and to columns (ValueError if one is missing)"""
+    names = next(csv.reader([header.decode("utf-8", "replace")]), [])
+    return _field_index(names, AMOUNT_FIELDS), _field_index(names, FROM_FIELDS), _field_index(names, TO_FIELDS)
+
+
+def output_header(header: bytes) -> bytes:
+    """First line of a converted CSV stream"""
+    return header + b"," + ",".join(OUTPUT_FIELDS).encode("ascii") + b"\n"
+
+
+async def peek_header(chunks: AsyncIterator[bytes], limit: int = 64 * 1024) -> Tuple[bytes, AsyncIterator[bytes]]:
+    """Read up to the first newline so the CSV header can be validated before
+    the response starts; returns the header and an iterator replaying the whole stream"""
+    head = b""
+    async for data in chunks:
+        head += data
+        if b"\n" in head or len(head) >= limit:
+            break
+
+    async def replay():
+        yield head
+        async for data in chunks:
+            yield data
+
+    return head.split(b"\n", 1)[0].rstrip(b"\r"), replay()
+
+
+def convert_chunk(fmt: str, header: bytes, block: bytes, snapshot: Snapshot) -> bytes:
+    """Parse, convert and format one block of lines (runs in a pool worker)"""
+    table = snapshot_table(snapshot)
+    text = block.decode("utf-8", "replace")
+
+    if fmt == CSV:
+        amount_i, from_i, to_i = csv_field_positions(header)
+        width = max(amount_i, from_i, to_i) + 1
+        columns_count = len(next(csv.reader([header.decode("utf-8", "replace")])))
+        records = [row for row in csv.reader(io.StringIO(text)) if row]
+        valid = [len(row) >= width for row in records]
+        amounts = [_to_float(row[amount_i]) if ok else math.nan for row, ok in zip(records, valid)]
+        from_codes = [row[from_i].strip().upper() if ok else "" for row, ok in zip(records, valid)]
+        to_codes = [row[to_i].strip().upper() if ok else "" for row, ok in zip(records, valid)]
+    else:
+        records = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            records.append(record if isinstance(record, dict) else {"raw": line})
+        valid = [all(key in record for key in ("amount", "from", "to")) for record in records]
+        amounts = [_to_float(record.get("amount")) for record in records]
+        from_codes = [str(record.get("from", "")).upper() for record in records]
+        to_codes = [str(record.get("to", "")).upper() for record in records]
+
+    columns = bulk_convert.BulkColumns(array("d", amounts), from_codes, to_codes)
+    converted, rates, errors = bulk_convert.convert_columns(table, columns, table.index)
+    converted, rates, errors = converted.tolist(), rates.tolist(), errors.tolist()
+    for i, ok in enumerate(valid):
+        if not ok:
+            errors[i], rates[i], converted[i] = bulk_convert.INVALID_ROW, math.nan, math.nan
+
+    out = io.StringIO()
+    if fmt == CSV:
+        writer = csv.writer(out, lineterminator="\n")
+        for row, rate, amount, error in zip(records, rates, converted, errors):
+            padding = [""] * (columns_count - len(row))  # keep appended fields aligned on short rows
+            writer.writerow(row + padding + [_cell(rate), _cell(amount), error])
+    else:
+        for record, rate, amount, error in zip(records, rates, converted, errors):
+            record["exchange_rate"] = None if error else rate
+            record["converted_amount"] = None if error else amount
+            record["error"] = error
+            out.write(json.dumps(record, separators=(",", ":")))
+            out.write("\n")
+    return out.getvalue().encode("utf-8")
+
+
+def create_pool(workers: int) -> ProcessPoolExecutor:
+    """Worker processes for chunk parsing/formatting (spawned, not forked from the event loop)"""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+async def convert_stream_async(
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    snapshot: Snapshot,
+    executor: Optional[Executor],
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_in_flight: int = 4,
+) -> AsyncIterator[bytes]:
+    """Converted output, in input order, with at most max_in_flight chunks held in memory"""
+    loop = asyncio.get_running_loop()
+    chunker = LineChunker(chunk_bytes, keep_header=fmt == CSV)
+    pending = deque()
+    header_sent = False
+
+    async def drain(limit: int):
+        while len(pending) > limit:
+            yield await pending.popleft()
+
+    try:
+        async for data in chunks:
+            for block in chunker.feed(data):
+                if not header_sent and fmt == CSV:
+                    header_sent = True
+                    yield output_header(chunker.header)
+                pending.append(loop.run_in_executor(executor, convert_chunk, fmt, chunker.header, block, snapshot))
+                async for out in drain(max_in_flight - 1):
+                    yield out
+
+        for block in chunker.flush():
+            pending.append(loop.run_in_executor(executor, convert_chunk, fmt, chunker.header, block, snapshot))
+        if not header_sent and fmt == CSV and chunker.header:
+            yield output_header(chunker.header)
+        async for out in drain(0):
+            yield out
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def convert_stream(
+    chunks: Iterable[bytes],
+    fmt: str,
+    snapshot: Snapshot,
+    executor: Executor,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_in_flight: int = 4,
+) -> Iterator[bytes]:
+    """Blocking counterpart of convert_stream_async (used by the CLI)"""
+    chunker = LineChunker(chunk_bytes, keep_header=fmt == CSV)
+    pending = deque()
+    header_sent = False
+
+    for data in chunks:
+        for block in chunker.feed(data):
+            if not header_sent and fmt == CSV:
+                header_sent = True
+                csv_field_positions(chunker.header)
+                yield output_header(chunker.header)
+            pending.append(executor.submit(convert_chunk, fmt, chunker.header, block, snapshot))
+            while len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+
+    for block in chunker.flush():
+        pending.append(executor.submit(convert_chunk, fmt, chunker.header, block, snapshot))
+    if not header_sent and fmt == CSV and chunker.header:
+        csv_field_positions(chunker.header)
+        yield output_header(chunker.header)
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# main_optimized refuses to start without secrets; keep tests off the shared snapshot file
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-that-is-long-enough")
+os.environ.setdefault("EXCHANGE_API_KEY", "test-key")
+os.environ.setdefault("RATE_SNAPSHOT_PATH", "")
+os.environ.setdefault("KCONVERT_SERVERLESS", "1")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+@pytest.fixture
+def kconvert():
+    """main_optimized with empty caches and limiter state; set its http_client to stand in for upstream"""
+    import main_optimized
+
+    for state in (main_optimized.cache, main_optimized.last_known_good, main_optimized.unquoted_bases,
+                  main_optimized.limiter._tat):
+        state.clear()
+    main_optimized.upstream_breaker.record_success()
+    yield main_optimized
+    main_optimized.http_client = None
@@ -0,0 +1,67 @@
+import time
+
+import bounded_cache
+from bounded_cache import BoundedTTLCache, estimate_size
+
+
+def test_least_recently_used_entry_is_evicted_past_max_entries():
+    cache = BoundedTTLCache(max_entries=2, max_bytes=1 << 20, ttl=60)
+    now = time.time()
+    cache["USD"] = ("usd", now)
+    cache["EUR"] = ("eur", now)
+    cache["USD"]  # touch, so EUR is now the oldest
+    cache["GBP"] = ("gbp", now)
+
+    assert "USD" in cache and "GBP" in cache and "EUR" not in cache
+    assert cache.evictions == 1
+
+
+def test_byte_cap_evicts_and_rejects_oversized_values():
+    value = "x" * 100
+    size = estimate_size(value)
+    cache = BoundedTTLCache(max_entries=100, max_bytes=2 * size, ttl=60)
+    now = time.time()
+    cache["a"] = (value, now)
+    cache["b"] = ("y" * 100, now)
+    cache["c"] = ("z" * 100, now)
+
+    assert len(cache) == 2 and "a" not in cache
+    assert cache.resident_bytes <= cache.max_bytes
+
+    cache["huge"] = ("x" * 1000, now)
+    assert "huge" not in cache
+    assert cache.rejections == 1
+    assert len(cache) == 2
+
+
+def test_replacing_a_key_keeps_the_byte_count_exact():
+    cache = BoundedTTLCache(max_entries=10, max_bytes=1 << 20, ttl=60)
+    cache["USD"] = ("x" * 100, time.time())
+    cache["USD"] = ("x", time.time())
+    assert cache.resident_bytes == estimate_size("x")
+
+
+def test_expired_entries_are_dropped_on_read(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(bounded_cache.time, "time", lambda: clock[0])
+    cache = BoundedTTLCache(max_entries=10, max_bytes=1 << 20, ttl=30)
+    cache["USD"] = ("usd", clock[0])
+
+    clock[0] += 29
+    assert cache["USD"] == ("usd", 1000.0)
+    clock[0] += 1
+    assert "USD" not in cache
+    assert len(cache) == 0 and cache.resident_bytes == 0
+    assert cache.expirations == 1
+
+
+def test_purge_expired_drops_only_stale_entries(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(bounded_cache.time, "time", lambda: clock[0])
+    cache = BoundedTTLCache(max_entries=10, max_bytes=1 << 20, ttl=30)
+    cache["old"] = ("old", 960.0)
+    cache["fresh"] = ("fresh", 990.0)
+
+    assert cache.purge_expired() == 1
+    assert [key for key, _ in cache.items()] == ["fresh"]
+    assert cache.resident_bytes == estimate_size("fresh")
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+import httpx
+
+
+def post_bulk(kconvert, content, headers=None):
+    upstream = {"result": "success", "base_code": "USD", "time_last_update_unix": 1000,
+                "conversion_rates": {"USD": 1.0, "EUR": 0.9}}
+
+    async def scenario():
+        kconvert.http_client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json=upstream)
+        ))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=kconvert.app), base_url="http://test") as client:
+            return await client.post(
+                "/api/bulk-convert", params={"token": kconvert.create_jwt()}, content=content, headers=headers
+            )
+
+    return asyncio.run(scenario())
+
+
+def rows(count):
+    return json.dumps({"amount": [1.0] * count, "from": "USD", "to": "EUR"}).encode()
+
+
+def test_body_within_the_cap_is_converted(kconvert, monkeypatch):
+    monkeypatch.setattr(kconvert, "BULK_MAX_BYTES", len(rows(10)))
+    response = post_bulk(kconvert, rows(10))
+    assert response.status_code == 200
+    assert response.json()["rows"] == 10
+
+
+def test_declared_oversized_body_is_refused(kconvert, monkeypatch):
+    monkeypatch.setattr(kconvert, "BULK_MAX_BYTES", 100)
+    response = post_bulk(kconvert, rows(100))
+    assert response.status_code == 413
+
+
+def test_chunked_oversized_body_is_refused_while_reading(kconvert, monkeypatch):
+    monkeypatch.setattr(kconvert, "BULK_MAX_BYTES", 100)
+    sent = []
+
+    async def chunks():
+        for _ in range(1000):
+            sent.append(1)
+            yield b" " * 64
+
+    response = post_bulk(kconvert, chunks())
+    assert response.status_code == 413
+    assert len(sent) < 1000
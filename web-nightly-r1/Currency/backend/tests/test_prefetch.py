@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+from prefetch import PrefetchScheduler
+
+
+def test_failed_refresh_backs_off():
+    refreshed = []
+    upstream_up = [False]
+
+    async def refresh(key):
+        refreshed.append(key)
+        if not upstream_up[0]:
+            raise RuntimeError("upstream down")
+        return key
+
+    # Never cached, so always due
+    scheduler = PrefetchScheduler(refresh, lambda key: None, calls_per_hour=100, retry_backoff=0.05, max_backoff=0.2)
+    for _ in range(3):
+        scheduler.record("EUR")
+
+    async def scenario():
+        assert await scheduler.run_once() == 0
+        # Backing off: the next checks spend nothing
+        assert scheduler.due() == []
+        assert await scheduler.run_once() == 0
+        assert refreshed == ["EUR"]
+        assert scheduler.stats()["backing_off"] == ["EUR"]
+        await asyncio.sleep(0.06)
+        upstream_up[0] = True
+        assert await scheduler.run_once() == 1
+        # A success clears the backoff
+        assert scheduler.due() == ["EUR"]
+
+    asyncio.run(scenario())
+    assert scheduler.failed == 1 and scheduler.prefetched == 1
+    assert scheduler.budget.remaining() == 98
+
+
+def test_backoff_doubles_up_to_the_cap():
+    async def refresh(key):
+        raise RuntimeError("upstream down")
+
+    scheduler = PrefetchScheduler(refresh, lambda key: None, calls_per_hour=100, retry_backoff=10.0, max_backoff=25.0)
+    for _ in range(3):
+        scheduler.record("EUR")
+
+    async def scenario():
+        delays = []
+        for _ in range(3):
+            if "EUR" in scheduler._failures:
+                failures, _ = scheduler._failures["EUR"]
+                scheduler._failures["EUR"] = (failures, 0.0)  # skip the wait
+            started = time.time()
+            await scheduler.run_once()
+            delays.append(round(scheduler._failures["EUR"][1] - started))
+        return delays
+
+    assert asyncio.run(scenario()) == [10, 20, 25]
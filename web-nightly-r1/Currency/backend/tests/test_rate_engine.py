@@ -0,0 +1,44 @@
+import asyncio
+
+import httpx
+
+from rate_engine import RateTable
+
+
+def payload(rates, updated_unix=0):
+    return {"result": "success", "base_code": "USD", "time_last_update_unix": updated_unix, "conversion_rates": rates}
+
+
+def test_version_is_the_upstream_update_time_when_present():
+    assert RateTable.from_payload(payload({"USD": 1.0, "EUR": 0.9}, 1000)).version == "1000"
+
+
+def test_version_falls_back_to_a_digest_of_the_sorted_rates():
+    table = RateTable.from_payload(payload({"USD": 1.0, "EUR": 0.9}))
+    reordered = RateTable.from_payload(payload({"EUR": 0.9, "USD": 1.0}))
+    moved = RateTable.from_payload(payload({"USD": 1.0, "EUR": 0.91}))
+
+    assert table.version == reordered.version
+    assert table.version != moved.version
+
+
+def test_tables_without_update_time_still_refresh_and_change_etag(kconvert):
+    published = [{"USD": 1.0, "EUR": 0.9}]
+
+    def upstream(request):
+        return httpx.Response(200, json=payload(published[0]))
+
+    async def scenario():
+        kconvert.http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        token = kconvert.create_jwt()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=kconvert.app), base_url="http://test") as client:
+            before = await client.get("/api/rates/USD", params={"token": token, "targets": "EUR"})
+            published[0] = {"USD": 1.0, "EUR": 0.8}
+            await kconvert.refresh_rate_table("USD")
+            after = await client.get("/api/rates/USD", params={"token": token, "targets": "EUR"})
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    assert before.json()["conversion_rates"]["EUR"] == 0.9
+    assert after.json()["conversion_rates"]["EUR"] == 0.8
+    assert before.headers["etag"] != after.headers["etag"]
@@ -0,0 +1,40 @@
+import asyncio
+
+from rate_engine import RateTable
+from rate_hub import RateHub
+
+
+def table(pivot, rates, updated_unix):
+    return RateTable(pivot, list(rates), rates.values(), updated_unix)
+
+
+def pending(subscriber):
+    return list(subscriber.frames)
+
+
+def test_topic_ignores_tables_it_is_not_served_from():
+    async def scenario():
+        hub = RateHub()
+        subscriber = hub.subscribe("EUR", ("GBP",), table("USD", {"USD": 1.0, "EUR": 0.5, "GBP": 0.4}, 1000))
+        # A direct EUR table (fetched for a code the pivot lacks) disagrees slightly
+        hub.publish(table("EUR", {"EUR": 1.0, "GBP": 0.81, "SDP": 600.0}, 1001))
+        assert pending(subscriber) == []
+        hub.publish(table("USD", {"USD": 1.0, "EUR": 0.5, "GBP": 0.45}, 1002))
+        return pending(subscriber), subscriber.topic.rates
+
+    frames, rates = asyncio.run(scenario())
+    assert len(frames) == 1 and b'"GBP":0.9' in frames[0]
+    assert rates == {"GBP": 0.9}
+
+
+def test_topic_served_from_its_own_table_ignores_the_pivot():
+    async def scenario():
+        hub = RateHub()
+        subscriber = hub.subscribe("EUR", ("GBP",), table("EUR", {"EUR": 1.0, "GBP": 0.8}, 1000))
+        hub.publish(table("USD", {"USD": 1.0, "EUR": 0.5, "GBP": 0.45}, 1001))
+        assert pending(subscriber) == []
+        hub.publish(table("EUR", {"EUR": 1.0, "GBP": 0.85}, 1002))
+        return pending(subscriber)
+
+    frames = asyncio.run(scenario())
+    assert len(frames) == 1 and b'"GBP":0.85' in frames[0]
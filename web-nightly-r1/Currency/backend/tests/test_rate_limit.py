@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import fakeredis
+import pytest
+from redis.exceptions import RedisError
+
+import rate_limit
+from rate_limit import GCRA_SCRIPT, RateLimiter
+
+
+def with_redis(server):
+    """Limiter whose GCRA script runs on an in-process Redis"""
+    limiter = RateLimiter()
+    limiter._script = fakeredis.FakeAsyncRedis(server=server).register_script(GCRA_SCRIPT)
+    limiter._backend_errors = (RedisError, OSError)
+    return limiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_is_admitted_then_rejected(clock):
+    limiter = RateLimiter()
+
+    async def scenario():
+        return [await limiter.hit("client", per_minute=3) for _ in range(4)]
+
+    assert asyncio.run(scenario()) == [0.0, 0.0, 0.0, 20.0]
+    assert (limiter.allowed, limiter.rejected) == (3, 1)
+
+
+def test_one_request_refills_per_emission_interval(clock):
+    limiter = RateLimiter()
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.hit("client", per_minute=3)
+        clock[0] += 20
+        admitted = await limiter.hit("client", per_minute=3)
+        rejected = await limiter.hit("client", per_minute=3)
+        clock[0] += 60
+        return admitted, rejected, [await limiter.hit("client", per_minute=3) for _ in range(3)]
+
+    admitted, rejected, refilled = asyncio.run(scenario())
+    assert admitted == 0.0 and rejected == 20.0
+    assert refilled == [0.0, 0.0, 0.0]
+
+
+def test_clients_have_separate_quotas(clock):
+    limiter = RateLimiter()
+
+    async def scenario():
+        await limiter.hit("a", per_minute=1)
+        return await limiter.hit("a", per_minute=1), await limiter.hit("b", per_minute=1)
+
+    assert asyncio.run(scenario()) == (60.0, 0.0)
+
+
+def test_least_recently_seen_client_is_evicted_past_max_keys(clock):
+    limiter = RateLimiter(max_keys=2)
+
+    async def scenario():
+        for key in ("a", "b", "a", "c"):
+            await limiter.hit(key, per_minute=60)
+
+    asyncio.run(scenario())
+    assert list(limiter._tat) == ["a", "c"]
+    assert limiter.evicted == 1
+
+
+def test_compact_drops_fully_refilled_clients(clock):
+    limiter = RateLimiter()
+
+    async def scenario():
+        await limiter.hit("idle", per_minute=60)
+        clock[0] += 2
+        await limiter.hit("busy", per_minute=60)
+
+    asyncio.run(scenario())
+    assert limiter.compact() == 1
+    assert list(limiter._tat) == ["busy"]
+
+
+def test_redis_script_shares_the_quota_between_workers():
+    server = fakeredis.FakeServer()
+    first, second = with_redis(server), with_redis(server)
+
+    async def scenario():
+        admitted = [await worker.hit("client", per_minute=3) for worker in (first, second, first)]
+        return admitted, await second.hit("client", per_minute=3)
+
+    admitted, retry_after = asyncio.run(scenario())
+    assert admitted == [0.0, 0.0, 0.0]
+    assert 19 < retry_after <= 20
+    assert first.backend == "redis" and not first._tat and not second._tat
+
+
+def test_redis_script_refills_on_the_redis_clock(monkeypatch):
+    # The script reads TIME from Redis; fakeredis serves it from time.time()
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    limiter = with_redis(fakeredis.FakeServer())
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.hit("client", per_minute=3)
+        rejected = await limiter.hit("client", per_minute=3)
+        now[0] += 20
+        return rejected, await limiter.hit("client", per_minute=3), await limiter.hit("client", per_minute=3)
+
+    assert asyncio.run(scenario()) == (20.0, 0.0, 20.0)
+
+
+def test_redis_failure_falls_back_to_in_process_limits(clock):
+    server = fakeredis.FakeServer()
+    server.connected = False
+    limiter = with_redis(server)
+
+    async def scenario():
+        return [await limiter.hit("client", per_minute=1) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [0.0, 60.0]
+    assert limiter.backend_errors == 1
+    assert limiter.stats()["redis_healthy"] is False
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+import httpx
+
+from rate_snapshot import load_tables
+
+
+def test_refreshes_are_saved_together_off_the_event_loop(kconvert, monkeypatch, tmp_path):
+    path = str(tmp_path / "rates.snapshot")
+    monkeypatch.setattr(kconvert, "RATE_SNAPSHOT_PATH", path)
+    monkeypatch.setattr(kconvert, "RATE_SNAPSHOT_SAVE_DELAY", 0.05)
+    writers = []
+    save_tables = kconvert.save_tables
+
+    def recording_save(*args):
+        writers.append(threading.get_ident())
+        return save_tables(*args)
+
+    monkeypatch.setattr(kconvert, "save_tables", recording_save)
+
+    def upstream(request):
+        base = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json={"result": "success", "base_code": base, "time_last_update_unix": 1000,
+                                         "conversion_rates": {base: 1.0, "XAU": 0.5}})
+
+    async def scenario():
+        kconvert.http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        for base in ("USD", "EUR", "GBP"):
+            await kconvert.refresh_rate_table(base)
+        assert writers == []  # nothing written on the request path
+        await kconvert.snapshot_save_task
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert len(writers) == 1 and writers[0] != loop_thread
+    assert sorted(table.pivot for table in load_tables(path)) == ["EUR", "GBP", "USD"]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"USD": 1.0}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("USD", fetch) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"in_flight": 0, "upstream_calls": 1, "upstream_calls_saved": 4, "errors": 0}
+
+
+def test_error_reaches_every_caller_of_that_key_only():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def working():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def scenario():
+        return await asyncio.gather(
+            flight.do("USD", failing), flight.do("USD", failing), flight.do("EUR", working),
+            return_exceptions=True,
+        )
+
+    first, second, other = asyncio.run(scenario())
+    assert isinstance(first, RuntimeError) and second is first
+    assert other == "ok"
+    assert flight.errors == 1
+
+
+def test_key_is_released_so_the_next_miss_retries():
+    flight = SingleFlight()
+    attempts = []
+
+    async def fetch():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await flight.do("USD", fetch)
+        assert "USD" not in flight
+        return await flight.do("USD", fetch)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert len(attempts) == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def scenario():
+        impatient = asyncio.ensure_future(flight.do("USD", fetch))
+        patient = asyncio.ensure_future(flight.do("USD", fetch))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        return await patient, impatient.cancelled()
+
+    assert asyncio.run(scenario()) == ("ok", True)
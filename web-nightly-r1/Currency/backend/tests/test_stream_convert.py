@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+
+
+def test_multi_chunk_upload_is_converted_in_full(kconvert):
+    upstream = {"result": "success", "base_code": "USD", "time_last_update_unix": 1000,
+                "conversion_rates": {"USD": 1.0, "EUR": 0.5}}
+
+    async def upload():
+        yield b"amount,from,to\n"
+        for _ in range(50):
+            await asyncio.sleep(0)
+            yield b"2,USD,EUR\n"
+
+    async def scenario():
+        kconvert.http_client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json=upstream)
+        ))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=kconvert.app), base_url="http://test") as client:
+            return await client.post(
+                "/api/stream-convert", params={"token": kconvert.create_jwt()}, content=upload(),
+                headers={"content-type": "text/csv"}
+            )
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    lines = response.text.strip().splitlines()
+    assert len(lines) == 51
+    assert all(",1.0," in line for line in lines[1:])
+
+
+def test_upload_response_stops_on_disconnect_and_runs_its_background_task(kconvert):
+    # ASGI 2.0 scope: Starlette listens for the disconnect itself
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": [], "query_string": b""}
+    messages = [
+        {"type": "http.request", "body": b"a", "more_body": True},
+        {"type": "http.request", "body": b"b", "more_body": False},
+    ]
+    uploaded, sent, background = [], [], []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    async def scenario():
+        upload_done = asyncio.Event()
+
+        async def body():
+            async for chunk in kconvert.read_upload(Request(scope, receive), upload_done):
+                uploaded.append(chunk)
+                yield chunk.upper()
+            await asyncio.sleep(10)  # still converting when the client goes away
+            yield b"never sent"
+
+        response = kconvert.UploadStreamingResponse(
+            body(), upload_done, background=BackgroundTask(background.append, "done")
+        )
+        await asyncio.wait_for(response(scope, receive, send), timeout=1)
+
+    asyncio.run(scenario())
+    assert b"".join(uploaded) == b"ab"
+    assert b"".join(m["body"] for m in sent if m["type"] == "http.response.body") == b"AB"
+    assert background == ["done"]
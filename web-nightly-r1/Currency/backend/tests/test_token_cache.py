@@ -0,0 +1,66 @@
+import pytest
+from fastapi import HTTPException
+
+import token_cache
+from token_cache import VerifiedTokenCache
+
+
+def test_verified_token_is_served_until_its_exp(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(token_cache.time, "time", lambda: clock[0])
+    cache = VerifiedTokenCache()
+    digest = cache.digest("token")
+    cache.add(digest, 1060.0)
+
+    assert cache.get(digest) == 1060.0
+    clock[0] = 1061.0
+    assert cache.get(digest) is None
+    assert cache.stats() == {"entries": 0, "max_entries": 4096, "hits": 1, "misses": 1}
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = VerifiedTokenCache(max_entries=2)
+    first, second, third = (cache.digest(t) for t in ("a", "b", "c"))
+    cache.add(first, 2e9)
+    cache.add(second, 2e9)
+    cache.get(first)
+    cache.add(third, 2e9)
+
+    assert cache.get(second) is None
+    assert cache.get(first) == 2e9 and cache.get(third) == 2e9
+
+
+def test_raw_tokens_are_never_stored():
+    cache = VerifiedTokenCache()
+    cache.add(cache.digest("secret-token"), 2e9)
+    assert all(len(key) == 32 and b"secret-token" not in key for key in cache._entries)
+
+
+def test_expired_cached_token_gets_the_exact_error(monkeypatch):
+    import main_optimized
+
+    main_optimized.token_cache.clear()
+    token = main_optimized.create_jwt()
+    exp = main_optimized.verify_jwt(token)
+    assert main_optimized.token_cache.get(main_optimized.token_cache.digest(token)) == exp
+
+    monkeypatch.setattr(token_cache.time, "time", lambda: exp + 1)
+    monkeypatch.setattr(main_optimized.time, "time", lambda: exp + 1)
+    with pytest.raises(HTTPException) as raised:
+        main_optimized.verify_jwt(token)
+    assert (raised.value.status_code, raised.value.detail) == (401, "Token expired")
+
+
+def test_clearing_the_cache_revokes_tokens_after_a_secret_rotation(monkeypatch):
+    import main_optimized
+
+    main_optimized.token_cache.clear()
+    token = main_optimized.create_jwt()
+    main_optimized.verify_jwt(token)
+
+    monkeypatch.setattr(main_optimized, "SECRET_KEY", "rotated-secret-key-that-is-long-enough")
+    assert main_optimized.verify_jwt(token)  # still trusted from the cache
+    main_optimized.token_cache.clear()
+    with pytest.raises(HTTPException) as raised:
+        main_optimized.verify_jwt(token)
+    assert raised.value.status_code == 403
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Kconvert - Verified Token Cache
+Skips repeated JWT decode/HMAC work for tokens that already passed verification
+
+Copyright (c) 2025 Team 6
+All rights reserved.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of token digest -> exp for tokens that passed full verification"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """Fixed-size key so raw tokens are never kept in memory"""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, digest: bytes) -> Optional[float]:
+        """Cached exp for a verified token, or None if unknown or expired"""
+        exp = self._entries.get(digest)
+        if exp is None:
+            self.misses += 1
+            return None
+        if exp < time.time():
+            # Expired tokens fall through to a full verify so errors stay exact
+            del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return exp
+
+    def add(self, digest: bytes, exp: float) -> None:
+        """Remember a verified token until its exp"""
+        self._entries[digest] = exp
+        self._entries.move_to_end(digest)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the stats endpoint"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,473 @@
+"""
+Load test for both currency backends against a local stand-in for exchangerate-api.
+
+Usage: python benchmarks/load_test.py [--target all|kconvert|mobile] [--concurrency N]
+           [--duration S] [--warmup S] [--mix rates=50,convert=35,batch=15]
+           [--upstream-latency-ms MS] [--upstream-jitter-ms MS] [--upstream-error-rate P]
+           [--upstream-slow-rate P] [--upstream-slow-ms MS] [--cache-ttl S]
+           [--workers N] [--env KEY=VALUE ...] [--output FILE] [--compare FILE]
+
+Each target app (Kconvert `main_optimized:app`, mobile `app.main:app`) is started
+with uvicorn in its own process, pointed at a fresh stand-in upstream that adds
+the configured latency and fails the configured share of calls with HTTP 500.
+A fixed number of clients then send a weighted mix of rates / convert / batch
+requests for --duration seconds (after --warmup seconds that are not recorded).
+
+Throughput and p50/p95/p99 latency per endpoint are printed and written as JSON
+(with the git commit) to --output, default benchmarks/results/<commit>-<time>.json.
+Pass an earlier file as --compare to print the change against it.
+
+The mobile API has no batch endpoint; its clients convert to many targets by
+fetching GET /rates/{base}, so that is what its "batch" share requests.
+Keep --cache-ttl short to make cache misses (and so upstream latency and
+errors) part of the mix; the apps' defaults are minutes.
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "kconvert": {"app": "main_optimized:app", "cwd": os.path.join(ROOT, "Currency", "backend")},
+    "mobile": {"app": "app.main:app", "cwd": os.path.join(ROOT, "currency-mobile-app", "backend")},
+}
+
+# Every code either backend accepts, so the stand-in can answer any base
+UPSTREAM_CODES = (
+    "AED AFN ALL AMD ANG AOA AQD ARS AUD AWG AZN BAM BBD BDT BGN BHD BIF BMD BND BOB BRL BSD BTN BWP "
+    "BYN BYR BZD CAD CDF CHF CLP CNY COP CRC CUP CVE CYP CZK DJF DKK DOP DZD ECS EEK EGP ERN ETB EUR "
+    "FJD FKP GBP GEL GGP GHS GIP GMD GNF GTQ GYD HKD HNL HRK HTG HUF IDR ILS INR IQD IRR ISK JMD JOD "
+    "JPY KES KGS KHR KMF KPW KRW KWD KYD KZT LAK LBP LKR LRD LSL LTL LVL LYD MAD MDL MGA MKD MMK MNT "
+    "MOP MRO MTL MUR MVR MWK MXN MYR MZN NAD NGN NIO NOK NPR NZD OMR PAB PEN PGK PHP PKR PLN PYG QAR "
+    "RON RSD RUB RWF SAR SBD SCR SDG SDP SEK SGD SKK SLL SOS SRD SSP STD SVC SYP SZL THB TJS TMT TND "
+    "TOP TRY TTD TWD TZS UAH UGX USD UYU UZS VEF VND VUV WST XAF XCD XOF XPF YER ZAR ZMK ZMW ZWD ZWL"
+).split()
+
+# Currencies requests are drawn from, most popular first (picked with 1/rank weights)
+POPULAR = ["USD", "EUR", "GBP", "JPY", "IDR", "CNY", "AUD", "CAD", "SGD", "INR", "CHF", "KRW", "MYR", "THB", "HKD", "PHP"]
+POPULAR_WEIGHTS = [1 / (rank + 1) for rank in range(len(POPULAR))]
+
+DEFAULT_MIX = "rates=50,convert=35,batch=15"
+
+
+# --- Stand-in upstream -------------------------------------------------------
+
+def serve_upstream(ready, options: Dict):
+    """Run the fake exchangerate-api until the process is terminated (child process entry point)"""
+    rng = random.Random(options["seed"])
+    usd_rates = {code: 1.0 if code == "USD" else round(0.05 + rng.random() * 200, 6) for code in UPSTREAM_CODES}
+    stats = Counter()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if self.path == "/_stats":
+                with lock:
+                    self._send(200, dict(stats))
+                return
+
+            base = self.path.rsplit("/", 1)[-1].upper()
+            with lock:
+                roll = rng.random()
+                delay = options["latency_ms"] + rng.uniform(-1, 1) * options["jitter_ms"]
+                if rng.random() < options["slow_rate"]:
+                    delay = options["slow_ms"]
+                    stats["slow"] += 1
+                stats["requests"] += 1
+            time.sleep(max(delay, 0) / 1000)
+
+            if roll < options["error_rate"]:
+                with lock:
+                    stats["errors_injected"] += 1
+                self._send(500, {"result": "error", "error-type": "injected"})
+                return
+            if base not in usd_rates:
+                self._send(200, {"result": "error", "error-type": "unsupported-code"})
+                return
+
+            now = int(time.time())
+            pivot = usd_rates[base]
+            self._send(200, {
+                "result": "success",
+                "base_code": base,
+                "time_last_update_unix": now,
+                "time_next_update_unix": now + 86400,
+                "conversion_rates": {code: rate / pivot for code, rate in usd_rates.items()},
+            })
+
+        def _send(self, status: int, payload: Dict):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_upstream(args) -> Tuple[multiprocessing.Process, str]:
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve_upstream, args=(ready, {
+        "seed": args.seed,
+        "latency_ms": args.upstream_latency_ms,
+        "jitter_ms": args.upstream_jitter_ms,
+        "error_rate": args.upstream_error_rate,
+        "slow_rate": args.upstream_slow_rate,
+        "slow_ms": args.upstream_slow_ms,
+    }), daemon=True)
+    process.start()
+    port = ready.get(timeout=10)
+    return process, f"http://127.0.0.1:{port}"
+
+
+# --- Target apps -------------------------------------------------------------
+
+def app_env(name: str, upstream_url: str, args, workdir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.pop("PYTHONPATH", None)
+    env["EXCHANGE_API_URL"] = f"{upstream_url}/v6"
+    env["EXCHANGE_API_KEY"] = "loadtest"
+    if name == "kconvert":
+        env.update({
+            "JWT_SECRET_KEY": "loadtest-secret-key-with-enough-entropy",
+            "RATE_LIMIT_PER_MINUTE": "1000000000",  # every request comes from one IP
+            "AUTH_RATE_LIMIT_PER_MINUTE": "1000000000",
+            "TOKEN_EXP_MINUTES": "120",
+            "CACHE_TTL_EXCHANGE_RATES": str(args.cache_ttl),
+            "RATE_SNAPSHOT_PATH": "",  # start cold on every run
+        })
+        if args.workers > 1:
+            env.setdefault("SHARED_RATES_PATH", os.path.join(workdir, "shared-rates"))
+    else:
+        env.update({
+            "FIXER_API_KEY": "",
+            "L1_CACHE_TTL": str(args.cache_ttl),
+            "SNAPSHOT_PATH": "",
+            "HISTORY_DIR": os.path.join(workdir, "history"),
+            "DEBUG": "false",
+        })
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def start_app(name: str, port: int, env: Dict[str, str], workers: int, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "wb")
+    command = [
+        sys.executable, "-m", "uvicorn", TARGETS[name]["app"],
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ]
+    return subprocess.Popen(command, cwd=TARGETS[name]["cwd"], env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_ready(process: subprocess.Popen, base_url: str, log_path: str, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    with open(log_path, "rb") as log:
+        tail = log.read()[-2000:].decode(errors="replace")
+    raise RuntimeError(f"{base_url} did not become ready:\n{tail}")
+
+
+def stop_app(process: subprocess.Popen):
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# --- Request mixes -----------------------------------------------------------
+
+Request = Tuple[str, str, Dict]  # method, path, httpx request kwargs
+
+
+def kconvert_scenarios(token: str) -> Dict[str, Callable[[random.Random], Request]]:
+    def rates(rng):
+        base = pick(rng)
+        targets = ",".join(pick_many(rng, rng.randint(3, 8), exclude=base))
+        return "GET", f"/api/rates/{base}", {"params": {"token": token, "targets": targets}}
+
+    def convert(rng):
+        source, target = pick_many(rng, 2)
+        return "GET", "/api/convert", {"params": {"token": token, "amount": amount(rng), "from": source, "to": target}}
+
+    def batch(rng):
+        source = pick(rng)
+        targets = ",".join(pick_many(rng, rng.randint(5, 12), exclude=source))
+        return "GET", "/api/batch-convert", {"params": {"token": token, "amount": amount(rng), "from": source, "to": targets}}
+
+    return {"rates": rates, "convert": convert, "batch": batch}
+
+
+def mobile_scenarios() -> Dict[str, Callable[[random.Random], Request]]:
+    def rates(rng):
+        return "GET", f"/api/v1/rates/{pick(rng)}", {}
+
+    def convert(rng):
+        source, target = pick_many(rng, 2)
+        body = {"from_currency": source, "to_currency": target, "amount": amount(rng)}
+        return "POST", "/api/v1/convert", {"json": body}
+
+    return {"rates": rates, "convert": convert, "batch": rates}
+
+
+def pick(rng: random.Random) -> str:
+    return rng.choices(POPULAR, POPULAR_WEIGHTS)[0]
+
+
+def pick_many(rng: random.Random, count: int, exclude: Optional[str] = None) -> List[str]:
+    picked = []
+    while len(picked) < count:
+        code = pick(rng)
+        if code != exclude and code not in picked:
+            picked.append(code)
+    return picked
+
+
+def amount(rng: random.Random) -> float:
+    return round(10 ** rng.uniform(0, 5), 2)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ("rates", "convert", "batch"):
+            raise argparse.ArgumentTypeError(f"unknown endpoint in mix: {name}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+# --- Load generator ----------------------------------------------------------
+
+async def run_load(base_url: str, scenarios: Dict, mix: Dict[str, float], args) -> Dict:
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    start = time.perf_counter()
+    record_from = start + args.warmup
+    stop_at = record_from + args.duration
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        async def worker(seed: int):
+            rng = random.Random(seed)
+            while True:
+                name = rng.choices(names, weights)[0]
+                method, path, kwargs = scenarios[name](rng)
+                sent = time.perf_counter()
+                if sent >= stop_at:
+                    return
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    await response.aread()
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                if sent >= record_from:
+                    latencies[name].append(time.perf_counter() - sent)
+                    statuses[name][status] += 1
+
+        await asyncio.gather(*(worker(args.seed + i) for i in range(args.concurrency)))
+
+    elapsed = time.perf_counter() - record_from
+    endpoints = {name: summarize(latencies[name], statuses[name], elapsed) for name in names}
+    total = summarize(
+        [value for name in names for value in latencies[name]],
+        sum((statuses[name] for name in names), Counter()),
+        elapsed,
+    )
+    return {"total": total, "endpoints": endpoints}
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> Dict:
+    count = len(latencies)
+    errors = sum(n for status, n in statuses.items() if not status.isdigit() or int(status) >= 400)
+    summary = {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+    }
+    if count:
+        ordered = sorted(latencies)
+        summary.update({
+            "mean_ms": round(sum(ordered) / count * 1000, 3),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        })
+    return summary
+
+
+# --- Running a target --------------------------------------------------------
+
+def run_target(name: str, args, mix: Dict[str, float]) -> Dict:
+    workdir = tempfile.mkdtemp(prefix=f"loadtest-{name}-")
+    log_path = os.path.join(workdir, "server.log")
+    upstream, upstream_url = start_upstream(args)
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    app = start_app(name, port, app_env(name, upstream_url, args, workdir), args.workers, log_path)
+    try:
+        wait_ready(app, base_url, log_path)
+        if name == "kconvert":
+            token = httpx.get(f"{base_url}/api/auth", timeout=10).json()["token"]
+            scenarios = kconvert_scenarios(token)
+        else:
+            scenarios = mobile_scenarios()
+        result = asyncio.run(run_load(base_url, scenarios, mix, args))
+        result["upstream"] = httpx.get(f"{upstream_url}/_stats", timeout=5).json()
+    finally:
+        stop_app(app)
+        upstream.terminate()
+        upstream.join(5)
+    result["app"] = TARGETS[name]["app"]
+    result["server_log"] = log_path
+    return result
+
+
+def git_commit() -> Dict:
+    def git(*command):
+        return subprocess.run(["git", *command], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    return {"sha": git("rev-parse", "HEAD") or None, "dirty": bool(git("status", "--porcelain", "--", "."))}
+
+
+def print_result(name: str, result: Dict, duration: float):
+    total = result["total"]
+    print(f"\n{name} ({result['app']}) - {total['requests']} requests in {duration:.0f} s, "
+          f"{total['throughput_rps']} req/s, {total['error_rate']:.2%} errors, "
+          f"{result['upstream'].get('requests', 0)} upstream calls")
+    print(f"  {'endpoint':<10}{'count':>8}{'req/s':>9}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for endpoint, summary in list(result["endpoints"].items()) + [("total", total)]:
+        if not summary["requests"]:
+            continue
+        print(f"  {endpoint:<10}{summary['requests']:>8}{summary['throughput_rps']:>9}{summary['error_rate']:>8.2%}"
+              f"{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}{summary['p99_ms']:>10.2f}")
+
+
+def print_comparison(current: Dict, previous: Dict):
+    sha = (previous.get("commit") or {}).get("sha") or "?"
+    print(f"\nChange vs {sha[:10]} (negative latency / positive throughput is better)")
+    for name, result in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if not before:
+            continue
+        for endpoint, summary in list(result["endpoints"].items()) + [("total", result["total"])]:
+            old = before["total"] if endpoint == "total" else before["endpoints"].get(endpoint)
+            if not old or not old.get("requests") or not summary["requests"]:
+                continue
+            deltas = "  ".join(
+                f"{key.replace('_ms', '').replace('_rps', '')} {delta(summary[key], old[key])}"
+                for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+            )
+            print(f"  {name:<9}{endpoint:<10}{deltas}")
+
+
+def delta(new: float, old: float) -> str:
+    return f"{(new - old) / old:+7.1%}" if old else "    n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", choices=["all", *TARGETS], default="all")
+    parser.add_argument("--concurrency", type=int, default=32, help="clients with one request in flight each")
+    parser.add_argument("--duration", type=float, default=30.0, help="recorded seconds per target")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unrecorded seconds before the measurement")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"endpoint weights (default {DEFAULT_MIX})")
+    parser.add_argument("--upstream-latency-ms", type=float, default=50.0)
+    parser.add_argument("--upstream-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0, help="share of upstream calls answered with HTTP 500")
+    parser.add_argument("--upstream-slow-rate", type=float, default=0.0, help="share of upstream calls delayed by --upstream-slow-ms")
+    parser.add_argument("--upstream-slow-ms", type=float, default=2000.0)
+    parser.add_argument("--cache-ttl", type=int, default=10, help="rate cache TTL in seconds for both apps")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers per app")
+    parser.add_argument("--timeout", type=float, default=30.0, help="client timeout per request")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra environment for both apps")
+    parser.add_argument("--output", help="result file (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": {},
+    }
+    for name in (TARGETS if args.target == "all" else [args.target]):
+        print(f"Running {name} for {args.warmup:.0f}+{args.duration:.0f} s at concurrency {args.concurrency}...")
+        report["results"][name] = run_target(name, args, args.mix)
+        print_result(name, report["results"][name], args.duration)
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results",
+        f"{(commit['sha'] or 'nocommit')[:10]}{'-dirty' if commit['dirty'] else ''}-{time.strftime('%Y%m%d-%H%M%S')}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
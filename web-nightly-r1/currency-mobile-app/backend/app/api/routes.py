@@ -1,14 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from typing import Dict
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from app.models.currency import (
     ConversionRequest, 
     ConversionResponse, 
     ExchangeRatesResponse,
     CurrencyListResponse,
+    HistoricalRateRequest,
+    HistoricalRateResponse,
+    HistoricalSeriesResponse,
     APIError
 )
 from app.services.currency_service import CurrencyService
+from app.utils.fast_json import FastJSONResponse
+from app.utils.http_cache import make_etag, conditional_headers, is_not_modified
 
 currency_router = APIRouter()
 
@@ -16,11 +23,11 @@ currency_router = APIRouter()
 async def get_currencies():
     """Get all supported currencies with country codes"""
     currencies = CurrencyService.get_supported_currencies()
-    return CurrencyListResponse(
-        currencies=currencies,
-        count=len(currencies),
-        timestamp=datetime.now()
-    )
+    return FastJSONResponse({
+        "currencies": currencies,
+        "count": len(currencies),
+        "timestamp": datetime.now()
+    })
 
 @currency_router.post("/convert", response_model=ConversionResponse)
 async def convert_currency(request: ConversionRequest):
@@ -51,11 +58,11 @@ async def convert_currency(request: ConversionRequest):
             detail="Currency conversion service temporarily unavailable"
         )
     
-    return result
+    return FastJSONResponse(result)
 
 @currency_router.get("/rates/{base_currency}", response_model=ExchangeRatesResponse)
-async def get_exchange_rates(base_currency: str):
-    """Get all exchange rates for a base currency"""
+async def get_exchange_rates(base_currency: str, request: Request):
+    """Get all exchange rates for a base currency (supports conditional GET)"""
     base_currency = base_currency.upper()
     
     if not CurrencyService.is_valid_currency(base_currency):
@@ -64,19 +71,72 @@ async def get_exchange_rates(base_currency: str):
             detail=f"Invalid base currency: {base_currency}"
         )
     
-    rates = await CurrencyService.get_exchange_rates(base_currency)
+    snapshot = await CurrencyService.get_exchange_snapshot(base_currency)
     
-    if not rates:
+    if not snapshot:
+        if not CurrencyService.is_quoted(base_currency):
+            raise HTTPException(
+                status_code=404,
+                detail=f"No exchange rates available for {base_currency}"
+            )
         raise HTTPException(
             status_code=503,
             detail="Exchange rate service temporarily unavailable"
         )
     
-    return ExchangeRatesResponse(
-        base_currency=base_currency,
-        rates=rates,
-        timestamp=datetime.now(),
-        source="exchangerate-api"
+    # Rates only change when the provider publishes, so version by provider and update time
+    # (by the rates themselves when the provider sent no timestamp)
+    version = snapshot["updated_unix"] or sorted(snapshot["rates"].items())
+    etag = make_etag(base_currency, snapshot.get("provider", ""), version)
+    headers = conditional_headers(etag, snapshot["updated_unix"])
+    if is_not_modified(request, etag, snapshot["updated_unix"]):
+        return Response(status_code=304, headers=headers)
+    
+    # Rates are already floats from the provider - render them without re-validating 160+ entries
+    return FastJSONResponse({
+        "base_currency": base_currency,
+        "rates": snapshot["rates"],
+        "timestamp": datetime.now(),
+        "source": snapshot.get("provider", "exchangerate-api"),
+        "stale": snapshot.get("stale", False)
+    }, headers=headers)
+
+SSE_HEARTBEAT_SECONDS = 15
+
+async def _rate_events(subscriber):
+    try:
+        yield f"retry: 5000\ndata: {subscriber.topic.snapshot_frame()}\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(subscriber.next_frame(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield f"data: {frame}\n\n"
+    finally:
+        CurrencyService.unsubscribe_rates(subscriber)
+
+@currency_router.get("/rates/{base_currency}/stream")
+async def stream_exchange_rates(base_currency: str, targets: str = Query("")):
+    """Server-Sent Events feed for a base: all rates first, then only the rates that change"""
+    base_currency = base_currency.upper()
+    target_list = [t.strip().upper() for t in targets.split(",") if t.strip()]
+    
+    invalid = [c for c in [base_currency] + target_list if not CurrencyService.is_valid_currency(c)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid currency: {', '.join(invalid)}")
+    
+    subscriber = await CurrencyService.subscribe_rates(base_currency, target_list)
+    if not subscriber:
+        raise HTTPException(
+            status_code=503,
+            detail="Exchange rate service temporarily unavailable"
+        )
+    
+    return StreamingResponse(
+        _rate_events(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @currency_router.get("/rate/{from_currency}/{to_currency}")
@@ -99,9 +159,75 @@ async def get_single_rate(from_currency: str, to_currency: str):
             detail="Exchange rate not available"
         )
     
-    return {
+    return FastJSONResponse({
         "from_currency": from_currency,
         "to_currency": to_currency,
         "exchange_rate": rates[to_currency],
         "timestamp": datetime.now()
-    }
+    })
+
+
+def _day_bounds(value: str):
+    """Unix start and end (inclusive) of a YYYY-MM-DD day in UTC"""
+    try:
+        day = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date (expected YYYY-MM-DD): {value}")
+    start = int(day.timestamp())
+    return start, int((day + timedelta(days=1)).timestamp()) - 1
+
+def _validate_pair(base_currency: str, target_currency: str):
+    for code in (base_currency, target_currency):
+        if not CurrencyService.is_valid_currency(code):
+            raise HTTPException(status_code=400, detail=f"Invalid currency: {code}")
+
+@currency_router.post("/historical", response_model=HistoricalRateResponse)
+async def get_historical_rate(request: HistoricalRateRequest):
+    """Rate for a pair as of the end of a day (UTC), from recorded snapshots only"""
+    base_currency = request.base_currency.upper()
+    target_currency = request.target_currency.upper()
+    _validate_pair(base_currency, target_currency)
+    _, day_end = _day_bounds(request.date)
+    
+    found = CurrencyService.get_historical_rate(base_currency, target_currency, day_end)
+    if not found:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No recorded {base_currency}/{target_currency} rate on or before {request.date}"
+        )
+    
+    rate_unix, rate = found
+    return FastJSONResponse({
+        "base_currency": base_currency,
+        "target_currency": target_currency,
+        "date": request.date,
+        "exchange_rate": rate,
+        "rate_timestamp": datetime.fromtimestamp(rate_unix, tz=timezone.utc)
+    })
+
+@currency_router.get("/historical/{base_currency}/{target_currency}", response_model=HistoricalSeriesResponse)
+async def get_historical_series(
+    base_currency: str,
+    target_currency: str,
+    start: str = Query(..., description="First day, YYYY-MM-DD (UTC)"),
+    end: str = Query(..., description="Last day, YYYY-MM-DD (UTC)")
+):
+    """Recorded rates for a pair over a date range, as parallel timestamp/rate arrays"""
+    base_currency = base_currency.upper()
+    target_currency = target_currency.upper()
+    _validate_pair(base_currency, target_currency)
+    range_start, _ = _day_bounds(start)
+    _, range_end = _day_bounds(end)
+    if range_end < range_start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    
+    timestamps, rates = CurrencyService.get_historical_series(base_currency, target_currency, range_start, range_end)
+    return FastJSONResponse({
+        "base_currency": base_currency,
+        "target_currency": target_currency,
+        "start": start,
+        "end": end,
+        "count": len(rates),
+        "timestamps": timestamps,
+        "rates": rates
+    })
@@ -11,12 +11,53 @@ class Settings(BaseSettings):
     EXCHANGE_API_KEY: str = "de1695208ebf652f2f84fe41"  # From original project
     EXCHANGE_API_URL: str = "https://v6.exchangerate-api.com/v6"
     
+    # Every base is derived from one upstream vector for this currency
+    PIVOT_CURRENCY: str = "USD"
+    
     # Fallback APIs
     FIXER_API_KEY: Optional[str] = None
     FIXER_API_URL: str = "https://api.fixer.io/v1"
+    HEDGE_DELAY_MS: int = 300  # fire the fallback provider if the primary is slower than this
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failures before a provider is skipped
+    CIRCUIT_RECOVERY_SECONDS: float = 30.0  # how long a provider is skipped before a trial call
+    QUOTED_CODES_TTL_SECONDS: float = 3600.0  # codes missing from a provider's snapshot are retried after this
+    
+    # Upstream HTTP client pool
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    HTTP2_ENABLED: bool = False  # requires the 'h2' package
     
     # Cache Configuration
     CACHE_TTL: int = 3600  # 1 hour in seconds
+    CACHE_CODEC: str = "packed"  # packed | msgpack | json
+    
+    # In-process L1 cache in front of Redis, kept coherent via pub/sub
+    L1_CACHE_SIZE: int = 256
+    L1_CACHE_TTL: int = 300
+    CACHE_INVALIDATION_CHANNEL: str = "rates:invalidate"
+    CACHE_INVALIDATION_RETRY_SECONDS: float = 1.0  # first reconnect delay, doubled up to the max
+    CACHE_INVALIDATION_RETRY_MAX_SECONDS: float = 30.0
+    
+    # Append-only on-disk history of every upstream snapshot (empty disables it)
+    HISTORY_DIR: str = "data/history"
+    HISTORY_MAX_POINTS: int = 1000  # longer series are evenly thinned to this many points
+    
+    # Latest snapshots saved locally and reloaded on startup within CACHE_TTL (empty disables)
+    SNAPSHOT_PATH: str = "data/rates.snapshot"
+    
+    # Prefetch: the most requested bases are refreshed this long before their cache entry expires,
+    # spending at most PREFETCH_CALLS_PER_HOUR upstream calls (0 disables)
+    PREFETCH_TOP_N: int = 5
+    PREFETCH_LEAD_SECONDS: float = 60.0
+    PREFETCH_CALLS_PER_HOUR: int = 30
+    PREFETCH_HALF_LIFE_SECONDS: float = 600.0
+    PREFETCH_INTERVAL_SECONDS: float = 10.0
+    
+    # Push subscriptions (SSE): how often subscribed bases are re-read for changes
+    RATE_PUSH_INTERVAL_SECONDS: int = 30
     RATE_LIMIT_PER_MINUTE: int = 100
     
     # App Configuration
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -5,6 +6,8 @@ import redis.asyncio as redis
 from app.core.config import settings
 from app.api.routes import currency_router
 from app.services.redis_service import RedisService
+from app.services.currency_service import CurrencyService
+from app.services.http_client import create_http_client
 
 # Global Redis connection
 redis_client = None
@@ -13,15 +16,38 @@ redis_client = None
 async def lifespan(app: FastAPI):
     # Startup
     global redis_client
+    invalidation_listener = None
+    
+    # Serve the last saved snapshots from the first request, even if Redis is down
+    restored = CurrencyService.restore_snapshot()
+    if restored:
+        print(f"♻️  Restored {restored} rate snapshots from {settings.SNAPSHOT_PATH}")
+    
+    # Push changed rates to SSE subscribers instead of having clients poll
+    rate_pusher = asyncio.create_task(CurrencyService.push_rate_updates())
+    
+    # Refresh the most requested bases before they expire
+    prefetcher = asyncio.create_task(CurrencyService.run_prefetch()) if settings.PREFETCH_CALLS_PER_HOUR > 0 else None
+    
+    # One pooled upstream client for every cache miss
+    http_client = create_http_client()
+    CurrencyService.set_http_client(http_client)
+    
     try:
         redis_client = redis.Redis(
             host=settings.REDIS_HOST,
             port=settings.REDIS_PORT,
-            decode_responses=True
+            decode_responses=False  # rate snapshots are stored with a binary codec
         )
         await redis_client.ping()
         RedisService.set_client(redis_client)
         print("✅ Connected to Redis")
+        
+        # Keep the in-process L1 cache coherent with other instances
+        invalidation_listener = asyncio.create_task(CurrencyService.listen_for_invalidations())
+        
+        # Warm the pivot snapshot every request is derived from
+        await CurrencyService.warm_cache()
     except Exception as e:
         print(f"⚠️  Redis connection failed: {e}")
         print("📱 Running without cache")
@@ -29,8 +55,16 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    rate_pusher.cancel()
+    if prefetcher:
+        prefetcher.cancel()
+    CurrencyService.save_snapshot()
+    if invalidation_listener:
+        invalidation_listener.cancel()
     if redis_client:
         await redis_client.close()
+    CurrencyService.set_http_client(None)
+    await http_client.aclose()
 
 app = FastAPI(
     title="Currency Converter API",
@@ -61,6 +95,7 @@ async def root():
             "currencies": "/api/v1/currencies",
             "convert": "/api/v1/convert",
             "rates": "/api/v1/rates/{base_currency}",
+            "historical": "/api/v1/historical",
             "health": "/health"
         }
     }
@@ -71,5 +106,10 @@ async def health_check():
     return {
         "status": "healthy",
         "redis": redis_status,
+        "l1_cache": CurrencyService.cache_stats(),
+        "providers": CurrencyService.provider_stats(),
+        "rate_push": CurrencyService.push_stats(),
+        "prefetch": CurrencyService.prefetch_stats(),
+        "history": CurrencyService.history_stats(),
         "timestamp": "2025-09-06T00:43:23+08:00"
     }
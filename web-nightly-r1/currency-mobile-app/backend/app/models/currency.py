@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class CurrencyCode(BaseModel):
@@ -26,6 +26,7 @@ class ExchangeRatesResponse(BaseModel):
     rates: Dict[str, float]
     timestamp: datetime
     source: str = "exchangerate-api"
+    stale: bool = False  # served from the last known-good snapshot while upstream is down
 
 class CurrencyListResponse(BaseModel):
     currencies: Dict[str, str]  # code -> country_code mapping
@@ -37,6 +38,22 @@ class HistoricalRateRequest(BaseModel):
     target_currency: str = Field(..., min_length=3, max_length=3)
     date: str = Field(..., description="Date in YYYY-MM-DD format")
 
+class HistoricalRateResponse(BaseModel):
+    base_currency: str
+    target_currency: str
+    date: str
+    exchange_rate: float
+    rate_timestamp: datetime  # publication time of the recorded snapshot in effect at the end of date
+
+class HistoricalSeriesResponse(BaseModel):
+    base_currency: str
+    target_currency: str
+    start: str
+    end: str
+    count: int
+    timestamps: List[int]  # unix publication times, ascending
+    rates: List[float]
+
 class APIError(BaseModel):
     error: str
     message: str
@@ -0,0 +1,68 @@
+import time
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a failing upstream: opens after failure_threshold consecutive
+    failures, then lets one trial call through every recovery_timeout seconds"""
+    
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self.opened_count = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_started: Optional[float] = None
+    
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._trial_started = None
+        return self._state
+    
+    def allow(self) -> bool:
+        """Whether a call may be made now (half-open admits a single trial)"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        now = time.monotonic()
+        # A trial that never reported back (e.g. a cancelled hedge) is replaced after recovery_timeout
+        if state == HALF_OPEN and (self._trial_started is None or now - self._trial_started >= self.recovery_timeout):
+            self._trial_started = now
+            return True
+        self.rejected += 1
+        return False
+    
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._trial_started = None
+        self._state = CLOSED
+    
+    def record_neutral(self):
+        """The call was answered but refused for reasons of its own (e.g. a 4xx): says nothing about health"""
+        self._trial_started = None
+    
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._trial_started = None
+        if self._state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self._state != OPEN:
+                self.opened_count += 1
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+    
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+            "opened": self.opened_count
+        }
@@ -0,0 +1,105 @@
+import json
+import struct
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional
+    msgpack = None
+
+
+class JsonCodec:
+    """Plain JSON values (human readable, slowest to decode)"""
+    name = "json"
+    
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+    
+    def decode(self, data: bytes) -> Optional[Any]:
+        try:
+            return json.loads(data)
+        except (ValueError, TypeError):
+            return None
+
+
+class MsgpackCodec:
+    """msgpack values - compact and generic"""
+    name = "msgpack"
+    
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+    
+    def decode(self, data: bytes) -> Optional[Any]:
+        try:
+            return msgpack.unpackb(data, raw=False)
+        except (ValueError, TypeError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError):
+            return None
+
+
+class PackedRatesCodec:
+    """Rate snapshots as a float64 array plus the currency codes it is keyed by
+    
+    Layout: magic, base, updated_unix, count, provider length, codes length,
+    then the provider name, the comma-separated codes and one little-endian
+    double per code. Every code the provider quoted is kept, so a decoded
+    snapshot matches the one encoded. Decoding is a single array copy instead
+    of parsing ~160 JSON floats; the code list is split once per distinct
+    layout (providers quote the same codes in the same order every time).
+    """
+    name = "packed"
+    MAGIC = b"KR2"
+    HEADER = struct.Struct("<3s3sqIHI")
+    MAX_LAYOUTS = 16
+    
+    def __init__(self):
+        self._layouts: Dict[bytes, Tuple[str, ...]] = {}
+    
+    def encode(self, snapshot: Dict) -> bytes:
+        rates = snapshot["rates"]
+        codes = ",".join(rates).encode("ascii")
+        provider = snapshot.get("provider", "").encode("ascii")
+        header = self.HEADER.pack(
+            self.MAGIC, snapshot["base"].encode("ascii"), int(snapshot.get("updated_unix", 0)),
+            len(rates), len(provider), len(codes)
+        )
+        return b"".join((header, provider, codes, array("d", rates.values()).tobytes()))
+    
+    def decode(self, data: bytes) -> Optional[Dict]:
+        if len(data) < self.HEADER.size or data[:3] != self.MAGIC:
+            return None  # another codec or an older layout
+        _, base, updated_unix, count, provider_length, codes_length = self.HEADER.unpack_from(data)
+        codes_at = self.HEADER.size + provider_length
+        values_at = codes_at + codes_length
+        if len(data) != values_at + count * 8:
+            return None
+        
+        layout = data[codes_at:values_at]
+        codes = self._layouts.get(layout)
+        if codes is None:
+            codes = tuple(layout.decode("ascii").split(",")) if count else ()
+            if len(codes) != count:
+                return None
+            if len(self._layouts) >= self.MAX_LAYOUTS:
+                self._layouts.clear()
+            self._layouts[layout] = codes
+        
+        values = array("d")
+        values.frombytes(data[values_at:])
+        return {
+            "base": base.decode("ascii"),
+            "rates": dict(zip(codes, values)),
+            "updated_unix": updated_unix,
+            "provider": data[self.HEADER.size:codes_at].decode("ascii")
+        }
+
+
+def get_codec(name: str):
+    """Codec for rate snapshots by name: packed (default), msgpack or json"""
+    if name == "msgpack" and msgpack is not None:
+        return MsgpackCodec()
+    if name == "json":
+        return JsonCodec()
+    if name == "msgpack":
+        print("⚠️  msgpack not installed, using packed rate codec")
+    return PackedRatesCodec()
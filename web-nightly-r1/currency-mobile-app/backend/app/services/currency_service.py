@@ -1,10 +1,22 @@
+import asyncio
 import httpx
 import json
-from typing import Dict, Optional, Tuple
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from app.core.config import settings
 from app.services.redis_service import RedisService
-from app.models.currency import ConversionResponse, ExchangeRatesResponse
+from app.services.codecs import get_codec
+from app.services.local_cache import LocalTTLCache
+from app.services.providers import configured_providers, hedged_fetch
+from app.services.rate_hub import RateHub, RateSubscriber
+from app.services.history_store import HistoryStore
+from app.services.snapshot_file import RateSnapshotFile
+from app.services.prefetch import PrefetchScheduler
+from app.services.circuit_breaker import OPEN
+from app.models.currency import ExchangeRatesResponse
+from app.utils.rates import cross_rates
 
 class CurrencyService:
     
@@ -39,51 +51,335 @@ class CurrencyService:
         "ZAR": "ZA", "ZMK": "ZM", "ZWD": "ZW"
     }
     
+    # Rate snapshots are stored in Redis (and the warm-restart file) with this codec
+    RATES_CODEC = get_codec(settings.CACHE_CODEC)
+    
+    # L1 cache of snapshots by base; other instances drop entries when we publish a refresh
+    _l1 = LocalTTLCache(max_entries=settings.L1_CACHE_SIZE, ttl=settings.L1_CACHE_TTL)
+    _instance_id = uuid.uuid4().hex
+    
+    # Upstream providers in priority order (hedged on slow responses)
+    _providers = configured_providers()
+    
+    # Latest good snapshot per base, served (marked stale) when every provider fails
+    _last_known_good: Dict[str, Dict] = {}
+    
+    # When this instance fetched each snapshot upstream, and the file they are saved to for warm restarts
+    _fetched_at: Dict[str, float] = {}
+    _snapshot_file = RateSnapshotFile(settings.SNAPSHOT_PATH, RATES_CODEC) if settings.SNAPSHOT_PATH else None
+    
+    # Popularity of each base; hot bases are refreshed shortly before they expire so they never miss
+    _prefetcher = PrefetchScheduler(
+        refresh=lambda base: CurrencyService._prefetch(base),
+        expires_in=lambda base: CurrencyService._snapshot_expires_in(base),
+        top_n=settings.PREFETCH_TOP_N,
+        lead_seconds=settings.PREFETCH_LEAD_SECONDS,
+        calls_per_hour=settings.PREFETCH_CALLS_PER_HOUR,
+        half_life=settings.PREFETCH_HALF_LIFE_SECONDS,
+        can_fetch=lambda: CurrencyService._providers_available()
+    )
+    
+    # Fan-out of rate changes to SSE subscribers
+    _hub = RateHub()
+    
+    # Pooled upstream client owned by the app lifespan
+    _http_client: Optional[httpx.AsyncClient] = None
+    
+    # On-disk history of every upstream snapshot, opened on first use
+    _history: Optional[HistoryStore] = None
+    
     @classmethod
-    async def get_exchange_rates(cls, base_currency: str) -> Optional[Dict[str, float]]:
-        """Get exchange rates for a base currency with caching"""
-        cache_key = f"rates:{base_currency}"
+    def set_http_client(cls, client: Optional[httpx.AsyncClient]):
+        cls._http_client = client
+    
+    @classmethod
+    async def get_rate_snapshot(cls, base_currency: str) -> Optional[Dict]:
+        """Get a cached or fresh rate snapshot: {"base", "rates", "updated_unix", "provider"}"""
+        snapshots = await cls.get_rate_snapshots([base_currency])
+        return snapshots.get(base_currency)
+    
+    @classmethod
+    async def get_rate_snapshots(cls, base_currencies: List[str]) -> Dict[str, Dict]:
+        """Get snapshots for several bases: L1, then one Redis read, then the API"""
+        snapshots = {}
+        for base in base_currencies:
+            snapshot = cls._l1.get(base)
+            if snapshot:
+                snapshots[base] = snapshot
         
-        # Try cache first
-        cached_rates = await RedisService.get_json(cache_key)
-        if cached_rates:
-            return cached_rates
+        # L2: Redis
+        missing = [base for base in base_currencies if base not in snapshots]
+        if missing:
+            cached = await RedisService.mget_encoded([f"rates:{base}" for base in missing], cls.RATES_CODEC)
+            for base, snapshot in zip(missing, cached):
+                if snapshot:
+                    cls._l1.set(base, snapshot)
+                    cls._last_known_good[base] = snapshot
+                    snapshots[base] = snapshot
         
-        # Fetch from API
-        rates = await cls._fetch_rates_from_api(base_currency)
-        if rates:
+        # Fetch misses from API concurrently
+        missing = [base for base in base_currencies if base not in snapshots]
+        if missing:
+            snapshots.update(await cls.refresh_snapshots(missing))
+            
+            # Upstream down - serve what we last had rather than failing (never cached)
+            for base in missing:
+                if base not in snapshots and base in cls._last_known_good:
+                    print(f"⚠️ Serving last known-good rates for {base}")
+                    snapshots[base] = {**cls._last_known_good[base], "stale": True}
+        
+        # Only bases that were actually served count as popular - failing ones are never prefetched
+        for base in snapshots:
+            cls._prefetcher.record(base)
+        return snapshots
+    
+    @classmethod
+    async def refresh_snapshots(cls, base_currencies: List[str]) -> Dict[str, Dict]:
+        """Fetch bases from upstream and store them in every cache tier"""
+        fetched = await asyncio.gather(*(cls._fetch_rates_from_api(base) for base in base_currencies))
+        fresh = {base: snapshot for base, snapshot in zip(base_currencies, fetched) if snapshot}
+        if fresh:
             # Cache for 1 hour
-            await RedisService.set(cache_key, rates, ttl=3600)
+            await RedisService.mset_encoded(
+                {f"rates:{base}": snapshot for base, snapshot in fresh.items()},
+                cls.RATES_CODEC,
+                ttl=3600
+            )
+            for base, snapshot in fresh.items():
+                cls._l1.set(base, snapshot)
+                cls._last_known_good[base] = snapshot
+                cls._fetched_at[base] = time.time()
+                await cls._record_history(snapshot)
+                await RedisService.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{cls._instance_id}:{base}")
+            cls.save_snapshot()
+        return fresh
+    
+    @classmethod
+    async def _snapshot_expires_in(cls, base_currency: str) -> Optional[float]:
+        """Seconds until base's cached snapshot expires: Redis TTL, else the L1 entry"""
+        remaining = await RedisService.ttl(f"rates:{base_currency}")
+        return remaining if remaining is not None else cls._l1.expires_in(base_currency)
+    
+    @classmethod
+    async def _prefetch(cls, base_currency: str) -> bool:
+        fresh = await cls.refresh_snapshots([base_currency])
+        return base_currency in fresh
+    
+    @classmethod
+    def _providers_available(cls) -> bool:
+        return any(provider.breaker.state != OPEN for provider in cls._providers)
+    
+    @classmethod
+    async def run_prefetch(cls):
+        """Keep the most requested snapshots refreshed ahead of expiry (runs for the app lifetime)"""
+        await cls._prefetcher.run(settings.PREFETCH_INTERVAL_SECONDS)
+    
+    @classmethod
+    def prefetch_stats(cls) -> Dict:
+        return cls._prefetcher.stats()
+    
+    @classmethod
+    def save_snapshot(cls) -> int:
+        """Save the snapshots this instance fetched so the next start is warm"""
+        if cls._snapshot_file is None:
+            return 0
+        entries = {
+            base: (cls._last_known_good[base], fetched_at)
+            for base, fetched_at in cls._fetched_at.items()
+            if base in cls._last_known_good
+        }
+        try:
+            return cls._snapshot_file.save(entries)
+        except OSError as e:
+            print(f"⚠️ Could not save rate snapshot: {e}")
+            return 0
+    
+    @classmethod
+    def restore_snapshot(cls) -> int:
+        """Load saved snapshots younger than CACHE_TTL into L1 (works without Redis)"""
+        if cls._snapshot_file is None:
+            return 0
+        try:
+            entries = cls._snapshot_file.load(max_age=settings.CACHE_TTL)
+        except OSError as e:
+            print(f"⚠️ Could not read rate snapshot: {e}")
+            return 0
         
-        return rates
+        now = time.time()
+        for base, (snapshot, fetched_at) in entries.items():
+            # Expire from L1 no later than the Redis copy would have
+            remaining = settings.CACHE_TTL - (now - fetched_at)
+            cls._l1.set(base, snapshot, ttl=min(settings.L1_CACHE_TTL, remaining))
+            cls._last_known_good[base] = snapshot
+            cls._fetched_at[base] = fetched_at
+        return len(entries)
+    
+    @classmethod
+    async def listen_for_invalidations(cls):
+        """Drop L1 entries refreshed by other instances (runs for the app lifetime)
+        
+        Redis failures are retried with exponential backoff; after a reconnect
+        L1 is cleared, since invalidations sent meanwhile were missed.
+        """
+        delay = settings.CACHE_INVALIDATION_RETRY_SECONDS
+        reconnecting = False
+        while True:
+            pubsub = RedisService.pubsub()
+            if pubsub is None:
+                return
+            try:
+                await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                if reconnecting:
+                    cls._l1.clear()
+                    print("✅ Cache invalidation listener reconnected")
+                delay = settings.CACHE_INVALIDATION_RETRY_SECONDS
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = message["data"]
+                    sender, _, base = (data.decode() if isinstance(data, bytes) else data).partition(":")
+                    if sender != cls._instance_id:
+                        cls._l1.delete(base)
+            except Exception as e:
+                print(f"⚠️ Cache invalidation listener failed, retrying in {delay:g}s: {e}")
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+            reconnecting = True
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.CACHE_INVALIDATION_RETRY_MAX_SECONDS)
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        return cls._l1.stats()
+    
+    @classmethod
+    async def subscribe_rates(cls, base_currency: str, targets: List[str]) -> Optional[RateSubscriber]:
+        """Subscribe to rate changes for a base, primed with the current snapshot"""
+        snapshot = await cls.get_exchange_snapshot(base_currency)
+        if not snapshot:
+            return None
+        return cls._hub.subscribe(base_currency, targets, snapshot)
+    
+    @classmethod
+    def unsubscribe_rates(cls, subscriber: RateSubscriber):
+        cls._hub.unsubscribe(subscriber)
+    
+    @classmethod
+    async def push_rate_updates(cls):
+        """Re-read subscribed bases and push what changed (runs for the app lifetime)"""
+        while True:
+            await asyncio.sleep(settings.RATE_PUSH_INTERVAL_SECONDS)
+            for base in cls._hub.bases():
+                try:
+                    snapshot = await cls.get_exchange_snapshot(base)
+                    if snapshot:
+                        cls._hub.publish(snapshot)
+                except Exception as e:
+                    # Keep pushing - one bad refresh must not stop updates for every subscriber
+                    print(f"⚠️ Rate push failed for {base}: {e}")
+    
+    @classmethod
+    def push_stats(cls) -> Dict[str, int]:
+        return cls._hub.stats()
+    
+    @classmethod
+    async def warm_cache(cls, base_currencies: Optional[List[str]] = None) -> int:
+        """Pre-load snapshots (default: the pivot) into Redis, returning how many are cached"""
+        snapshots = await cls.get_rate_snapshots(base_currencies or [settings.PIVOT_CURRENCY])
+        return len(snapshots)
     
     @classmethod
-    async def _fetch_rates_from_api(cls, base_currency: str) -> Optional[Dict[str, float]]:
-        """Fetch rates from external API"""
-        url = f"{settings.EXCHANGE_API_URL}/{settings.EXCHANGE_API_KEY}/latest/{base_currency}"
+    async def get_exchange_snapshot(cls, base_currency: str) -> Optional[Dict]:
+        """Get a rate snapshot for a base currency, triangulated through the pivot"""
+        pivot = await cls.get_rate_snapshot(settings.PIVOT_CURRENCY)
+        if pivot:
+            rates = cross_rates(pivot["rates"], base_currency)
+            if rates:
+                return {
+                    "base": base_currency,
+                    "rates": rates,
+                    "updated_unix": pivot["updated_unix"],
+                    "provider": pivot.get("provider", ""),
+                    "stale": pivot.get("stale", False)
+                }
+        
+        if base_currency == settings.PIVOT_CURRENCY:
+            return None
         
-        async with httpx.AsyncClient() as client:
+        # Base not quoted by the pivot vector - fall back to a direct fetch
+        return await cls.get_rate_snapshot(base_currency)
+    
+    @classmethod
+    async def get_exchange_rates(cls, base_currency: str) -> Optional[Dict[str, float]]:
+        """Get exchange rates for a base currency, triangulated through the pivot"""
+        snapshot = await cls.get_exchange_snapshot(base_currency)
+        return snapshot["rates"] if snapshot else None
+    
+    @classmethod
+    async def _fetch_rates_from_api(cls, base_currency: str) -> Optional[Dict]:
+        """Fetch a rate snapshot, hedging across the configured providers"""
+        hedge_delay = settings.HEDGE_DELAY_MS / 1000
+        if cls._http_client is None:
+            # Outside the app lifespan (scripts, tests) - use a short-lived client
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                return await hedged_fetch(client, cls._providers, base_currency, hedge_delay)
+        return await hedged_fetch(cls._http_client, cls._providers, base_currency, hedge_delay)
+    
+    @classmethod
+    def history_store(cls) -> Optional[HistoryStore]:
+        """The rate history store, or None when HISTORY_DIR is unset or unusable"""
+        if cls._history is None and settings.HISTORY_DIR:
             try:
-                response = await client.get(url, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get("result") == "success":
-                    return data.get("conversion_rates", {})
-                else:
-                    print(f"API Error: {data.get('error-type', 'Unknown error')}")
-                    return None
-                    
-            except httpx.RequestError as e:
-                print(f"Request error: {e}")
-                return None
-            except httpx.HTTPStatusError as e:
-                print(f"HTTP error: {e}")
-                return None
-    
-    @classmethod
-    async def convert_currency(cls, from_currency: str, to_currency: str, amount: float) -> Optional[ConversionResponse]:
-        """Convert currency with caching and formatting"""
+                cls._history = HistoryStore(settings.HISTORY_DIR, cls.CURRENCY_COUNTRIES, settings.PIVOT_CURRENCY)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Rate history unavailable: {e}")
+        return cls._history
+    
+    @classmethod
+    async def _record_history(cls, snapshot: Dict):
+        history = cls.history_store()
+        if history is None:
+            return
+        try:
+            # The append locks and writes the files - keep both off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, history.append, snapshot)
+        except OSError as e:
+            print(f"⚠️ Could not record rate history: {e}")
+    
+    @classmethod
+    def get_historical_rate(cls, base_currency: str, target_currency: str, timestamp: int) -> Optional[Tuple[int, float]]:
+        """Rate in effect at timestamp from recorded history (never calls upstream)"""
+        history = cls.history_store()
+        return history.rate_at(base_currency, target_currency, timestamp) if history else None
+    
+    @classmethod
+    def get_historical_series(cls, base_currency: str, target_currency: str, start: int, end: int) -> Tuple[List[int], List[float]]:
+        """Recorded rates published between start and end (never calls upstream)"""
+        history = cls.history_store()
+        if history is None:
+            return [], []
+        return history.series(base_currency, target_currency, start, end, settings.HISTORY_MAX_POINTS)
+    
+    @classmethod
+    def history_stats(cls) -> Dict[str, int]:
+        history = cls.history_store()
+        return history.stats() if history else {}
+    
+    @classmethod
+    def is_quoted(cls, currency_code: str) -> bool:
+        """Whether some provider may quote a base (False once every provider's snapshot lacks it)"""
+        return any(not provider.quoted or currency_code in provider.quoted for provider in cls._providers)
+    
+    @classmethod
+    def provider_stats(cls) -> Dict[str, Dict[str, int]]:
+        return {provider.name: provider.stats() for provider in cls._providers}
+    
+    @classmethod
+    async def convert_currency(cls, from_currency: str, to_currency: str, amount: float) -> Optional[Dict]:
+        """Convert currency with caching and formatting (fields of ConversionResponse)"""
         rates = await cls.get_exchange_rates(from_currency)
         
         if not rates or to_currency not in rates:
@@ -95,15 +391,15 @@ class CurrencyService:
         # Format result similar to original project
         formatted_result = f"{amount:.2f} {from_currency} = {converted_amount:.2f} {to_currency}"
         
-        return ConversionResponse(
-            from_currency=from_currency,
-            to_currency=to_currency,
-            amount=amount,
-            converted_amount=converted_amount,
-            exchange_rate=exchange_rate,
-            timestamp=datetime.now(),
-            formatted_result=formatted_result
-        )
+        return {
+            "from_currency": from_currency,
+            "to_currency": to_currency,
+            "amount": amount,
+            "converted_amount": converted_amount,
+            "exchange_rate": exchange_rate,
+            "timestamp": datetime.now(),
+            "formatted_result": formatted_result
+        }
     
     @classmethod
     def get_supported_currencies(cls) -> Dict[str, str]:
@@ -114,3 +410,4 @@ class CurrencyService:
     def is_valid_currency(cls, currency_code: str) -> bool:
         """Check if currency code is supported"""
         return currency_code.upper() in cls.CURRENCY_COUNTRIES
+
@@ -0,0 +1,187 @@
+import json
+import math
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows - single writer per directory there
+    fcntl = None
+
+
+class HistoryStore:
+    """Append-only on-disk history of pivot rate vectors, one row per upstream publication
+
+    Columnar layout in one directory:
+      timestamps.i8  int64 publication time (unix seconds), strictly increasing
+      rates.f8       float64 rows of len(currencies) values (1 pivot = value units),
+                     NaN where the snapshot had no rate
+      meta.json      pivot and the fixed currency order (column ordinals)
+
+    Files are in native byte order. Readers memory-map both files: a point lookup
+    bisects the timestamp column (O(log n)) and a series is a strided memoryview
+    over two currency columns, so nothing is copied or parsed to answer a query.
+    """
+
+    TIMESTAMPS = "timestamps.i8"
+    RATES = "rates.f8"
+    META = "meta.json"
+
+    def __init__(self, directory: str, currencies: Iterable[str], pivot: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        meta_path = os.path.join(directory, self.META)
+        if os.path.exists(meta_path):
+            # Existing history keeps its column order; new currencies are not recorded
+            with open(meta_path) as f:
+                meta = json.load(f)
+        else:
+            meta = {"pivot": pivot, "currencies": list(currencies)}
+            with open(meta_path + ".tmp", "w") as f:
+                json.dump(meta, f)
+            os.replace(meta_path + ".tmp", meta_path)
+
+        self.pivot = meta["pivot"]
+        self.currencies = tuple(meta["currencies"])
+        self.index = {code: i for i, code in enumerate(self.currencies)}
+        self.width = len(self.currencies)
+        self._timestamps_path = os.path.join(directory, self.TIMESTAMPS)
+        self._rates_path = os.path.join(directory, self.RATES)
+        for path in (self._timestamps_path, self._rates_path):
+            open(path, "ab").close()
+
+        self._rows = 0
+        self._timestamps = memoryview(b"").cast("q")
+        self._rates = memoryview(b"").cast("d")
+        self.appended = 0
+        self.duplicates = 0
+        self.lookups = 0
+
+    def _committed_rows(self) -> int:
+        # A row counts once its timestamp is written (rates are written first)
+        return min(
+            os.path.getsize(self._timestamps_path) // 8,
+            os.path.getsize(self._rates_path) // (8 * self.width)
+        )
+
+    def _map(self, path: str, length: int) -> mmap.mmap:
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+
+    def _refresh(self) -> int:
+        """Re-map the files if rows were appended (by us or another process)"""
+        rows = self._committed_rows()
+        if rows != self._rows:
+            # Old maps are released once no query holds a view into them
+            self._timestamps = memoryview(self._map(self._timestamps_path, rows * 8)).cast("q")
+            self._rates = memoryview(self._map(self._rates_path, rows * 8 * self.width)).cast("d")
+            self._rows = rows
+        return rows
+
+    def __len__(self) -> int:
+        return self._refresh()
+
+    def append(self, snapshot: Dict) -> bool:
+        """Record a snapshot as a pivot row; False if it is not newer than the last row
+        
+        Takes a blocking file lock and writes to disk - call it off the event loop.
+        """
+        rates = snapshot["rates"]
+        if snapshot["base"] != self.pivot:
+            pivot_value = rates.get(self.pivot)
+            if not pivot_value:
+                return False
+            rates = {code: value / pivot_value for code, value in rates.items()}
+
+        row = array("d", [math.nan]) * self.width
+        for code, value in rates.items():
+            i = self.index.get(code)
+            if i is not None:
+                row[i] = value
+        row[self.index[self.pivot]] = 1.0
+        timestamp = int(snapshot["updated_unix"])
+
+        with open(self._timestamps_path, "r+b") as timestamps_file, open(self._rates_path, "r+b") as rates_file:
+            if fcntl:
+                fcntl.flock(timestamps_file, fcntl.LOCK_EX)
+            rows = os.fstat(timestamps_file.fileno()).st_size // 8
+            if rows:
+                timestamps_file.seek((rows - 1) * 8)
+                last = array("q")
+                last.frombytes(timestamps_file.read(8))
+                if timestamp <= last[0]:
+                    self.duplicates += 1
+                    return False
+            # Drop a row half-written by a crash before appending
+            rates_file.truncate(rows * 8 * self.width)
+            rates_file.seek(0, os.SEEK_END)
+            rates_file.write(row.tobytes())
+            rates_file.flush()
+            timestamps_file.seek(rows * 8)
+            timestamps_file.write(array("q", [timestamp]).tobytes())
+
+        self.appended += 1
+        return True
+
+    def _pair_rate(self, row: int, base_i: int, target_i: int) -> Optional[float]:
+        base_value = self._rates[row * self.width + base_i]
+        target_value = self._rates[row * self.width + target_i]
+        rate = target_value / base_value if base_value else math.nan
+        return None if math.isnan(rate) else rate
+
+    def rate_at(self, base: str, target: str, timestamp: int) -> Optional[Tuple[int, float]]:
+        """Rate in effect at timestamp: (publication time, rate), or None if unknown"""
+        base_i, target_i = self.index.get(base), self.index.get(target)
+        if base_i is None or target_i is None:
+            return None
+        self._refresh()
+        self.lookups += 1
+        row = bisect_right(self._timestamps, timestamp) - 1
+        if row < 0:
+            return None
+        rate = self._pair_rate(row, base_i, target_i)
+        return (self._timestamps[row], rate) if rate is not None else None
+
+    def series(self, base: str, target: str, start: int, end: int, max_points: int = 0) -> Tuple[List[int], List[float]]:
+        """Rows published in [start, end] as (timestamps, rates), evenly thinned to max_points
+        (always ending on the latest row)"""
+        base_i, target_i = self.index.get(base), self.index.get(target)
+        if base_i is None or target_i is None:
+            return [], []
+        self._refresh()
+        self.lookups += 1
+        lo = bisect_left(self._timestamps, start)
+        hi = bisect_right(self._timestamps, end)
+        if hi <= lo:
+            return [], []
+        step = -(-(hi - lo) // max_points) if max_points else 1
+        # Align the stride on the most recent row so thinning never drops it
+        first = lo + (hi - 1 - lo) % step
+
+        # Strided views over the two columns - no copy of the underlying file
+        width = self.width
+        times = self._timestamps[first:hi:step]
+        base_column = self._rates[first * width + base_i:hi * width:width * step]
+        target_column = self._rates[first * width + target_i:hi * width:width * step]
+
+        timestamps, rates = [], []
+        for timestamp, base_value, target_value in zip(times, base_column, target_column):
+            rate = target_value / base_value if base_value else math.nan
+            if not math.isnan(rate):
+                timestamps.append(timestamp)
+                rates.append(rate)
+        return timestamps, rates
+
+    def stats(self) -> Dict[str, int]:
+        rows = self._refresh()
+        return {
+            "rows": rows,
+            "first_unix": self._timestamps[0] if rows else 0,
+            "last_unix": self._timestamps[rows - 1] if rows else 0,
+            "appended": self.appended,
+            "duplicates": self.duplicates,
+            "lookups": self.lookups,
+        }
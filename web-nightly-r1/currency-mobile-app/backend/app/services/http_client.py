@@ -0,0 +1,30 @@
+import httpx
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401 - only needed for HTTP/2
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Pooled upstream client shared for the app lifetime (keep-alive, optional HTTP/2)"""
+    http2 = settings.HTTP2_ENABLED and HAS_HTTP2
+    if settings.HTTP2_ENABLED and not HAS_HTTP2:
+        print("⚠️  HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+    
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=settings.HTTP_READ_TIMEOUT,
+            write=settings.HTTP_READ_TIMEOUT,
+            pool=settings.HTTP_CONNECT_TIMEOUT
+        )
+    )
@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class DecayingCounter:
+    """Request counts per key that halve every half_life seconds (decayed lazily on touch)"""
+
+    def __init__(self, half_life: float = 600.0, max_keys: int = 1024):
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self._scores: Dict[str, Tuple[float, float]] = {}  # key -> (score, as of)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _decayed(self, score: float, since: float, now: float) -> float:
+        return score * math.pow(0.5, (now - since) / self.half_life)
+
+    def hit(self, key: str, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        score, since = self._scores.get(key, (0.0, now))
+        self._scores[key] = (self._decayed(score, since, now) + 1.0, now)
+        if len(self._scores) > self.max_keys:
+            # Forget the coldest half
+            self._scores = {key: (score, now) for key, score in self.top(self.max_keys // 2, now)}
+
+    def top(self, n: int, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """The n hottest keys with their current scores, hottest first"""
+        now = time.time() if now is None else now
+        scores = ((key, self._decayed(score, since, now)) for key, (score, since) in self._scores.items())
+        return heapq.nlargest(n, scores, key=lambda item: item[1])
+
+
+class CallBudget:
+    """At most calls_per_hour spends in any sliding hour"""
+
+    def __init__(self, calls_per_hour: int):
+        self.calls_per_hour = calls_per_hour
+        self._spent: deque = deque()
+
+    def remaining(self) -> int:
+        now = time.time()
+        while self._spent and self._spent[0] <= now - 3600:
+            self._spent.popleft()
+        return max(self.calls_per_hour - len(self._spent), 0)
+
+    def try_spend(self) -> bool:
+        if self.remaining() <= 0:
+            return False
+        self._spent.append(time.time())
+        return True
+
+
+class PrefetchScheduler:
+    """Refreshes the top_n most requested bases shortly before their cached snapshot expires
+
+    expires_in(base) returns the seconds left on the cached snapshot (None when
+    nothing is cached) and refresh(base) fetches it from upstream. Nothing is
+    spent while can_fetch() is False (every provider's circuit open), and
+    refreshes stop once the hourly call budget is spent. A base whose refresh
+    failed is not retried for retry_backoff seconds, doubling per consecutive
+    failure up to max_backoff.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[str], Awaitable[Any]],
+        expires_in: Callable[[str], Awaitable[Optional[float]]],
+        top_n: int = 5,
+        lead_seconds: float = 60.0,
+        calls_per_hour: int = 30,
+        half_life: float = 600.0,
+        min_score: float = 1.0,
+        can_fetch: Optional[Callable[[], bool]] = None,
+        retry_backoff: float = 60.0,
+        max_backoff: float = 3600.0
+    ):
+        self.refresh = refresh
+        self.expires_in = expires_in
+        self.top_n = top_n
+        self.lead_seconds = lead_seconds
+        self.min_score = min_score
+        self.can_fetch = can_fetch
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self._failures: Dict[str, Tuple[int, float]] = {}  # base -> (consecutive failures, retry at)
+        self.counter = DecayingCounter(half_life)
+        self.budget = CallBudget(calls_per_hour)
+        self.prefetched = 0
+        self.failed = 0
+        self.over_budget = 0
+
+    def record(self, base: str):
+        """Count one request served a snapshot for base"""
+        self.counter.hit(base)
+
+    async def due(self) -> List[str]:
+        """Hot bases whose snapshot is missing or about to expire"""
+        due = []
+        now = time.time()
+        for base, score in self.counter.top(self.top_n):
+            if score < self.min_score:
+                break
+            if base in self._failures and self._failures[base][1] > now:
+                continue  # backing off after a failed refresh
+            remaining = await self.expires_in(base)
+            if remaining is None or remaining <= self.lead_seconds:
+                due.append(base)
+        return due
+
+    async def run_once(self) -> int:
+        if self.can_fetch is not None and not self.can_fetch():
+            return 0
+        bases = []
+        for base in await self.due():
+            if not self.budget.try_spend():
+                self.over_budget += 1
+                break
+            bases.append(base)
+        if not bases:
+            return 0
+
+        results = await asyncio.gather(*(self.refresh(base) for base in bases), return_exceptions=True)
+        refreshed = 0
+        now = time.time()
+        for base, result in zip(bases, results):
+            if result and not isinstance(result, Exception):
+                refreshed += 1
+                self._failures.pop(base, None)
+            else:
+                failures = self._failures.get(base, (0, 0.0))[0] + 1
+                backoff = min(self.retry_backoff * 2 ** (failures - 1), self.max_backoff)
+                self._failures[base] = (failures, now + backoff)
+        self.failed += len(bases) - refreshed
+        self.prefetched += refreshed
+        return refreshed
+
+    async def run(self, interval: float):
+        """Check for due bases every interval seconds (runs for the app lifetime)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"⚠️ Prefetch failed: {e}")
+
+    def stats(self) -> Dict:
+        return {
+            "tracked": len(self.counter),
+            "hot": {base: round(score, 2) for base, score in self.counter.top(self.top_n)},
+            "prefetched": self.prefetched,
+            "failed": self.failed,
+            "over_budget": self.over_budget,
+            "backing_off": sorted(base for base, (_, retry_at) in self._failures.items() if retry_at > time.time()),
+            "budget_remaining": self.budget.remaining(),
+            "calls_per_hour": self.budget.calls_per_hour
+        }
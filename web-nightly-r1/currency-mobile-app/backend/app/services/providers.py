@@ -0,0 +1,199 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+import httpx
+from app.core.config import settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.utils.rates import cross_rates
+
+
+class RateProvider(ABC):
+    """Upstream rate source that normalizes its payload into a snapshot:
+    {"base", "rates", "updated_unix", "provider"}"""
+    name = "provider"
+    
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.requests = 0
+        self.failures = 0
+        self.wins = 0
+        # Codes in the last snapshot; other bases are not requested (the answer would be an error)
+        # except for one probe per QUOTED_CODES_TTL_SECONDS, so codes added upstream are picked up
+        self.quoted: frozenset = frozenset()
+        self.quoted_until = 0.0
+        self.breaker = CircuitBreaker(
+            self.name,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.CIRCUIT_RECOVERY_SECONDS
+        )
+    
+    @abstractmethod
+    def build_request(self, base_currency: str) -> tuple:
+        """(url, query params) for the latest rates of base_currency"""
+    
+    @abstractmethod
+    def normalize(self, data: Dict, base_currency: str) -> Optional[Dict]:
+        """Snapshot from a decoded payload, or None when the API reported an error"""
+    
+    def may_quote(self, base_currency: str) -> bool:
+        """Whether base_currency is worth a request; checked before the circuit is asked,
+        so a skipped base never takes a half-open trial slot"""
+        if not self.quoted or base_currency in self.quoted:
+            return True
+        now = time.monotonic()
+        if now < self.quoted_until:
+            return False
+        self.quoted_until = now + settings.QUOTED_CODES_TTL_SECONDS
+        return True
+    
+    async def fetch(self, client: httpx.AsyncClient, base_currency: str) -> Optional[Dict]:
+        url, params = self.build_request(base_currency)
+        self.requests += 1
+        try:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            snapshot = self.normalize(response.json(), base_currency)
+        except httpx.HTTPStatusError as e:
+            print(f"HTTP error from {self.name}: {e}")
+            # A 4xx is about this request (e.g. an unsupported code), not the provider's health
+            return self._failed(upstream=e.response.status_code >= 500)
+        except httpx.RequestError as e:
+            print(f"Request error from {self.name}: {e}")
+            return self._failed(upstream=True)
+        except (ValueError, AttributeError, TypeError) as e:
+            # Not JSON, not an object, or a rate that is not a number
+            print(f"Invalid payload from {self.name}: {e}")
+            return self._failed(upstream=True)
+        
+        if snapshot is None:
+            # The API answered with an error for this request (result != success)
+            return self._failed(upstream=False)
+        self.quoted = frozenset(snapshot["rates"])
+        self.quoted_until = time.monotonic() + settings.QUOTED_CODES_TTL_SECONDS
+        self.breaker.record_success()
+        return snapshot
+    
+    def _failed(self, upstream: bool) -> None:
+        """Count a failed fetch; only upstream faults (5xx, timeouts, connection errors,
+        broken payloads) count towards opening the circuit"""
+        self.failures += 1
+        if upstream:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_neutral()
+        return None
+    
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "wins": self.wins,
+            "circuit": self.breaker.stats()
+        }
+
+
+class ExchangeRateApiProvider(RateProvider):
+    name = "exchangerate-api"
+    
+    def build_request(self, base_currency: str) -> tuple:
+        return f"{self.base_url}/{self.api_key}/latest/{base_currency}", None
+    
+    def normalize(self, data: Dict, base_currency: str) -> Optional[Dict]:
+        if data.get("result") != "success":
+            print(f"API Error from {self.name}: {data.get('error-type', 'Unknown error')}")
+            return None
+        return {
+            "base": base_currency,
+            "rates": {code: float(rate) for code, rate in data.get("conversion_rates", {}).items()},
+            "updated_unix": data.get("time_last_update_unix", 0),
+            "provider": self.name
+        }
+
+
+class FixerProvider(RateProvider):
+    """Fixer quotes a fixed base on most plans, so other bases are triangulated"""
+    name = "fixer"
+    
+    def build_request(self, base_currency: str) -> tuple:
+        return f"{self.base_url}/latest", {"access_key": self.api_key}
+    
+    def normalize(self, data: Dict, base_currency: str) -> Optional[Dict]:
+        if not data.get("success"):
+            print(f"API Error from {self.name}: {data.get('error', {}).get('type', 'Unknown error')}")
+            return None
+        rates = {code: float(rate) for code, rate in data.get("rates", {}).items()}
+        quoted_base = data.get("base", "EUR")
+        rates.setdefault(quoted_base, 1.0)
+        if quoted_base != base_currency:
+            rates = cross_rates(rates, base_currency)
+            if rates is None:
+                return None
+        return {
+            "base": base_currency,
+            "rates": rates,
+            "updated_unix": data.get("timestamp", 0),
+            "provider": self.name
+        }
+
+
+def configured_providers() -> List[RateProvider]:
+    """Providers in priority order; Fixer joins only when a key is configured"""
+    providers: List[RateProvider] = [ExchangeRateApiProvider(settings.EXCHANGE_API_URL, settings.EXCHANGE_API_KEY)]
+    if settings.FIXER_API_KEY:
+        providers.append(FixerProvider(settings.FIXER_API_URL, settings.FIXER_API_KEY))
+    return providers
+
+
+async def hedged_fetch(
+    client: httpx.AsyncClient,
+    providers: List[RateProvider],
+    base_currency: str,
+    hedge_delay: float
+) -> Optional[Dict]:
+    """Ask providers in order, firing the next one when the current ones have not
+    answered within hedge_delay (or have failed); the first snapshot wins.
+    Providers whose circuit is open, or whose last snapshot lacks the base,
+    are skipped without a request."""
+    remaining = list(providers)
+    pending = set()
+    owners = {}
+    
+    def launch():
+        while remaining:
+            provider = remaining.pop(0)
+            if not provider.may_quote(base_currency) or not provider.breaker.allow():
+                continue
+            task = asyncio.create_task(provider.fetch(client, base_currency))
+            owners[task] = provider
+            pending.add(task)
+            return
+    
+    launch()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=hedge_delay if remaining else None,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                # Latency budget exceeded - hedge with the next provider
+                launch()
+                continue
+            
+            for task in done:
+                pending.discard(task)
+                snapshot = task.result()
+                if snapshot:
+                    owners[task].wins += 1
+                    return snapshot
+            
+            # Everything that finished failed - try the next provider right away
+            if remaining:
+                launch()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,125 @@
+import asyncio
+import json
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class RateSubscriber:
+    """One connected client: a short queue of pre-serialized frames"""
+    
+    def __init__(self, topic: "RateTopic", max_pending: int):
+        self.topic = topic
+        self.frames: deque = deque()
+        self.wakeup = asyncio.Event()
+        self.lagged = False
+        self.max_pending = max_pending
+    
+    def push(self, frame: str):
+        if len(self.frames) >= self.max_pending:
+            # Too slow to keep up with deltas - resync with a full snapshot instead
+            self.frames.clear()
+            self.lagged = True
+        else:
+            self.frames.append(frame)
+        self.wakeup.set()
+    
+    async def next_frame(self) -> str:
+        while not self.frames and not self.lagged:
+            self.wakeup.clear()
+            await self.wakeup.wait()
+        if self.lagged:
+            self.lagged = False
+            self.frames.clear()
+            return self.topic.snapshot_frame()
+        return self.frames.popleft()
+
+
+class RateTopic:
+    """Subscribers sharing one (base, targets) view and the rates last sent to them"""
+    
+    def __init__(self, base: str, targets: Tuple[str, ...]):
+        self.base = base
+        self.targets = targets
+        self.subscribers: Set[RateSubscriber] = set()
+        self.rates: Dict[str, float] = {}
+        self.updated_unix = 0
+        self._snapshot: Optional[str] = None
+    
+    def _frame(self, rates: Dict[str, float], full: bool) -> str:
+        return json.dumps(
+            {"base": self.base, "rates": rates, "updated_unix": self.updated_unix, "full": full},
+            separators=(",", ":")
+        )
+    
+    def snapshot_frame(self) -> str:
+        if self._snapshot is None:
+            self._snapshot = self._frame(self.rates, True)
+        return self._snapshot
+    
+    def apply(self, snapshot: Dict) -> Optional[str]:
+        """Take the snapshot's rates and return the delta frame, or None if nothing changed"""
+        if snapshot["updated_unix"] < self.updated_unix:
+            return None
+        rates = snapshot["rates"]
+        if self.targets:
+            rates = {code: rates[code] for code in self.targets if code in rates}
+        changed = {code: rate for code, rate in rates.items() if self.rates.get(code) != rate}
+        self.rates = rates
+        self.updated_unix = snapshot["updated_unix"]
+        self._snapshot = None
+        return self._frame(changed, False) if changed else None
+
+
+class RateHub:
+    """Fan-out of rate changes; subscribers with the same view share one serialized frame"""
+    
+    def __init__(self, max_pending: int = 16):
+        self.max_pending = max_pending
+        self._topics: Dict[Tuple[str, Tuple[str, ...]], RateTopic] = {}
+        self.frames_serialized = 0
+        self.frames_delivered = 0
+    
+    def bases(self) -> List[str]:
+        return sorted({topic.base for topic in self._topics.values()})
+    
+    def subscribe(self, base: str, targets: List[str], snapshot: Optional[Dict] = None) -> RateSubscriber:
+        key = (base, tuple(sorted(set(targets))))
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = RateTopic(*key)
+        if snapshot:
+            # Primed from a snapshot newer than the topic's (e.g. refreshed by another
+            # instance): current subscribers get the change before the new one joins
+            self._deliver(topic, topic.apply(snapshot))
+        subscriber = RateSubscriber(topic, self.max_pending)
+        topic.subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: RateSubscriber):
+        topic = subscriber.topic
+        topic.subscribers.discard(subscriber)
+        key = (topic.base, topic.targets)
+        if not topic.subscribers and self._topics.get(key) is topic:
+            del self._topics[key]
+    
+    def publish(self, snapshot: Dict):
+        """Push what changed in a base's snapshot to every subscriber of that base"""
+        for topic in list(self._topics.values()):
+            if topic.base == snapshot["base"]:
+                self._deliver(topic, topic.apply(snapshot))
+    
+    def _deliver(self, topic: RateTopic, frame: Optional[str]):
+        if frame is None or not topic.subscribers:
+            return
+        self.frames_serialized += 1
+        for subscriber in topic.subscribers:
+            subscriber.push(frame)
+        self.frames_delivered += len(topic.subscribers)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": sum(len(topic.subscribers) for topic in self._topics.values()),
+            "topics": len(self._topics),
+            "frames_serialized": self.frames_serialized,
+            "frames_delivered": self.frames_delivered
+        }
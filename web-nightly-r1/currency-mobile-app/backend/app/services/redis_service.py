@@ -1,6 +1,6 @@
 import json
 import redis.asyncio as redis
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
 from app.core.config import settings
 
 class RedisService:
@@ -11,7 +11,14 @@ class RedisService:
         cls._client = client
     
     @classmethod
-    async def get(cls, key: str) -> Optional[str]:
+    def pipeline(cls):
+        """Non-transactional pipeline to batch commands into one round trip"""
+        if not cls._client:
+            return None
+        return cls._client.pipeline(transaction=False)
+    
+    @classmethod
+    async def get(cls, key: str) -> Optional[bytes]:
         if not cls._client:
             return None
         try:
@@ -59,3 +66,72 @@ class RedisService:
             return bool(await cls._client.exists(key))
         except Exception:
             return False
+    
+    @classmethod
+    async def ttl(cls, key: str) -> Optional[int]:
+        """Seconds until key expires (None if missing, persistent or Redis unavailable)"""
+        if not cls._client:
+            return None
+        try:
+            remaining = await cls._client.ttl(key)
+            return remaining if remaining >= 0 else None
+        except Exception:
+            return None
+    
+    @classmethod
+    async def mget(cls, keys: List[str]) -> List[Optional[bytes]]:
+        """Fetch many keys in one round trip (None for misses)"""
+        if not cls._client or not keys:
+            return [None] * len(keys)
+        try:
+            return await cls._client.mget(keys)
+        except Exception:
+            return [None] * len(keys)
+    
+    @classmethod
+    async def mset(cls, mapping: Dict[str, Any], ttl: int = settings.CACHE_TTL) -> bool:
+        """Store many keys with a TTL in one pipelined round trip"""
+        pipe = cls.pipeline()
+        if pipe is None or not mapping:
+            return False
+        try:
+            for key, value in mapping.items():
+                pipe.setex(key, ttl, value)
+            await pipe.execute()
+            return True
+        except Exception:
+            return False
+    
+    @classmethod
+    async def get_encoded(cls, key: str, codec) -> Optional[Any]:
+        data = await cls.get(key)
+        return codec.decode(data) if data else None
+    
+    @classmethod
+    async def set_encoded(cls, key: str, value: Any, codec, ttl: int = settings.CACHE_TTL) -> bool:
+        return await cls.set(key, codec.encode(value), ttl=ttl)
+    
+    @classmethod
+    async def mget_encoded(cls, keys: List[str], codec) -> List[Optional[Any]]:
+        return [codec.decode(data) if data else None for data in await cls.mget(keys)]
+    
+    @classmethod
+    async def mset_encoded(cls, mapping: Dict[str, Any], codec, ttl: int = settings.CACHE_TTL) -> bool:
+        return await cls.mset({key: codec.encode(value) for key, value in mapping.items()}, ttl=ttl)
+    
+    @classmethod
+    async def publish(cls, channel: str, message: str) -> bool:
+        if not cls._client:
+            return False
+        try:
+            await cls._client.publish(channel, message)
+            return True
+        except Exception:
+            return False
+    
+    @classmethod
+    def pubsub(cls):
+        """Pub/sub handle for subscribers (None without Redis)"""
+        if not cls._client:
+            return None
+        return cls._client.pubsub()
@@ -0,0 +1,67 @@
+import os
+import struct
+import time
+from typing import Dict, Tuple
+
+
+class RateSnapshotFile:
+    """Latest rate snapshots saved locally so a restarted instance starts warm
+
+    Layout: magic, count, then per snapshot its fetch time (unix float), length
+    and the snapshot encoded with the Redis rates codec. Writes replace the file
+    atomically; a foreign or truncated file loads as empty.
+    """
+    MAGIC = b"KRS1"
+    HEADER = struct.Struct("<4sI")
+    ENTRY = struct.Struct("<dI")
+
+    def __init__(self, path: str, codec):
+        self.path = path
+        self.codec = codec
+
+    def save(self, entries: Dict[str, Tuple[Dict, float]]) -> int:
+        """Write {base: (snapshot, fetched_at)}, returning how many were saved"""
+        parts = [self.HEADER.pack(self.MAGIC, len(entries))]
+        for snapshot, fetched_at in entries.values():
+            data = self.codec.encode(snapshot)
+            parts.append(self.ENTRY.pack(fetched_at, len(data)))
+            parts.append(data)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.writelines(parts)
+        os.replace(tmp_path, self.path)
+        return len(entries)
+
+    def load(self, max_age: float) -> Dict[str, Tuple[Dict, float]]:
+        """Saved snapshots fetched less than max_age seconds ago"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}
+
+        if len(data) < self.HEADER.size:
+            return {}
+        magic, count = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC:
+            return {}
+
+        entries = {}
+        offset = self.HEADER.size
+        now = time.time()
+        try:
+            for _ in range(count):
+                fetched_at, length = self.ENTRY.unpack_from(data, offset)
+                offset += self.ENTRY.size
+                snapshot = self.codec.decode(data[offset:offset + length])
+                offset += length
+                # Skip entries written with another codec or past their TTL
+                if snapshot and 0 <= now - fetched_at < max_age:
+                    entries[snapshot["base"]] = (snapshot, fetched_at)
+        except struct.error:
+            return {}
+        return entries
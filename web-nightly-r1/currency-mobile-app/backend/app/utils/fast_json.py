@@ -0,0 +1,40 @@
+import json
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - the stdlib encoder produces the same JSON, slower
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, datetime):
+        if value.utcoffset() == timedelta(0):
+            return value.replace(tzinfo=None).isoformat() + "Z"
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes, with datetimes formatted the way Pydantic serializes them"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered straight from plain dicts/lists, skipping response_model validation
+
+    FastAPI does not validate or re-serialize a returned Response, so routes keep
+    their response_model for the OpenAPI schema and return this with content
+    that already matches it (values built from trusted internal data).
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
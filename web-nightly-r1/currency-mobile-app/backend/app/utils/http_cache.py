@@ -0,0 +1,35 @@
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict
+from fastapi import Request
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag derived from version parts"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def conditional_headers(etag: str, last_modified_unix: int = 0) -> Dict[str, str]:
+    """Validator headers that make clients revalidate instead of refetching"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified_unix:
+        headers["Last-Modified"] = formatdate(last_modified_unix, usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified_unix: int = 0) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since when it is absent"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or not last_modified_unix:
+        return False
+    try:
+        return last_modified_unix <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
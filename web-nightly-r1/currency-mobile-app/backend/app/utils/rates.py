@@ -0,0 +1,10 @@
+from typing import Dict, Optional
+
+
+def cross_rates(pivot_rates: Dict[str, float], base_currency: str) -> Optional[Dict[str, float]]:
+    """Derive rates for base_currency from a pivot rate vector (1 pivot = rate units)"""
+    base_value = pivot_rates.get(base_currency)
+    if not base_value:
+        return None
+    return {code: value / base_value for code, value in pivot_rates.items()}
+
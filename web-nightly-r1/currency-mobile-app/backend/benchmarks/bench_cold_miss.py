@@ -0,0 +1,97 @@
+"""
+Cold cache-miss latency: a new httpx client per upstream call vs the pooled lifespan client.
+
+Usage: python benchmarks/bench_cold_miss.py [--requests N] [--url UPSTREAM_BASE_URL]
+
+Without --url a local stand-in for exchangerate-api is started, so the numbers
+show connection setup cost only; point --url at the real API to include DNS/TLS.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.core.config import settings  # noqa: E402
+from app.services.currency_service import CurrencyService  # noqa: E402
+from app.services.http_client import create_http_client  # noqa: E402
+from app.services.providers import configured_providers  # noqa: E402
+
+
+class FakeExchangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        base = self.path.rsplit("/", 1)[-1]
+        body = json.dumps({
+            "result": "success",
+            "base_code": base,
+            "time_last_update_unix": int(time.time()),
+            "conversion_rates": {code: 1.0 for code in CurrencyService.CURRENCY_COUNTRIES}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+async def measure(requests: int) -> list:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        snapshot = await CurrencyService._fetch_rates_from_api(settings.PIVOT_CURRENCY)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not snapshot:
+            raise RuntimeError("Upstream request failed")
+    return latencies
+
+
+def report(label: str, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.mean(latencies):7.2f} ms   p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--url", help="Upstream base URL (default: local stand-in server)")
+    args = parser.parse_args()
+    
+    server = None
+    if args.url:
+        settings.EXCHANGE_API_URL = args.url
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeExchangeHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        settings.EXCHANGE_API_URL = f"http://127.0.0.1:{server.server_address[1]}/v6"
+    settings.FIXER_API_KEY = None
+    CurrencyService._providers = configured_providers()
+    
+    CurrencyService.set_http_client(None)
+    report("client per request", await measure(args.requests))
+    
+    client = create_http_client()
+    CurrencyService.set_http_client(client)
+    try:
+        report("pooled shared client", await measure(args.requests))
+    finally:
+        CurrencyService.set_http_client(None)
+        await client.aclose()
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
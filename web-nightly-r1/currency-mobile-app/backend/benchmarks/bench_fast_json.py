@@ -0,0 +1,145 @@
+"""
+Per-route response rendering: Pydantic response_model validation vs FastJSONResponse.
+
+Usage: python benchmarks/bench_fast_json.py [--requests N]
+
+For each route shape (rates for one base, currency list, conversion, 1000-point
+history series) two in-process apps serve the same payload: one returns the
+Pydantic model and lets FastAPI validate and serialize it through
+response_model (how the routes used to respond), the other returns
+FastJSONResponse (orjson when installed). Reports microseconds per request
+through the ASGI app, and the rendering cost alone.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.models.currency import (  # noqa: E402
+    ConversionResponse,
+    CurrencyListResponse,
+    ExchangeRatesResponse,
+    HistoricalSeriesResponse,
+)
+from app.services.currency_service import CurrencyService  # noqa: E402
+from app.utils import fast_json  # noqa: E402
+from app.utils.fast_json import FastJSONResponse  # noqa: E402
+from app.utils.rates import cross_rates  # noqa: E402
+
+
+def payloads() -> dict:
+    codes = list(CurrencyService.CURRENCY_COUNTRIES)
+    pivot = {code: 1.0 + index * 0.731 for index, code in enumerate(codes)}
+    now = int(time.time())
+    timestamps = [now - 3600 * i for i in range(1000, 0, -1)]
+    series = [0.9 + i * 1e-5 for i in range(1000)]
+    return {
+        "rates": (ExchangeRatesResponse, lambda: {
+            "base_currency": "EUR",
+            "rates": cross_rates(pivot, "EUR"),
+            "timestamp": datetime.now(),
+            "source": "exchangerate-api",
+            "stale": False
+        }),
+        "currencies": (CurrencyListResponse, lambda: {
+            "currencies": CurrencyService.CURRENCY_COUNTRIES,
+            "count": len(codes),
+            "timestamp": datetime.now()
+        }),
+        "convert": (ConversionResponse, lambda: {
+            "from_currency": "USD",
+            "to_currency": "EUR",
+            "amount": 125.0,
+            "converted_amount": 115.0,
+            "exchange_rate": 0.92,
+            "timestamp": datetime.now(),
+            "formatted_result": "125.00 USD = 115.00 EUR"
+        }),
+        "history": (HistoricalSeriesResponse, lambda: {
+            "base_currency": "USD",
+            "target_currency": "EUR",
+            "start": "2025-01-01",
+            "end": "2025-12-31",
+            "count": 1000,
+            "timestamps": timestamps,
+            "rates": series
+        }),
+    }
+
+
+def build_app(model, build, fast: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/route", response_model=model)
+    async def route():
+        if fast:
+            return FastJSONResponse(build())
+        return model(**build())
+
+    return app
+
+
+async def per_request(app: FastAPI, requests: int) -> float:
+    """Microseconds per request through the ASGI app (no HTTP client or socket in the loop)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/route", "raw_path": b"/route", "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    async with app.router.lifespan_context(app):
+        for _ in range(100):  # warm up
+            await app(dict(scope), receive, send)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await app(dict(scope), receive, send)
+        elapsed = time.perf_counter() - start
+    assert set(statuses) == {200}
+    return elapsed / requests * 1e6
+
+
+def render_only(model, build, fast: bool, requests: int) -> float:
+    """Microseconds to turn the payload into response bytes"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        if fast:
+            fast_json.dumps(build())
+        else:
+            # Build the model, validate it against response_model, dump it to JSON bytes
+            model.model_validate(model(**build())).model_dump_json()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    encoder = "orjson" if fast_json.orjson is not None else "json (install orjson for the fast encoder)"
+    print(f"Encoder: {encoder}\n")
+    print(f"{'route':<12}{'model us/req':>14}{'fast us/req':>13}{'speedup':>9}   {'model render':>13}{'fast render':>13}")
+    for name, (model, build) in payloads().items():
+        slow = await per_request(build_app(model, build, fast=False), args.requests)
+        fast = await per_request(build_app(model, build, fast=True), args.requests)
+        slow_render = render_only(model, build, False, args.requests)
+        fast_render = render_only(model, build, True, args.requests)
+        print(f"{name:<12}{slow:>14.1f}{fast:>13.1f}{slow / fast:>8.2f}x   {slow_render:>13.1f}{fast_render:>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Hedged upstream fetching against two local stand-in providers.
+
+Usage: python benchmarks/bench_hedging.py [--requests N] [--slow-ms MS] [--slow-every K] [--hedge-ms MS]
+
+The exchangerate-api stand-in answers in ~5 ms but every K-th request takes
+--slow-ms; the Fixer stand-in always answers in ~20 ms. Compares the latency
+distribution with hedging disabled and enabled.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services.http_client import create_http_client  # noqa: E402
+from app.services.providers import ExchangeRateApiProvider, FixerProvider, hedged_fetch  # noqa: E402
+
+RATES = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79, "JPY": 151.0, "IDR": 15800.0}
+
+
+def make_handler(payload, delay_for):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+        
+        def do_GET(self):
+            time.sleep(delay_for())
+            body = json.dumps(payload).encode()
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the losing side of a hedge was cancelled
+        
+        def log_message(self, *args):
+            pass
+    return Handler
+
+
+def serve(handler) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def run(providers, hedge_delay, requests):
+    client = create_http_client()
+    latencies = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            snapshot = await hedged_fetch(client, providers, "USD", hedge_delay)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not snapshot:
+                raise RuntimeError("All providers failed")
+    finally:
+        await client.aclose()
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--slow-ms", type=float, default=1000)
+    parser.add_argument("--slow-every", type=int, default=10)
+    parser.add_argument("--hedge-ms", type=float, default=100)
+    args = parser.parse_args()
+    
+    counter = itertools.count(1)
+    primary = serve(make_handler(
+        {"result": "success", "base_code": "USD", "time_last_update_unix": 1700000000, "conversion_rates": RATES},
+        lambda: args.slow_ms / 1000 if next(counter) % args.slow_every == 0 else 0.005
+    ))
+    fallback = serve(make_handler(
+        {"success": True, "base": "EUR", "timestamp": 1700000000, "rates": {k: v / RATES["EUR"] for k, v in RATES.items()}},
+        lambda: 0.02
+    ))
+    
+    try:
+        for label, hedge_ms in (("primary only", None), (f"hedged @ {args.hedge_ms:g} ms", args.hedge_ms)):
+            providers = [ExchangeRateApiProvider(f"http://127.0.0.1:{primary.server_address[1]}/v6", "key")]
+            if hedge_ms is not None:
+                providers.append(FixerProvider(f"http://127.0.0.1:{fallback.server_address[1]}", "key"))
+            latencies = await run(providers, (hedge_ms or 0) / 1000, args.requests)
+            wins = ", ".join(f"{p.name}={p.wins}" for p in providers)
+            print(f"{label:<18} p50 {percentile(latencies, 0.50):7.1f} ms   p99 {percentile(latencies, 0.99):7.1f} ms   "
+                  f"max {max(latencies):7.1f} ms   wins: {wins}")
+    finally:
+        primary.shutdown()
+        fallback.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# Keep tests off the working directory's history and snapshot files
+os.environ.setdefault("HISTORY_DIR", "")
+os.environ.setdefault("SNAPSHOT_PATH", "")
+os.environ.setdefault("PREFETCH_CALLS_PER_HOUR", "0")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.services.currency_service import CurrencyService  # noqa: E402
+from app.services.providers import configured_providers  # noqa: E402
+from app.services.redis_service import RedisService  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_service():
+    """CurrencyService keeps its state on the class - start every test from empty caches"""
+    CurrencyService._l1.clear()
+    CurrencyService._last_known_good.clear()
+    CurrencyService._fetched_at.clear()
+    CurrencyService._providers = configured_providers()
+    yield CurrencyService
+    RedisService.set_client(None)
+    CurrencyService.set_http_client(None)
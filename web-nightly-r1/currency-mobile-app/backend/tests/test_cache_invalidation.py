@@ -0,0 +1,80 @@
+import asyncio
+
+import fakeredis
+import redis
+
+from app.core.config import settings
+from app.services.currency_service import CurrencyService
+from app.services.redis_service import RedisService
+
+SNAPSHOT = {"base": "EUR", "rates": {"USD": 1.1}, "updated_unix": 1, "provider": "exchangerate-api"}
+
+
+async def eventually(check, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await check():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+async def listening(client) -> bool:
+    [(_, subscribers)] = await client.pubsub_numsub(settings.CACHE_INVALIDATION_CHANNEL)
+    return subscribers > 0
+
+
+async def cached(base: str, expected: bool) -> bool:
+    return (CurrencyService._l1.expires_in(base) is not None) == expected
+
+
+def test_invalidation_from_another_instance_evicts_l1():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        RedisService.set_client(fakeredis.FakeAsyncRedis(server=server))
+        other_instance = fakeredis.FakeAsyncRedis(server=server)
+        CurrencyService._l1.set("EUR", SNAPSHOT)
+        CurrencyService._l1.set("GBP", {**SNAPSHOT, "base": "GBP"})
+
+        listener = asyncio.create_task(CurrencyService.listen_for_invalidations())
+        try:
+            await eventually(lambda: listening(other_instance))
+            # Our own refreshes are already in L1 and must not be dropped
+            await other_instance.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{CurrencyService._instance_id}:GBP")
+            await other_instance.publish(settings.CACHE_INVALIDATION_CHANNEL, "another-instance:EUR")
+            await eventually(lambda: cached("EUR", False))
+            assert await cached("GBP", True)
+        finally:
+            listener.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_listener_reconnects_after_redis_failure(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_INVALIDATION_RETRY_SECONDS", 0.01)
+
+    class BrokenPubSub:
+        async def subscribe(self, *channels):
+            raise redis.ConnectionError("connection reset")
+
+        async def close(self):
+            pass
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        client = fakeredis.FakeAsyncRedis(server=server)
+        RedisService.set_client(client)
+        failures = [BrokenPubSub(), BrokenPubSub()]
+        monkeypatch.setattr(RedisService, "pubsub", classmethod(
+            lambda cls: failures.pop() if failures else client.pubsub()
+        ))
+
+        listener = asyncio.create_task(CurrencyService.listen_for_invalidations())
+        try:
+            await eventually(lambda: listening(client))
+            assert not listener.done()
+            CurrencyService._l1.set("EUR", SNAPSHOT)
+            await client.publish(settings.CACHE_INVALIDATION_CHANNEL, "another-instance:EUR")
+            await eventually(lambda: cached("EUR", False))
+        finally:
+            listener.cancel()
+
+    asyncio.run(scenario())
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+from app.services.currency_service import CurrencyService
+from app.services.history_store import HistoryStore
+
+CURRENCIES = ["USD", "EUR", "GBP"]
+
+
+def filled_store(directory, rows: int) -> HistoryStore:
+    store = HistoryStore(str(directory), CURRENCIES, "USD")
+    for i in range(1, rows + 1):
+        store.append({"base": "USD", "rates": {"EUR": i / 100}, "updated_unix": i * 100})
+    return store
+
+
+def test_series_returns_every_row_within_max_points(tmp_path):
+    store = filled_store(tmp_path, 12)
+    timestamps, rates = store.series("USD", "EUR", 0, 10_000, 12)
+    assert timestamps == [i * 100 for i in range(1, 13)]
+    assert rates == [i / 100 for i in range(1, 13)]
+
+
+def test_thinned_series_keeps_the_latest_row(tmp_path):
+    store = filled_store(tmp_path, 12)
+    assert store.series("USD", "EUR", 0, 10_000, 3) == ([400, 800, 1200], [0.04, 0.08, 0.12])
+    for max_points in (1, 2, 5, 11):
+        timestamps, rates = store.series("USD", "EUR", 0, 10_000, max_points)
+        assert 0 < len(timestamps) <= max_points
+        assert (timestamps[-1], rates[-1]) == (1200, 0.12)
+
+
+def test_history_is_appended_off_the_event_loop(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path), CURRENCIES, "USD")
+    monkeypatch.setattr(CurrencyService, "_history", store)
+    append_threads = []
+    append = store.append
+
+    def recording_append(snapshot):
+        append_threads.append(threading.get_ident())
+        return append(snapshot)
+
+    monkeypatch.setattr(store, "append", recording_append)
+    asyncio.run(CurrencyService._record_history({"base": "USD", "rates": {"EUR": 0.9}, "updated_unix": 100}))
+    assert append_threads and append_threads[0] != threading.get_ident()
+    assert store.series("USD", "EUR", 0, 200) == ([100], [0.9])
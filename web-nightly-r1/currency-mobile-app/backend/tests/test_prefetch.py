@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+
+from app.services.currency_service import CurrencyService
+from app.services.prefetch import PrefetchScheduler
+
+
+def test_bases_that_are_never_served_do_not_become_hot():
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(
+            404, json={"result": "error", "error-type": "unsupported-code"}
+        ))) as upstream:
+            CurrencyService.set_http_client(upstream)
+            for _ in range(3):
+                assert await CurrencyService.get_rate_snapshot("CYP") is None
+        return await CurrencyService._prefetcher.due()
+
+    assert "CYP" not in asyncio.run(scenario())
+
+
+def test_failed_refresh_backs_off():
+    refreshed = []
+    outcomes = {"EUR": False}
+
+    async def refresh(base):
+        refreshed.append(base)
+        return outcomes[base]
+
+    async def expires_in(base):
+        return None  # never cached, so always due
+
+    scheduler = PrefetchScheduler(refresh, expires_in, calls_per_hour=100, retry_backoff=0.05, max_backoff=0.2)
+    for _ in range(3):
+        scheduler.record("EUR")
+
+    async def scenario():
+        assert await scheduler.run_once() == 0
+        # Backing off: the next checks spend nothing
+        assert await scheduler.due() == []
+        assert await scheduler.run_once() == 0
+        assert refreshed == ["EUR"]
+        await asyncio.sleep(0.06)
+        outcomes["EUR"] = True
+        assert await scheduler.run_once() == 1
+        # A success clears the backoff
+        assert await scheduler.due() == ["EUR"]
+
+    asyncio.run(scenario())
+    assert scheduler.failed == 1 and scheduler.prefetched == 1
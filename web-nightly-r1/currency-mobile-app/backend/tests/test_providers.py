@@ -0,0 +1,153 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.routes import currency_router
+from app.services.circuit_breaker import HALF_OPEN, OPEN
+from app.services.currency_service import CurrencyService
+from app.services.providers import ExchangeRateApiProvider, FixerProvider, RateProvider, hedged_fetch
+
+RATES = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79}
+PRIMARY = "http://primary.test/v6"
+FALLBACK = "http://fallback.test"
+
+
+def primary_payload(rates=RATES):
+    return {"result": "success", "time_last_update_unix": 1000, "conversion_rates": rates}
+
+
+def fallback_payload():
+    return {"success": True, "base": "USD", "timestamp": 2000, "rates": RATES}
+
+
+def stand_in(primary, fallback=lambda: httpx.Response(200, json=fallback_payload()), primary_delay=0.0):
+    """Client whose upstream hosts are answered in process; counts requests per host"""
+    calls = {"primary.test": 0, "fallback.test": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls[request.url.host] += 1
+        if request.url.host == "primary.test":
+            await asyncio.sleep(primary_delay)
+            return primary()
+        return fallback()
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+def providers():
+    return [ExchangeRateApiProvider(PRIMARY, "key"), FixerProvider(FALLBACK, "key")]
+
+
+def fetch(client, chain, base="USD", hedge_delay=0.05):
+    async def run():
+        async with client:
+            return await hedged_fetch(client, chain, base, hedge_delay)
+    return asyncio.run(run())
+
+
+def test_rate_provider_is_abstract():
+    with pytest.raises(TypeError):
+        RateProvider(PRIMARY, "key")
+
+
+def test_primary_answer_wins_without_hedging():
+    client, calls = stand_in(lambda: httpx.Response(200, json=primary_payload()))
+    chain = providers()
+    snapshot = fetch(client, chain)
+    assert snapshot == {"base": "USD", "rates": RATES, "updated_unix": 1000, "provider": "exchangerate-api"}
+    assert calls == {"primary.test": 1, "fallback.test": 0}
+    assert chain[0].wins == 1
+
+
+def test_slow_primary_is_hedged_with_the_fallback():
+    client, calls = stand_in(lambda: httpx.Response(200, json=primary_payload()), primary_delay=1.0)
+    chain = providers()
+    snapshot = fetch(client, chain, hedge_delay=0.02)
+    assert snapshot["provider"] == "fixer"
+    assert calls == {"primary.test": 1, "fallback.test": 1}
+    assert chain[1].wins == 1
+
+
+def test_fallback_is_asked_right_away_when_the_primary_fails():
+    client, calls = stand_in(lambda: httpx.Response(503))
+    chain = providers()
+    snapshot = fetch(client, chain, hedge_delay=10.0)
+    assert snapshot["provider"] == "fixer"
+    assert calls == {"primary.test": 1, "fallback.test": 1}
+    assert chain[0].failures == 1
+
+
+@pytest.mark.parametrize("response", [
+    lambda: httpx.Response(200, text="<html>maintenance</html>"),
+    lambda: httpx.Response(200, json=["not", "an", "object"]),
+    lambda: httpx.Response(200, json=primary_payload({"USD": 1.0, "EUR": None})),
+    lambda: httpx.Response(200, json={"result": "success", "conversion_rates": "EUR=0.92"}),
+])
+def test_malformed_payload_is_a_provider_failure(response):
+    client, calls = stand_in(response)
+    chain = providers()
+    snapshot = fetch(client, chain)
+    assert snapshot["provider"] == "fixer"
+    assert chain[0].failures == 1
+
+
+def test_every_provider_failing_returns_none():
+    client, _ = stand_in(lambda: httpx.Response(200, json=None), lambda: httpx.Response(500))
+    assert fetch(client, providers()) is None
+
+
+def test_provider_with_open_circuit_is_skipped():
+    client, calls = stand_in(lambda: httpx.Response(200, json=primary_payload()))
+    chain = providers()
+    for _ in range(chain[0].breaker.failure_threshold):
+        chain[0].breaker.record_failure()
+    assert chain[0].breaker.state == OPEN
+    snapshot = fetch(client, chain)
+    assert snapshot["provider"] == "fixer"
+    assert calls == {"primary.test": 0, "fallback.test": 1}
+
+
+def test_base_missing_from_the_last_snapshot_keeps_the_half_open_trial():
+    client, calls = stand_in(lambda: httpx.Response(200, json=primary_payload()))
+    primary = providers()[0]
+    primary.quoted = frozenset(RATES)
+    primary.quoted_until = float("inf")
+    for _ in range(primary.breaker.failure_threshold):
+        primary.breaker.record_failure()
+    primary.breaker._opened_at -= primary.breaker.recovery_timeout
+    assert primary.breaker.state == HALF_OPEN
+
+    assert fetch(client, [primary], base="CYP") is None
+    assert calls == {"primary.test": 0, "fallback.test": 0}
+    # The trial slot is still free for a base the provider quotes
+    assert primary.breaker.allow()
+
+
+def test_base_missing_from_the_last_snapshot_is_probed_once_the_codes_expire():
+    client, calls = stand_in(lambda: httpx.Response(200, json=primary_payload({**RATES, "SLE": 22.7})))
+    primary = providers()[0]
+    primary.quoted = frozenset(RATES)
+    primary.quoted_until = 0.0
+
+    snapshot = fetch(client, [primary], base="SLE")
+    assert snapshot["rates"]["SLE"] == 22.7
+    assert calls["primary.test"] == 1
+    assert "SLE" in primary.quoted
+
+
+def test_rates_endpoint_reports_the_provider_that_answered():
+    app = FastAPI()
+    app.include_router(currency_router, prefix="/api/v1")
+    upstream, _ = stand_in(lambda: httpx.Response(503))
+    CurrencyService._providers = providers()[1:]
+
+    async def scenario():
+        async with upstream, httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+            CurrencyService.set_http_client(upstream)
+            return await client.get("/api/v1/rates/EUR")
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert response.json()["source"] == "fixer"
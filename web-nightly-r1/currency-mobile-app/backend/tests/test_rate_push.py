@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from app.core.config import settings
+from app.services.currency_service import CurrencyService
+from app.services.rate_hub import RateHub
+
+
+def snapshot(updated_unix, **rates):
+    return {"base": "USD", "rates": rates, "updated_unix": updated_unix}
+
+
+def test_newer_snapshot_from_a_subscribe_reaches_existing_subscribers():
+    async def scenario():
+        hub = RateHub()
+        first = hub.subscribe("USD", ["EUR"], snapshot(1, EUR=0.90))
+        # Primed from L1/Redis that another instance refreshed in the meantime
+        hub.subscribe("USD", ["EUR"], snapshot(2, EUR=0.91))
+        frame = json.loads(await asyncio.wait_for(first.next_frame(), 1))
+        assert frame == {"base": "USD", "rates": {"EUR": 0.91}, "updated_unix": 2, "full": False}
+        # Nothing left to send when the same snapshot is published
+        hub.publish(snapshot(2, EUR=0.91))
+        assert not first.frames
+
+    asyncio.run(scenario())
+
+
+def test_push_loop_survives_unexpected_errors(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_PUSH_INTERVAL_SECONDS", 0)
+    hub = RateHub()
+    monkeypatch.setattr(CurrencyService, "_hub", hub)
+    answers = [ValueError("Expecting value: line 1 column 1"), snapshot(2, EUR=0.91)]
+
+    async def get_exchange_snapshot(base):
+        answer = answers.pop(0) if answers else snapshot(2, EUR=0.91)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(CurrencyService, "get_exchange_snapshot", get_exchange_snapshot)
+
+    async def scenario():
+        subscriber = hub.subscribe("USD", ["EUR"], snapshot(1, EUR=0.90))
+        pusher = asyncio.create_task(CurrencyService.push_rate_updates())
+        try:
+            frame = json.loads(await asyncio.wait_for(subscriber.next_frame(), 1))
+        finally:
+            pusher.cancel()
+        assert frame["rates"] == {"EUR": 0.91}
+
+    asyncio.run(scenario())
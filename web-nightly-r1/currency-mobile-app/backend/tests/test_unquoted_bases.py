@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.routes import currency_router
+from app.services.circuit_breaker import CLOSED
+from app.services.currency_service import CurrencyService
+from app.services.providers import ExchangeRateApiProvider
+
+# CYP passes is_valid_currency but exchangerate-api does not quote it
+QUOTED = {"USD": 1.0, "EUR": 0.92, "GBP": 0.79}
+
+
+def exchangerate_api(request: httpx.Request) -> httpx.Response:
+    base = request.url.path.rsplit("/", 1)[-1]
+    if base not in QUOTED:
+        return httpx.Response(404, json={"result": "error", "error-type": "unsupported-code"})
+    return httpx.Response(200, json={
+        "result": "success",
+        "time_last_update_unix": 1000,
+        "conversion_rates": {code: rate / QUOTED[base] for code, rate in QUOTED.items()}
+    })
+
+
+def test_unquoted_base_does_not_open_the_circuit():
+    app = FastAPI()
+    app.include_router(currency_router, prefix="/api/v1")
+    requested = []
+
+    def upstream(request):
+        requested.append(request.url.path.rsplit("/", 1)[-1])
+        return exchangerate_api(request)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as upstream_client, \
+                httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+            CurrencyService.set_http_client(upstream_client)
+            for _ in range(5):
+                response = await client.get("/api/v1/rates/CYP")
+                assert response.status_code == 404
+            return await client.get("/api/v1/rates/EUR")
+
+    response = asyncio.run(scenario())
+    primary = CurrencyService._providers[0]
+    assert primary.breaker.state == CLOSED
+    assert response.status_code == 200
+    assert response.json()["stale"] is False
+    # The pivot snapshot shows CYP is not quoted, so it is never requested
+    assert "CYP" not in requested
+
+
+def test_client_errors_do_not_count_towards_the_circuit():
+    provider = ExchangeRateApiProvider("http://primary.test/v6", "key")
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(exchangerate_api)) as client:
+            for _ in range(provider.breaker.failure_threshold + 1):
+                assert await provider.fetch(client, "CYP") is None
+
+    asyncio.run(scenario())
+    assert provider.requests == provider.breaker.failure_threshold + 1
+    assert provider.breaker.state == CLOSED
+
+
+def test_server_errors_open_the_circuit():
+    provider = ExchangeRateApiProvider("http://primary.test/v6", "key")
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(502))) as client:
+            for _ in range(provider.breaker.failure_threshold):
+                assert await provider.fetch(client, "USD") is None
+
+    asyncio.run(scenario())
+    assert provider.breaker.state != CLOSED